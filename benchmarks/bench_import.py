@@ -0,0 +1,142 @@
+"""Times importing large OpenAPI, HAR and Postman files into a collection.
+
+    python benchmarks/bench_import.py --entries 10000 --processes 0 1
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hellorestsoft.importer import Importer  # noqa: E402
+from hellorestsoft.models.collection import CollectionManager  # noqa: E402
+
+TAGS = ['orders', 'users', 'items', 'carts', 'payments', 'invoices', 'stock', 'reviews']
+
+
+def make_openapi(count):
+    paths = {}
+    for i in range(count // 2):
+        tag = TAGS[i % len(TAGS)]
+        paths[f"/{tag}/{i}/{{id}}"] = {
+            'parameters': [{'name': 'id', 'in': 'path', 'required': True}],
+            'get': {'operationId': f"get{tag.title()}{i}", 'tags': [tag],
+                    'parameters': [{'name': 'limit', 'in': 'query', 'required': True}]},
+            'post': {'operationId': f"create{tag.title()}{i}", 'tags': [tag],
+                     'requestBody': {'content': {'application/json': {
+                         'example': {'id': i, 'kind': tag, 'notes': 'x' * 200}}}}},
+        }
+    return {'openapi': '3.0.0', 'info': {'title': 'Bench API', 'version': '1'},
+            'servers': [{'url': 'https://api.example.com/v1'}], 'paths': paths}
+
+
+def make_har(count):
+    entries = []
+    for i in range(count):
+        tag = TAGS[i % len(TAGS)]
+        entries.append({
+            'startedDateTime': '2024-01-01T00:00:00Z',
+            'request': {
+                'method': 'POST' if i % 3 == 0 else 'GET',
+                'url': f"https://api.example.com/{tag}/{i}?page=2",
+                'headers': [{'name': 'Accept', 'value': 'application/json'},
+                            {'name': ':authority', 'value': 'api.example.com'},
+                            {'name': 'Authorization', 'value': 'Bearer token'}],
+                'postData': {'mimeType': 'application/json', 'text': json.dumps({'id': i})},
+            },
+            # Captures carry response bodies the import never needs
+            'response': {'status': 200, 'content': {'text': json.dumps({'data': [tag] * 200})}},
+        })
+    return {'log': {'version': '1.2', 'creator': {'name': 'bench'}, 'entries': entries}}
+
+
+def make_postman(count, per_folder=100):
+    folders = []
+    for f in range(0, count, per_folder):
+        items = [{
+            'name': f"request {i}",
+            'request': {
+                'method': 'GET',
+                'url': {'raw': f"{{{{base_url}}}}/{TAGS[i % len(TAGS)]}/{i}"},
+                'header': [{'key': 'Accept', 'value': 'application/json'}],
+                'body': {'mode': 'raw', 'raw': json.dumps({'id': i})},
+            },
+        } for i in range(f, min(count, f + per_folder))]
+        folders.append({'name': f"folder {f // per_folder}", 'item': items})
+    return {'info': {'name': 'Bench Postman', 'schema': 'https://schema.getpostman.com/'
+                     'json/collection/v2.1.0/collection.json'}, 'item': folders}
+
+
+def count_files(root):
+    total = 0
+    for _, _, files in os.walk(root):
+        total += sum(1 for name in files if name.endswith('.json'))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[0, 1],
+                        help='pool sizes to compare; 0 = one per CPU, 1 = in-process')
+    parser.add_argument('--budget-s', type=float, default=0,
+                        help='fail if any import takes longer, 0 for no budget')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='hellorestsoft-import-')
+    results = []
+    try:
+        sources = {}
+        for kind, data in (('openapi', make_openapi(args.entries)),
+                           ('har', make_har(args.entries)),
+                           ('postman', make_postman(args.entries))):
+            path = os.path.join(work, f"{kind}.json")
+            with open(path, 'w') as f:
+                json.dump(data, f)
+            sources[kind] = path
+
+        for processes in args.processes:
+            for kind, path in sources.items():
+                root = os.path.join(work, f"collection-{kind}-{processes}")
+                manager = CollectionManager(root)
+                manager.list_dir()  # The sidebar has the root listed
+                summary = Importer(manager, processes=processes).run(path)
+                manager.apply_changes(summary['changed'])
+                manager.close()
+                written = count_files(root)
+                result = {
+                    'format': kind,
+                    'processes': processes or os.cpu_count(),
+                    'source_mb': round(os.path.getsize(path) / 1e6, 1),
+                    'requests': summary['requests'],
+                    'files': written,
+                    'seconds': round(summary['elapsed'], 3),
+                    'timings': {k: round(v, 3) for k, v in summary['timings'].items()},
+                }
+                results.append(result)
+                if not args.json:
+                    timings = ' '.join(f"{k} {v:.2f}s" for k, v in result['timings'].items())
+                    print(f"{kind:>8} x{result['processes']:<2} {result['source_mb']:>6} MB"
+                          f" -> {written:>6} files in {summary['elapsed']:6.2f}s"
+                          f" ({summary['requests'] / summary['elapsed']:,.0f}/s; {timings})")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    failed = [r for r in results if r['files'] != r['requests']]
+    if failed:
+        print(f"FAIL: {len(failed)} imports wrote fewer files than requests")
+        return 1
+    if args.budget_s and any(r['seconds'] > args.budget_s for r in results):
+        print(f"FAIL: an import exceeded the {args.budget_s:.1f}s budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Measures how long response rendering blocks the GUI thread.
+
+Compares the old synchronous path (json.loads + json.dumps + setPlainText
+on the GUI thread) with the chunked pipeline, where formatting runs on a
+worker and the editor is fed one chunk per event loop iteration.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_render.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'git-cola')))
+
+from qtpy import QtWidgets  # noqa: E402
+
+from hellorestsoft.models import render  # noqa: E402
+from hellorestsoft.widgets.text_feeder import ChunkedTextFeeder  # noqa: E402
+
+SIZES = {
+    '1KB': 1024,
+    '1MB': 1024 * 1024,
+    '50MB': 50 * 1024 * 1024,
+}
+
+
+def make_payload(size):
+    """Builds a compact JSON array of roughly `size` bytes."""
+    item = {'id': 0, 'name': 'item', 'tags': ['a', 'b', 'c'], 'value': 3.14159}
+    item_size = len(json.dumps(item, separators=(',', ':'))) + 1
+    count = max(1, size // item_size)
+    items = [dict(item, id=i) for i in range(count)]
+    return json.dumps(items, separators=(',', ':'))
+
+
+def bench_before(text):
+    """The pre-pipeline handle_response: everything on the GUI thread."""
+    editor = QtWidgets.QPlainTextEdit()
+    start = time.perf_counter()
+    try:
+        formatted = json.dumps(json.loads(text), indent=2)
+    except ValueError:
+        formatted = text
+    editor.setPlainText(formatted)
+    QtWidgets.QApplication.processEvents()
+    blocked = time.perf_counter() - start
+    return {'total_blocked': blocked, 'max_blocked': blocked}
+
+
+def bench_after(text):
+    """Worker-side formatting plus chunked insertion.
+
+    Only the feeder ticks run on the GUI thread, so the longest tick is the
+    worst-case freeze a user can observe.
+    """
+    editor = QtWidgets.QPlainTextEdit()
+    chunks = render.render_body(text)  # Runs on a worker in the app
+    feeder = ChunkedTextFeeder(editor)
+    feeder.chunks = list(reversed(chunks))
+    total = 0.0
+    worst = 0.0
+    while feeder.chunks:
+        start = time.perf_counter()
+        feeder.feed_next()
+        QtWidgets.QApplication.processEvents()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        worst = max(worst, elapsed)
+    return {'total_blocked': total, 'max_blocked': worst}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='*', default=list(SIZES),
+                        choices=list(SIZES), help='payload sizes to run')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)  # noqa: F841
+    results = {}
+    for label in args.sizes:
+        text = make_payload(SIZES[label])
+        results[label] = {
+            'before': bench_before(text),
+            'after': bench_after(text),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'payload':>8} {'path':>7} {'total blocked':>15} {'max blocked':>13}")
+    for label, result in results.items():
+        for path in ('before', 'after'):
+            r = result[path]
+            print(f"{label:>8} {path:>7} {r['total_blocked'] * 1000:>13.1f}ms"
+                  f" {r['max_blocked'] * 1000:>11.1f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Times quick-open search over a synthetic collection.
+
+    python benchmarks/bench_search.py --requests 50000
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hellorestsoft.models.collection import CollectionManager  # noqa: E402
+
+WORDS = ['orders', 'users', 'items', 'carts', 'payments', 'invoices', 'stock',
+         'search', 'login', 'refunds', 'shipments', 'reviews']
+METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+QUERIES = ['gtord', 'payments', '4711', 'login', 'usr rev', 'Bearer']
+
+
+def make_collection(root, count, per_dir=500):
+    rng = random.Random(0)
+    for i in range(count):
+        folder = os.path.join(root, f"folder-{i // per_dir:04d}")
+        if i % per_dir == 0:
+            os.makedirs(folder)
+        word = rng.choice(WORDS)
+        method = rng.choice(METHODS)
+        data = {
+            'method': method,
+            'url': f"https://api.example.com/{word}/{i}",
+            'headers': 'Authorization: Bearer token\nAccept: application/json',
+            'body': json.dumps({'id': i, 'kind': word}),
+            'response': {'status_code': 200, 'text': json.dumps({'order': i}), 'headers': {}},
+        }
+        with open(os.path.join(folder, f"{method.lower()} {word} {i}.json"), 'w') as f:
+            json.dump(data, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50000)
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='hellorestsoft-search-')
+    try:
+        make_collection(root, args.requests)
+        manager = CollectionManager(root)
+        start = time.perf_counter()
+        manager.reconcile()
+        print(f"indexed {args.requests} requests in {time.perf_counter() - start:.2f}s")
+
+        manager.search('warmup')  # Builds the in-memory name list once
+        worst = 0.0
+        for query in QUERIES:
+            start = time.perf_counter()
+            results = manager.search(query)
+            elapsed = (time.perf_counter() - start) * 1000
+            worst = max(worst, elapsed)
+            print(f"{query!r:>12}: {len(results):>3} results in {elapsed:6.1f} ms")
+        manager.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if worst > args.budget_ms:
+        print(f"FAIL: slowest query {worst:.1f} ms exceeds {args.budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
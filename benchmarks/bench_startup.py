@@ -0,0 +1,148 @@
+"""Startup benchmark: time to first paint plus an import-time breakdown.
+
+Launches the GUI startup path in a fresh interpreter with `-X importtime`,
+stops right after the main window's first paint, and reports:
+
+* wall-clock time from interpreter start to first paint,
+* the slowest imports (cumulative, as reported by -X importtime),
+* any module that should have been deferred but was imported anyway.
+
+Exits non-zero when a budget is exceeded, so it can gate CI:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py --budget-ms 400
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must not be loaded before the first window is painted
+DEFERRED = (
+    'httpx',
+    'httpcore',
+    'asyncio',
+    'hellorestsoft.engine',
+    'hellorestsoft.widgets.request_view',
+    'cola.themes',
+    'cola.icons',
+    'cola.i18n',
+)
+
+STARTUP_SCRIPT = r"""
+import sys, time, json
+start = time.perf_counter()
+sys.argv = ['hellorestsoft']
+import hellorestsoft.main  # Sets up the git-cola path like the entry point
+from hellorestsoft import app
+context = app.application_init(sys.argv)
+from hellorestsoft.widgets.main import MainWindow
+view = MainWindow(context)
+context.set_view(view)
+view.show()
+context.app.processEvents()
+first_paint = time.perf_counter() - start
+modules = sorted(sys.modules)
+view.finish_startup()
+context.app.processEvents()
+sys.stdout.write(json.dumps({'first_paint': first_paint, 'modules': modules}))
+"""
+
+
+def parse_importtime(stderr):
+    """Parses `-X importtime` output into {module: (self_us, cumulative_us, depth)}.
+
+    Depth 0 is an import made directly by the startup code; nested imports
+    are indented two spaces per level below the one that triggered them.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            _, rest = line.split(':', 1)
+            self_us, cumulative_us, name = rest.split('|', 2)
+            module = name.lstrip()
+            # One space follows the '|', then the nesting indentation
+            depth = (len(name) - len(module) - 1) // 2
+            times[module.rstrip()] = (int(self_us), int(cumulative_us), depth)
+        except ValueError:
+            continue
+    return times
+
+
+def run_startup(home):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['HOME'] = home  # Empty collection root, fresh settings
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"startup script failed with status {proc.returncode}")
+    return json.loads(proc.stdout), parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=400.0,
+                        help='max time to first paint (default: %(default)s)')
+    parser.add_argument('--import-budget-ms', type=float, default=250.0,
+                        help='max cumulative import time before first paint')
+    parser.add_argument('--top', type=int, default=15, help='imports to list')
+    parser.add_argument('--runs', type=int, default=3, help='take the best of N runs')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    best = None
+    with tempfile.TemporaryDirectory(prefix='hellorestsoft-startup-') as home:
+        for _ in range(max(1, args.runs)):
+            result, times = run_startup(home)
+            if best is None or result['first_paint'] < best[0]['first_paint']:
+                best = (result, times)
+    result, times = best
+
+    loaded = set(result['modules'])
+    # Top-level imports only: nested ones are already in their parent's total
+    import_total = sum(cumulative for _, cumulative, depth in times.values() if depth == 0) / 1000.0
+    slowest = sorted(times.items(), key=lambda item: -item[1][1])[:args.top]
+    violations = [name for name in DEFERRED if name in loaded]
+
+    failures = []
+    first_paint_ms = result['first_paint'] * 1000
+    if first_paint_ms > args.budget_ms:
+        failures.append(f"first paint {first_paint_ms:.0f} ms > {args.budget_ms:.0f} ms")
+    if import_total > args.import_budget_ms:
+        failures.append(f"imports {import_total:.0f} ms > {args.import_budget_ms:.0f} ms")
+    if violations:
+        failures.append("deferred modules imported before first paint: " + ", ".join(violations))
+
+    if args.json:
+        print(json.dumps({
+            'first_paint_ms': first_paint_ms,
+            'import_ms': import_total,
+            'slowest_imports': [
+                {'module': name, 'self_us': s, 'cumulative_us': c}
+                for name, (s, c, _) in slowest],
+            'violations': violations,
+            'failures': failures,
+        }, indent=2))
+    else:
+        print(f"first paint: {first_paint_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        print(f"imports:     {import_total:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+        print(f"\n{'cumulative':>12} {'self':>10}  module")
+        for name, (self_us, cumulative_us, _) in slowest:
+            print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,472 @@
+"""Offline benchmark suite: requests, collection trees, saves and rendering.
+
+Runs against the local mock server in benchmarks/mock_server.py, so no
+network is needed. Suites:
+
+* request: RequestView._make_request round-trips over payload sizes,
+  server latency, chunked/streamed bodies and uploads
+* tree: CollectionManager.get_tree over synthetic trees (default 1k, 10k
+  and 100k request files)
+* save: save_request and queued save_request_async into those trees
+* render: RequestView.show_response until the body is in the editor, the
+  longest GUI stall while it feeds, and JSON tab indexing
+
+Results are written as JSON (by default to benchmarks/results/) together
+with the commit they were measured on; --compare prints the change in p50
+against an earlier run and fails on regressions:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py --compare benchmarks/results/<old>.json
+    python benchmarks/bench_suite.py --suites tree save --files 1000 10000
+
+The request and render suites need Qt and httpx; when they can't be
+imported the suite is reported as skipped.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'git-cola'))
+
+from mock_server import MockServer, format_size, parse_size  # noqa: E402
+from hellorestsoft.metrics import registry, summarize  # noqa: E402
+from hellorestsoft.models.collection import CollectionManager  # noqa: E402
+
+SUITES = ['request', 'tree', 'save', 'render']
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+PHASES = ['connect', 'send', 'ttfb', 'download']
+
+# (case, method, mock server parameters, upload size)
+REQUEST_CASES = [
+    ('GET 1KB', 'GET', {'size': '1KB'}, 0),
+    ('GET 1KB +50ms latency', 'GET', {'size': '1KB', 'latency_ms': 50}, 0),
+    ('GET 1MB', 'GET', {'size': '1MB'}, 0),
+    ('GET 1MB chunked 16KB', 'GET', {'size': '1MB', 'chunked': 1, 'chunk_size': '16KB'}, 0),
+    ('GET 4MB streamed 64KB/2ms', 'GET',
+     {'size': '4MB', 'chunked': 1, 'chunk_size': '64KB', 'chunk_delay_ms': 2}, 0),
+    ('GET 32MB spooled', 'GET', {'size': '32MB'}, 0),
+    ('POST 256KB', 'POST', {'size': '1KB'}, 256 * 1024),
+]
+
+WORDS = ['orders', 'users', 'items', 'carts', 'payments', 'invoices', 'stock',
+         'search', 'login', 'refunds', 'shipments', 'reviews']
+METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+
+
+def result(suite, case, seconds, **extra):
+    """One result row: timing stats in milliseconds plus case details."""
+    stats = summarize(seconds)
+    row = {'suite': suite, 'case': case, 'runs': stats['count']}
+    for name in ('p50', 'p95', 'mean', 'max'):
+        row[name + '_ms'] = round(stats[name] * 1000, 3)
+    row['min_ms'] = round(min(seconds) * 1000, 3)
+    row.update(extra)
+    return row
+
+
+def p50_ms(values):
+    return round(summarize(values)['p50'] * 1000, 3)
+
+
+def git_revision():
+    """Short HEAD commit and whether tracked files are modified; (None, None) outside git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+# Qt-side setup, shared by the request and render suites
+
+def qt_app():
+    from qtpy import QtWidgets
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+
+def make_context(work):
+    from hellorestsoft import settings
+    from hellorestsoft.app import ApplicationContext
+    context = ApplicationContext()
+    # Defaults only, so results don't depend on the user's settings file
+    context.cfg = settings.Settings(os.path.join(work, 'settings.json'))
+    context.cfg.set('http.spool_dir', os.path.join(work, 'spool'))
+    return context
+
+
+def bench_request(args, work, server):
+    from hellorestsoft.widgets.request_view import RequestView
+    app = qt_app()
+    context = make_context(work)
+    view = RequestView(context)
+    context.engine.warm_up().result()
+    results = []
+    try:
+        for case, method, params, upload in REQUEST_CASES:
+            url = server.url(**params)
+            body = 'x' * upload if upload else None
+            headers = {'Content-Type': 'application/json'} if upload else {}
+            large = parse_size(params['size']) >= 4 * 1024 * 1024
+            runs = max(3, args.repeat // 4) if large else args.repeat
+            # One untimed send warms the connection and the server's payload cache
+            context.engine.run(view._make_request(method, url, headers, body), 120)
+            seconds = []
+            phases = {name: [] for name in PHASES}
+            for _ in range(runs):
+                start = time.perf_counter()
+                response = context.engine.run(view._make_request(method, url, headers, body), 120)
+                seconds.append(time.perf_counter() - start)
+                for name in PHASES:
+                    phases[name].append(response['timings'][name])
+                app.processEvents()  # Delivers the queued progress signals
+            size = response['size']
+            results.append(result(
+                'request', case, seconds, bytes=size,
+                mb_per_s=round(size / summarize(seconds)['p50'] / 1e6, 1),
+                spooled=bool(response.get('truncated')),
+                **{name + '_p50_ms': p50_ms(values) for name, values in phases.items()}))
+            print_progress(results[-1], args)
+    finally:
+        view.release()
+        context.shutdown()
+    return results
+
+
+def render_once(app, view, response, timeout=120):
+    """Shows a response; returns (seconds until the body is in the editor, longest GUI stall)."""
+    from qtpy import QtCore
+    loop = QtCore.QEventLoop()
+    done = []
+    stall = {'last': time.perf_counter(), 'worst': 0.0}
+
+    def tick():
+        now = time.perf_counter()
+        stall['worst'] = max(stall['worst'], now - stall['last'])
+        stall['last'] = now
+
+    def finished():
+        done.append(time.perf_counter())
+        loop.quit()
+
+    # A zero-interval timer fires on every event loop pass; the longest gap
+    # between two ticks is the longest the window was frozen
+    timer = QtCore.QTimer()
+    timer.setInterval(0)
+    timer.timeout.connect(tick)
+    view.body_feeder.finished.connect(finished)
+    timer.start()
+    start = stall['last'] = time.perf_counter()
+    view.show_response(response)
+    if view.resp_body_edit.isHidden():
+        # Spooled bodies go to the mapped viewer; nothing is fed
+        app.processEvents()
+        done.append(time.perf_counter())
+    else:
+        deadline = QtCore.QTimer()
+        deadline.setSingleShot(True)
+        deadline.timeout.connect(loop.quit)
+        deadline.start(int(timeout * 1000))
+        loop.exec_()
+        deadline.stop()
+    tick()
+    timer.stop()
+    view.body_feeder.finished.disconnect(finished)
+    if not done:
+        raise RuntimeError(f"Rendering did not finish within {timeout}s")
+    return done[0] - start, stall['worst']
+
+
+def bench_render(args, work, server):
+    from hellorestsoft.widgets.json_tree import open_document
+    from hellorestsoft.widgets.request_view import RequestView
+    app = qt_app()
+    context = make_context(work)
+    view = RequestView(context)
+    page_size = context.cfg.get('json.page_size')
+    results = []
+    try:
+        for label in args.render_sizes:
+            response = context.engine.run(
+                view._make_request('GET', server.url(size=label), {}, None), 120)
+            app.processEvents()
+            runs = max(3, args.repeat // 4) if parse_size(label) >= 1024 * 1024 else args.repeat
+            seconds, stalls = [], []
+            for _ in range(runs):
+                elapsed, stall = render_once(app, view, response)
+                seconds.append(elapsed)
+                stalls.append(stall)
+            results.append(result(
+                'render', f"show_response {label}", seconds,
+                max_stall_ms=round(max(stalls) * 1000, 3), spooled=bool(response.get('truncated'))))
+            print_progress(results[-1], args)
+
+            seconds = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                open_document(response, page_size)
+                seconds.append(time.perf_counter() - start)
+            results.append(result('render', f"json_index {label}", seconds))
+            print_progress(results[-1], args)
+    finally:
+        view.release()
+        context.shutdown()
+    return results
+
+
+# Synthetic collections, shared by the tree and save suites
+
+def make_tree(root, count, per_dir=100, dirs_per_area=20):
+    """Writes `count` request files as root/area-NNN/folder-NN/<name>.json."""
+    rng = random.Random(count)
+    for i in range(count):
+        folder_number = i // per_dir
+        folder = os.path.join(root, f"area-{folder_number // dirs_per_area:03d}",
+                              f"folder-{folder_number % dirs_per_area:02d}")
+        if i % per_dir == 0:
+            os.makedirs(folder)
+        word = rng.choice(WORDS)
+        method = rng.choice(METHODS)
+        data = {
+            'method': method,
+            'url': f"https://api.example.com/{word}/{i}",
+            'headers': 'Authorization: Bearer token\nAccept: application/json',
+            'body': json.dumps({'id': i, 'kind': word}),
+        }
+        with open(os.path.join(folder, f"{method.lower()} {word} {i}.json"), 'w') as f:
+            json.dump(data, f)
+
+
+class Trees:
+    """Builds each synthetic collection once per run."""
+
+    def __init__(self, work):
+        self.work = work
+        self.roots = {}
+
+    def get(self, count):
+        root = self.roots.get(count)
+        if root is None:
+            root = os.path.join(self.work, f"tree-{count}")
+            start = time.perf_counter()
+            make_tree(root, count)
+            print(f"  (generated {count:,} files in {time.perf_counter() - start:.1f}s)",
+                  file=sys.stderr)
+            self.roots[count] = root
+        return root
+
+
+def count_files(tree):
+    return len(tree['files']) + sum(count_files(child) for child in tree['dirs'].values())
+
+
+def bench_tree(args, trees):
+    results = []
+    for count in args.files:
+        root = trees.get(count)
+        manager = CollectionManager(root, use_index=False)
+        try:
+            start = time.perf_counter()
+            tree = manager.get_tree()
+            first = time.perf_counter() - start
+            if count_files(tree) != count:
+                raise RuntimeError(f"get_tree listed {count_files(tree)} of {count} files")
+            seconds = []
+            for _ in range(args.tree_repeat):
+                start = time.perf_counter()
+                manager.get_tree()
+                seconds.append(time.perf_counter() - start)
+        finally:
+            manager.close()
+        results.append(result('tree', f"get_tree {count} files", seconds,
+                              first_ms=round(first * 1000, 3), files=count))
+        print_progress(results[-1], args)
+    return results
+
+
+def bench_save(args, trees):
+    results = []
+    data = {'method': 'POST', 'url': 'https://api.example.com/orders',
+            'headers': 'Content-Type: application/json', 'body': json.dumps({'id': 1})}
+    for count in args.files:
+        root = trees.get(count)
+        manager = CollectionManager(root)
+        created = []
+        try:
+            # The sidebar has the root and the target folder expanded
+            folder = os.path.join(root, 'area-000', 'folder-00')
+            for path in (root, os.path.dirname(folder), folder):
+                manager.list_dir(path)
+
+            seconds = []
+            for i in range(args.saves):
+                start = time.perf_counter()
+                created.append(manager.save_request(f"bench new {i}", data, folder))
+                seconds.append(time.perf_counter() - start)
+            results.append(result('save', f"save_request new, {count} files", seconds, files=count))
+            print_progress(results[-1], args)
+
+            seconds = []
+            for i in range(args.saves):
+                start = time.perf_counter()
+                manager.save_request("bench overwrite", dict(data, body=str(i)), folder)
+                seconds.append(time.perf_counter() - start)
+            created.append(manager.request_path("bench overwrite", folder))
+            results.append(result('save', f"save_request overwrite, {count} files", seconds,
+                                  files=count))
+            print_progress(results[-1], args)
+
+            # Queued saves as autosave issues them, then one sidebar refresh
+            registry.clear()
+            paths = [manager.request_path(f"bench async {i}", folder) for i in range(args.saves)]
+            start = time.perf_counter()
+            for path in paths:
+                manager.save_request_async(path, data)
+            manager.flush_writes()
+            manager.apply_changes([folder])
+            total = time.perf_counter() - start
+            created.extend(paths)
+            latency = [sample.seconds for sample in registry.snapshot()
+                       if sample.name == 'save.latency']
+            results.append(result('save', f"save_request_async x{args.saves}, {count} files",
+                                  latency, total_ms=round(total * 1000, 3), files=count))
+            print_progress(results[-1], args)
+        finally:
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+            manager.apply_changes([folder])
+            manager.close()
+    return results
+
+
+# Reporting
+
+def print_progress(row, args):
+    if args.json:
+        return
+    extra = ' '.join(f"{key}={value}" for key, value in row.items()
+                     if key not in ('suite', 'case', 'runs', 'p50_ms', 'p95_ms', 'mean_ms',
+                                    'max_ms', 'min_ms'))
+    print(f"{row['suite']:>8} {row['case']:<42} x{row['runs']:<3} p50 {row['p50_ms']:>9.2f}ms"
+          f"  p95 {row['p95_ms']:>9.2f}ms  {extra}")
+
+
+def compare(baseline, current, threshold, noise_ms):
+    """Prints the p50 change of every case; returns the rows that got slower."""
+    before = {(row['suite'], row['case']): row for row in baseline.get('results', [])}
+    base_meta = baseline.get('meta', {})
+    print(f"\nCompared with {base_meta.get('commit') or 'unknown'} ({base_meta.get('date', '?')}):")
+    regressions = []
+    for row in current['results']:
+        old = before.get((row['suite'], row['case']))
+        if old is None:
+            print(f"{row['suite']:>8} {row['case']:<42} new")
+            continue
+        old_ms, new_ms = old['p50_ms'], row['p50_ms']
+        change = (new_ms - old_ms) / old_ms if old_ms else 0.0
+        verdict = ''
+        if abs(new_ms - old_ms) > noise_ms and abs(change) > threshold:
+            verdict = 'SLOWER' if change > 0 else 'faster'
+            if change > 0:
+                regressions.append(row)
+        print(f"{row['suite']:>8} {row['case']:<42} {old_ms:>9.2f} -> {new_ms:>9.2f}ms"
+              f" {change:+7.1%} {verdict}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', nargs='+', default=SUITES, choices=SUITES)
+    parser.add_argument('--files', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='request files in the synthetic trees')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='runs per request/render case; cases of 1MB and up run a quarter')
+    parser.add_argument('--tree-repeat', type=int, default=5, help='get_tree runs per tree')
+    parser.add_argument('--saves', type=int, default=100, help='saves per save case')
+    parser.add_argument('--render-sizes', nargs='+', default=['1KB', '1MB', '4MB', '32MB'],
+                        help='response sizes to render; above http.spool_threshold is spooled')
+    parser.add_argument('--output', help='results file, default benchmarks/results/<commit>-<time>.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative p50 increase counted as a regression')
+    parser.add_argument('--noise-ms', type=float, default=1.0,
+                        help='p50 differences below this are ignored')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+    args.render_sizes = [format_size(parse_size(size)) for size in args.render_sizes]
+
+    commit, dirty = git_revision()
+    report = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': {key: value for key, value in vars(args).items()
+                     if key not in ('output', 'compare', 'json')},
+        },
+        'results': [],
+        'skipped': {},
+    }
+
+    work = tempfile.mkdtemp(prefix='hellorestsoft-bench-')
+    trees = Trees(work)
+    try:
+        with MockServer() as server:
+            runners = {
+                'request': lambda: bench_request(args, work, server),
+                'tree': lambda: bench_tree(args, trees),
+                'save': lambda: bench_save(args, trees),
+                'render': lambda: bench_render(args, work, server),
+            }
+            for suite in SUITES:
+                if suite not in args.suites:
+                    continue
+                try:
+                    report['results'].extend(runners[suite]())
+                except ImportError as e:
+                    # Qt or httpx isn't installed; the other suites still run
+                    report['skipped'][suite] = str(e)
+                    print(f"{suite:>8} skipped: {e}", file=sys.stderr)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = (commit or 'unknown') + ('-dirty' if dirty else '')
+        output = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold, args.noise_ms)
+        if regressions:
+            print(f"FAIL: {len(regressions)} cases are more than {args.threshold:.0%} slower")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Local stand-in HTTP server for offline benchmarks.
+
+Serves generated JSON bodies of any size, with an optional delay before
+the response headers and chunked transfer encoding with a delay between
+chunks:
+
+    GET /payload?size=1MB&latency_ms=50&chunked=1&chunk_size=64KB&chunk_delay_ms=5
+
+POST/PUT/PATCH bodies are read and discarded; `status` sets the response
+code. Run it standalone to point the app at it:
+
+    python benchmarks/mock_server.py --port 8765
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from urllib.parse import urlencode, urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+
+def parse_size(text):
+    """Reads '512', '64KB' or '1.5MB' as a number of bytes."""
+    text = str(text).strip().upper()
+    number = text.rstrip('KMGB')
+    unit = text[len(number):]
+    if unit not in UNITS:
+        raise ValueError(f"Unknown size unit in {text!r}")
+    return int(float(number) * UNITS[unit])
+
+
+def format_size(size):
+    for unit in ('GB', 'MB', 'KB'):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def make_payload(size):
+    """Builds a JSON array of exactly `size` bytes (at least 2)."""
+    item = {'id': 0, 'name': 'item', 'tags': ['a', 'b', 'c'], 'value': 3.14159,
+            'active': True, 'owner': {'id': 7, 'login': 'bench'}}
+    parts = []
+    length = 2  # The brackets
+    while True:
+        text = json.dumps(dict(item, id=len(parts)), separators=(',', ':'))
+        added = len(text) + (1 if parts else 0)
+        if length + added > size:
+            break
+        parts.append(text)
+        length += added
+    body = '[' + ','.join(parts) + ']'
+    # Pad with whitespace, which is still valid JSON, to hit the size exactly
+    return (body + ' ' * max(0, size - len(body))).encode('ascii')
+
+
+class PayloadCache:
+    def __init__(self):
+        self.bodies = {}
+        self.lock = threading.Lock()
+
+    def get(self, size):
+        with self.lock:
+            body = self.bodies.get(size)
+            if body is None:
+                body = self.bodies[size] = make_payload(size)
+            return body
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like a real API server
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.respond()
+
+    do_PUT = do_PATCH = do_DELETE = do_POST
+
+    def respond(self):
+        remaining = int(self.headers.get('Content-Length') or 0)
+        while remaining > 0:
+            data = self.rfile.read(min(remaining, 1024 * 1024))
+            if not data:
+                break
+            remaining -= len(data)
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path != '/payload':
+            self.send_error(404)
+            return
+        try:
+            size = parse_size(params.get('size', '1KB'))
+            latency = float(params.get('latency_ms', 0)) / 1000.0
+            chunked = params.get('chunked', '0') not in ('', '0', 'false')
+            chunk_size = parse_size(params.get('chunk_size', '64KB')) or 65536
+            chunk_delay = float(params.get('chunk_delay_ms', 0)) / 1000.0
+            status = int(params.get('status', 200))
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        body = self.server.payloads.get(size)
+        if latency:
+            time.sleep(latency)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if not chunked:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        view = memoryview(body)
+        for offset in range(0, len(body), chunk_size):
+            chunk = view[offset:offset + chunk_size]
+            self.wfile.write(b'%x\r\n' % len(chunk))
+            self.wfile.write(chunk)
+            self.wfile.write(b'\r\n')
+            self.wfile.flush()
+            if chunk_delay:
+                time.sleep(chunk_delay)
+        self.wfile.write(b'0\r\n\r\n')
+
+
+class MockServer:
+    """Runs the mock server on a background thread; usable as a context manager."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.payloads = PayloadCache()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path='/payload', **params):
+        query = urlencode({key: value for key, value in params.items() if value is not None})
+        return self.base_url + path + ('?' + query if query else '')
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       name='mock-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    server = MockServer(args.host, args.port)
+    print(f"Serving on {server.url(size='1KB')}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
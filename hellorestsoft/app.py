@@ -1,23 +1,105 @@
-import sys
-import time
+import os
+
 from qtpy import QtWidgets, QtCore
-from cola import qtutils
-from cola import themes
-from cola import icons
-from cola import i18n
 from cola import qtcompat
+from hellorestsoft import settings
+
+DEFAULT_PROFILE_DIR = os.path.expanduser("~/.hellorestsoft/profiles")
+
+# Heavier modules (cola.qtutils, httpx via the engine, the request view) are
+# imported on first use so the main window can paint before they load.
 
 class ApplicationContext:
     def __init__(self):
         self.app = None
         self.view = None
-        self.cfg = None # TODO: Implement config
+        self.cfg = settings.Settings()
         self.model = None # TODO: Implement model
-        self.runtask = None # Initialized in set_view or manually
+        self._runtask = None # Created on first use, or assigned manually
+        self._engine = None
+        self._response_cache = None
+        self._metrics = None
+        self.profiler = None
+
+    @property
+    def runtask(self):
+        if self._runtask is None:
+            from cola import qtutils
+            self._runtask = qtutils.RunTask(parent=self.view)
+        return self._runtask
+
+    @runtask.setter
+    def runtask(self, value):
+        self._runtask = value
+
+    @property
+    def engine(self):
+        """Shared HTTP engine, started on first use"""
+        if self._engine is None:
+            from hellorestsoft.engine import HttpEngine
+            self._engine = HttpEngine.from_settings(self.cfg)
+        return self._engine
+
+    @property
+    def response_cache(self):
+        """Latest response of every tab, held within a shared memory budget"""
+        if self._response_cache is None:
+            from hellorestsoft.models.response import ResponseCache
+            self._response_cache = ResponseCache(
+                self.cfg.get('tabs.response_budget'), self.cfg.get('http.spool_dir'))
+        return self._response_cache
+
+    @property
+    def metrics(self):
+        """Shared timing registry shown in the metrics panel"""
+        if self._metrics is None:
+            from hellorestsoft.metrics import registry
+            registry.enabled = bool(self.cfg.get('metrics.enabled'))
+            registry.set_capacity(self.cfg.get('metrics.buffer_size'))
+            self._metrics = registry
+        return self._metrics
+
+    @property
+    def profiling(self):
+        return self.profiler is not None
+
+    def start_profiling(self, mode=None):
+        """Profiles the rest of the session until stop_profiling() or exit."""
+        if self.profiler is not None:
+            return
+        from hellorestsoft.metrics import SessionProfiler
+        self.profiler = SessionProfiler(
+            self.cfg.get('profile.dir') or DEFAULT_PROFILE_DIR,
+            mode or self.cfg.get('profile.mode') or 'cprofile',
+            self.cfg.get('profile.interval_ms') / 1000.0)
+        self.profiler.start()
+
+    def stop_profiling(self):
+        """Stops profiling; returns the path of the written profile, if any."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return None
+        return profiler.stop()
+
+    def shutdown(self):
+        try:
+            self.stop_profiling()
+        except OSError:
+            pass
+        export_path = self.cfg.get('metrics.export_path')
+        if export_path and self._metrics is not None:
+            try:
+                self._metrics.export(os.path.expanduser(export_path))
+            except OSError:
+                pass
+        if self._response_cache is not None:
+            self._response_cache.clear()
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
 
     def set_view(self, view):
         self.view = view
-        self.runtask = qtutils.RunTask(parent=view)
 
 class HelloRestApplication(QtWidgets.QApplication):
     def __init__(self, context, argv):
@@ -30,9 +112,15 @@ class HelloRestApplication(QtWidgets.QApplication):
 def application_init(argv):
     context = ApplicationContext()
     context.app = HelloRestApplication(context, argv)
+    context.app.aboutToQuit.connect(context.shutdown)
+    if context.cfg.get('profile.mode'):
+        context.start_profiling()
     return context
 
 def application_run(context, view):
     context.set_view(view)
     view.show()
+    # Zero-timeouts run after the pending paint events, i.e. after first paint
+    if hasattr(view, 'finish_startup'):
+        QtCore.QTimer.singleShot(0, view.finish_startup)
     return context.app.exec_()
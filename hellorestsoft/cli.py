@@ -0,0 +1,204 @@
+"""Headless commands: `hellorestsoft run <folder>`, `hellorestsoft import <file>`
+
+Nothing here may import qtpy or cola, so collections can run in CI.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='hellorestsoft run',
+        description='Run every saved request in a collection folder without the GUI.')
+    parser.add_argument('folder', help='collection folder to run')
+    parser.add_argument('-c', '--concurrency', type=int, default=10,
+                        help='requests in flight at once (default: %(default)s)')
+    parser.add_argument('-r', '--rate-limit', type=float, default=0,
+                        help='max requests per second per host, 0 for none')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='stop at the first failed request')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'junit'), default='jsonl',
+                        help='output format (default: %(default)s)')
+    parser.add_argument('-o', '--output', help='write results to a file instead of stdout')
+    parser.add_argument('-e', '--env', help="collection environment to use for {{variables}}")
+    parser.add_argument('--var', action='append', default=[], metavar='NAME=VALUE',
+                        help='set a template variable, overriding the environment')
+    return parser
+
+
+def result_record(result, folder):
+    from hellorestsoft.runner import relative_name
+    record = {
+        'request': relative_name(result['path'], folder),
+        'method': result['method'],
+        'url': result['url'],
+        'status': result['status_code'],
+        'ok': result['ok'],
+        'elapsed_ms': round(result['elapsed'] * 1000, 3),
+        'size': result['size'],
+        'error': result['error'],
+    }
+    timings = result.get('timings')
+    if timings:
+        record['timings_ms'] = {
+            key: round(value * 1000, 3) for key, value in timings.items()
+            if isinstance(value, float)
+        }
+        record['reused_connection'] = timings.get('reused')
+    return record
+
+
+def write_junit(stream, results, folder, summary):
+    from xml.etree import ElementTree
+
+    suite = ElementTree.Element('testsuite', {
+        'name': os.path.basename(os.path.abspath(folder)),
+        'tests': str(summary['total']),
+        'failures': str(summary['failed']),
+        'errors': '0',
+        'time': f"{summary['wall_time']:.3f}",
+    })
+    for result in sorted(results, key=lambda r: r['path']):
+        record = result_record(result, folder)
+        classname, _, name = record['request'].rpartition(os.sep)
+        case = ElementTree.SubElement(suite, 'testcase', {
+            'classname': classname.replace(os.sep, '.') or 'collection',
+            'name': name,
+            'time': f"{result['elapsed']:.3f}",
+        })
+        # The JUnit schema puts <properties> before <failure>
+        properties = ElementTree.SubElement(case, 'properties')
+        for key, value in (record.get('timings_ms') or {}).items():
+            ElementTree.SubElement(properties, 'property', {'name': f"{key}_ms", 'value': str(value)})
+        if not result['ok']:
+            failure = ElementTree.SubElement(case, 'failure', {'message': result['error'] or 'failed'})
+            failure.text = f"{record['method']} {record['url']} -> {record['status']}"
+    stream.write(ElementTree.tostring(suite, encoding='unicode'))
+    stream.write('\n')
+
+
+def run(argv):
+    args = build_parser().parse_args(argv)
+    folder = os.path.abspath(args.folder)
+    if not os.path.isdir(folder):
+        sys.stderr.write(f"hellorestsoft run: no such folder: {args.folder}\n")
+        return 2
+
+    overrides = {}
+    for item in args.var:
+        name, sep, value = item.partition('=')
+        if not sep or not name.strip():
+            sys.stderr.write(f"hellorestsoft run: --var expects NAME=VALUE, got: {item}\n")
+            return 2
+        overrides[name.strip()] = value
+
+    from hellorestsoft.models.environment import find_environments
+
+    environment = find_environments(folder)
+    if args.env:
+        if environment is None or args.env not in environment.names():
+            sys.stderr.write(f"hellorestsoft run: no such environment: {args.env}\n")
+            return 2
+        environment.set_active(args.env)
+
+    from hellorestsoft.engine import HttpEngine
+    from hellorestsoft.settings import Settings
+
+    engine = HttpEngine.from_settings(Settings())
+    # Import httpx and build the client while the request files load
+    warm = engine.warm_up()
+
+    from hellorestsoft.models.collection import CollectionManager
+    from hellorestsoft.runner import CollectionRunner, summarize
+
+    manager = CollectionManager(folder, use_index=False)
+    requests = manager.collect_requests()
+
+    stream = open(args.output, 'w') if args.output else sys.stdout
+    results = []
+
+    def on_result(result):
+        results.append(result)
+        if args.format == 'jsonl':
+            stream.write(json.dumps(result_record(result, folder)) + '\n')
+            stream.flush()
+
+    runner = CollectionRunner(engine, concurrency=args.concurrency,
+                              rate_limit=args.rate_limit, fail_fast=args.fail_fast,
+                              environment=environment, overrides=overrides)
+    started = time.perf_counter()
+    try:
+        warm.result()
+        engine.run(runner.run(requests, on_result=on_result))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        summary = summarize(results, time.perf_counter() - started)
+        if args.format == 'junit':
+            write_junit(stream, results, folder, summary)
+        if stream is not sys.stdout:
+            stream.close()
+        engine.close()
+
+    sys.stderr.write(f"{summary['passed']} passed, {summary['failed']} failed, "
+                     f"{summary['total']} run in {summary['wall_time']:.2f}s\n")
+    return 1 if summary['failed'] else 0
+
+
+def build_import_parser():
+    from hellorestsoft.importer import FORMATS
+
+    parser = argparse.ArgumentParser(
+        prog='hellorestsoft import',
+        description='Import OpenAPI, HAR or Postman files as folders of requests.')
+    parser.add_argument('files', nargs='+', help='files to import (.json, .yaml, .har)')
+    parser.add_argument('-i', '--into', default='.',
+                        help='collection folder to import into (default: current folder)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='source format (default: detected from the file)')
+    parser.add_argument('-p', '--processes', type=int, default=0,
+                        help='worker processes, 0 for one per CPU (default: %(default)s)')
+    return parser
+
+
+def import_files(argv):
+    args = build_import_parser().parse_args(argv)
+    folder = os.path.abspath(args.into)
+    if not os.path.isdir(folder):
+        sys.stderr.write(f"hellorestsoft import: no such folder: {args.into}\n")
+        return 2
+
+    from hellorestsoft.importer import Importer
+    from hellorestsoft.models.collection import CollectionManager
+
+    manager = CollectionManager(folder)
+    importer = Importer(manager, processes=args.processes)
+    failed = 0
+    try:
+        for path in args.files:
+            try:
+                summary = importer.run(path, kind=args.format)
+            except (OSError, ValueError) as e:
+                sys.stderr.write(f"hellorestsoft import: {path}: {e}\n")
+                failed += 1
+                continue
+            sys.stderr.write(f"{path}: {summary['requests']} {summary['format']} requests"
+                             f" -> {summary['folder']} in {summary['elapsed']:.2f}s\n")
+    finally:
+        manager.close()
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == 'import':
+        return import_files(argv[1:])
+    return run(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""Shared HTTP engine: one event loop thread and one pooled httpx client"""
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from hellorestsoft import metrics
+from hellorestsoft.models.http_cache import is_cacheable
+from hellorestsoft.models.response import SpoolBuffer, decode_head
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.hellorestsoft/cache")
+
+
+def parse_headers(text):
+    """Parses 'Key: Value' lines as typed in the Headers tab."""
+    headers = {}
+    for line in (text or '').splitlines():
+        if ':' in line:
+            k, v = line.split(':', 1)
+            headers[k.strip()] = v.strip()
+    return headers
+
+
+def charset(headers):
+    """The charset parameter of a Content-Type header, if any."""
+    for key, value in (headers or {}).items():
+        if key.lower() == 'content-type':
+            for param in value.split(';')[1:]:
+                name, _, charset = param.partition('=')
+                if name.strip().lower() == 'charset':
+                    return charset.strip().strip('"') or None
+    return None
+
+
+def parse_timeouts(value):
+    """Reads a request's 'timeouts' field; missing or non-positive entries are dropped."""
+    timeouts = {}
+    if isinstance(value, dict):
+        for key in ('connect', 'read', 'total'):
+            try:
+                seconds = float(value.get(key) or 0)
+            except (TypeError, ValueError):
+                continue
+            if seconds > 0:
+                timeouts[key] = seconds
+    return timeouts
+
+
+class RequestTimings:
+    """Collects per-phase timings from httpcore trace events.
+
+    A request sent over a warm keep-alive connection produces no
+    connect/TLS events, so `reused` tells whether pooling kicked in.
+    httpcore resolves the host inside connect_tcp, so DNS lookup time is
+    part of `connect`.
+    """
+
+    def __init__(self):
+        self.marks = {}
+        self.start = time.perf_counter()
+
+    async def trace(self, event_name, info):
+        self.marks[event_name] = time.perf_counter()
+
+    def _span(self, started, complete):
+        begin = self.marks.get(started)
+        end = self.marks.get(complete)
+        if begin is None or end is None:
+            return 0.0
+        return end - begin
+
+    def _first(self, suffix):
+        for name, value in self.marks.items():
+            if name.endswith(suffix):
+                return value
+        return None
+
+    def as_dict(self):
+        now = time.perf_counter()
+        sent = self._first('.send_request_headers.started')
+        body_sent = self._first('.send_request_body.complete')
+        first_byte = self._first('.receive_response_headers.complete')
+        last_byte = self._first('.receive_response_body.complete') or now
+        ttfb = send = download = 0.0
+        if sent is not None and first_byte is not None:
+            ttfb = first_byte - sent
+        if sent is not None and body_sent is not None:
+            send = body_sent - sent
+        if first_byte is not None:
+            download = max(0.0, last_byte - first_byte)
+        return {
+            'connect': self._span('connection.connect_tcp.started',
+                                  'connection.connect_tcp.complete'),
+            'tls': self._span('connection.start_tls.started',
+                              'connection.start_tls.complete'),
+            'send': send,
+            'ttfb': ttfb,
+            'download': download,
+            'total': now - self.start,
+            'reused': 'connection.connect_tcp.started' not in self.marks,
+        }
+
+    def record(self, method, url, status_code):
+        """Adds this request's phases to the metrics registry."""
+        phases = self.as_dict()
+        labels = {'method': method.upper(), 'host': urlsplit(url).hostname or '',
+                  'status': status_code}
+        names = ['send', 'ttfb', 'download', 'total']
+        if not phases['reused']:
+            names[:0] = ['connect', 'tls'] if phases['tls'] else ['connect']
+        for name in names:
+            metrics.record('http.' + name, phases[name], **labels)
+        return phases
+
+
+class ProgressMeter:
+    """Reports download progress at most every `interval` seconds."""
+
+    def __init__(self, callback, total=None, interval=0.1):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last = 0.0
+
+    def update(self, received, final=False):
+        if self.callback is None:
+            return
+        now = time.perf_counter()
+        if not final and now - self.last < self.interval:
+            return
+        self.last = now
+        elapsed = now - self.start
+        rate = received / elapsed if elapsed > 0 else 0.0
+        self.callback(received, self.total, rate)
+
+
+class HttpEngine:
+    """Runs all HTTP traffic on a single background event loop.
+
+    Every tab shares one `httpx.AsyncClient`, so repeated requests to the
+    same host reuse warm connections instead of paying for a new loop, TCP
+    connect and TLS handshake on every Send.
+    """
+
+    def __init__(self, max_connections=100, max_keepalive_connections=20,
+                 keepalive_expiry=30.0, http2=False,
+                 spool_threshold=8 * 1024 * 1024, preview_size=256 * 1024,
+                 spool_dir=None, connect_timeout=10.0, read_timeout=30.0, total_timeout=0,
+                 cache=None):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.spool_threshold = spool_threshold
+        self.preview_size = preview_size
+        self.spool_dir = spool_dir
+        # Defaults for requests that don't set their own; 0 means no limit
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        # Optional HttpCache; GET requests are then revalidated conditionally
+        self.cache = cache
+        # Spool files of results not yet released; removed at close() at the latest
+        self.spool_files = set()
+        self.loop = None
+        self.thread = None
+        self.client = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, cfg):
+        cache = None
+        if cfg.get('http.cache'):
+            from hellorestsoft.models.http_cache import HttpCache
+            try:
+                cache = HttpCache(cfg.get('http.cache_dir') or DEFAULT_CACHE_DIR,
+                                  cfg.get('http.cache_max_size'))
+            except Exception:
+                cache = None  # Unwritable cache directory; run without it
+        return cls(
+            max_connections=cfg.get('http.max_connections'),
+            max_keepalive_connections=cfg.get('http.max_keepalive_connections'),
+            keepalive_expiry=cfg.get('http.keepalive_expiry'),
+            http2=cfg.get('http.http2'),
+            spool_threshold=cfg.get('http.spool_threshold'),
+            preview_size=cfg.get('http.preview_size'),
+            spool_dir=cfg.get('http.spool_dir'),
+            connect_timeout=cfg.get('http.connect_timeout'),
+            read_timeout=cfg.get('http.read_timeout'),
+            total_timeout=cfg.get('http.total_timeout'),
+            cache=cache,
+        )
+
+    def start(self):
+        with self._lock:
+            if self.thread is not None:
+                return
+            ready = threading.Event()
+            self.thread = threading.Thread(
+                target=self._run_loop, args=(ready,),
+                name='hellorestsoft-http', daemon=True)
+            self.thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    def submit(self, coro):
+        """Schedules a coroutine on the engine loop, returns a concurrent Future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Runs a coroutine on the engine loop and waits for its result."""
+        return self.submit(coro).result(timeout)
+
+    def warm_up(self):
+        """Imports httpx and builds the client on the engine thread.
+
+        Lets callers overlap that fixed cost with their own setup work.
+        """
+        async def build():
+            self.get_client()
+        return self.submit(build())
+
+    def get_client(self):
+        """Returns the pooled client; must be called from the engine loop."""
+        if self.client is None:
+            import httpx
+            http2 = self.http2
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    http2 = False
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            self.client = httpx.AsyncClient(limits=limits, http2=http2)
+        return self.client
+
+    def _timeouts(self, overrides=None):
+        """Merges per-request timeouts over the engine defaults.
+
+        Returns an httpx.Timeout for the connect/read phases and the
+        overall deadline in seconds (None for no limit).
+        """
+        import httpx
+        timeouts = parse_timeouts(overrides)
+        connect = timeouts.get('connect', self.connect_timeout) or None
+        read = timeouts.get('read', self.read_timeout) or None
+        total = timeouts.get('total', self.total_timeout) or None
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect), total
+
+    async def request(self, method, url, headers=None, body=None, progress=None,
+                      keep_body=True, timeouts=None, use_cache=True, record_metrics=True):
+        """Streams a response, spooling large bodies to disk.
+
+        `progress(received, total, rate)` is called from the engine thread
+        while the body downloads. Bodies above `spool_threshold` are written
+        to a spool file; the result then carries only a text preview and
+        `body_path` points at the full body. With keep_body=False the body
+        is read and counted but discarded, and `text` is empty.
+
+        `timeouts` may set 'connect', 'read' and 'total' seconds for this
+        request; the engine defaults fill in the rest. Cancelling the task
+        (e.g. the future returned by submit()) aborts the transfer.
+
+        With a cache, GETs for which a validated copy exists are sent with
+        If-None-Match/If-Modified-Since; a 304 is answered from the cache
+        and the result's 'cache' entry reports the hit and bytes saved.
+
+        Phase timings are added to the metrics registry unless
+        record_metrics is False (load tests keep their own statistics).
+        """
+        client = self.get_client()
+        cache_key = cache_entry = None
+        if self.cache is not None and use_cache and keep_body and method.upper() == 'GET':
+            cache_key = self.cache.key(url, headers)
+            # SQLite and file access stay off the loop shared by every request
+            cache_entry = await asyncio.get_event_loop().run_in_executor(
+                None, self.cache.lookup, cache_key)
+            if cache_entry is not None:
+                headers = dict(headers or {})
+                present = {name.lower() for name in headers}
+                for name, value in self.cache.validators(cache_entry).items():
+                    if name.lower() not in present:
+                        headers[name] = value
+        timeout, total_timeout = self._timeouts(timeouts)
+        timings = RequestTimings()
+        spool = SpoolBuffer(self.spool_threshold, self.preview_size, self.spool_dir)
+
+        async def transfer():
+            async with client.stream(method, url, headers=headers, content=body,
+                                     timeout=timeout,
+                                     extensions={'trace': timings.trace}) as response:
+                total = response.headers.get('content-length')
+                meter = ProgressMeter(progress, int(total) if total and total.isdigit() else None)
+                async for chunk in response.aiter_bytes():
+                    if keep_body:
+                        spool.write(chunk)
+                    else:
+                        spool.size += len(chunk)
+                    meter.update(spool.size)
+                meter.update(spool.size, final=True)
+            return response
+
+        try:
+            try:
+                response = await asyncio.wait_for(transfer(), total_timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"Request took longer than the {total_timeout:g}s total timeout") from None
+        except BaseException:
+            spool.close()
+            if spool.path and os.path.exists(spool.path):
+                os.remove(spool.path)
+            raise
+        spool.close()
+
+        status_code = response.status_code
+        response_headers = dict(response.headers)
+        encoding = response.charset_encoding or 'utf-8'
+        cache_info = None
+        if cache_key is not None:
+            loop = asyncio.get_event_loop()
+            if cache_entry is not None and status_code == 304:
+                try:
+                    entry = await loop.run_in_executor(
+                        None, self.cache.revalidated, cache_key, response_headers) or cache_entry
+                    await loop.run_in_executor(None, self.cache.read_into, cache_key, spool)
+                except OSError:
+                    entry = None  # Evicted meanwhile; show the bare 304
+                finally:
+                    spool.close()
+                if entry is not None:
+                    status_code = entry['status_code']
+                    response_headers = entry['headers']
+                    encoding = charset(response_headers) or 'utf-8'
+                    cache_info = {'hit': True, 'status': 304, 'bytes_saved': spool.size}
+            elif is_cacheable(status_code, response_headers):
+                try:
+                    await loop.run_in_executor(
+                        None, self.cache.store, cache_key, url, status_code, response_headers, spool)
+                    cache_info = {'hit': False, 'stored': True}
+                except Exception:
+                    pass  # A cache failure never fails the request
+            elif cache_entry is not None:
+                # The copy we revalidated is stale and its replacement can't be cached
+                try:
+                    await loop.run_in_executor(None, self.cache.remove, cache_key)
+                except Exception:
+                    pass
+
+        result = {
+            'status_code': status_code,
+            'headers': response_headers,
+            'elapsed': response.elapsed.total_seconds(),
+            'http_version': response.http_version,
+            'timings': (timings.record(method, url, response.status_code) if record_metrics
+                        else timings.as_dict()),
+            'size': spool.size,
+            'encoding': encoding,
+        }
+        if cache_info is not None:
+            result['cache'] = cache_info
+        if spool.spooled:
+            self.spool_files.add(spool.path)
+            text, consumed = decode_head(spool.preview(), encoding)
+            result.update({
+                'text': text,
+                'truncated': True,
+                'body_path': spool.path,
+                'preview_bytes': consumed,
+            })
+        else:
+            result['text'] = spool.preview().decode(encoding, errors='replace')
+            result['truncated'] = False
+        return result
+
+    async def _aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def close(self):
+        with self._lock:
+            if self.thread is None:
+                return
+            future = asyncio.run_coroutine_threadsafe(self._aclose(), self.loop)
+            try:
+                future.result(5)
+            except Exception:
+                pass
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(5)
+            self.thread = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        for path in self.spool_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.spool_files = set()
+
+    def release(self, response):
+        """Deletes the spool file of a result whose body is no longer needed.
+
+        Callers that don't keep responses around (the collection runner)
+        call this once they are done, so long runs don't fill the spool
+        directory until close().
+        """
+        path = response.get('body_path')
+        if path is None or path not in self.spool_files:
+            return
+        self.spool_files.discard(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
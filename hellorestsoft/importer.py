@@ -0,0 +1,377 @@
+"""Importing OpenAPI, HAR and Postman files as request collections
+
+Nothing here may import qtpy or cola: conversion runs in worker processes.
+"""
+import os
+import re
+import json
+import time
+import multiprocessing
+from urllib.parse import urlsplit, urlencode
+from concurrent.futures import ProcessPoolExecutor
+
+from hellorestsoft.models.collection import safe_name
+from hellorestsoft.models.json_tree import JsonDocument
+
+FORMATS = ('openapi', 'har', 'postman')
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+# Entries handed to a worker process at a time
+BATCH_SIZE = 250
+# Below this many entries, starting worker processes costs more than it saves
+MIN_PARALLEL_UNITS = 500
+
+PATH_PARAMETER = re.compile(r'\{([^{}/]+)\}')
+# Request headers a HAR capture records but a replay must not send
+SKIPPED_HAR_HEADERS = {'content-length', 'host', 'connection'}
+
+
+def load_source(path):
+    """Reads an import source as JSON text; YAML needs PyYAML."""
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8-sig', 'replace')
+    if text.lstrip()[:1] in ('{', '['):
+        return text
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("YAML files need PyYAML (pip install pyyaml)")
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Not valid YAML: {e}")
+    return json.dumps(data)
+
+
+def _members(document, node):
+    """{key: node} of an object's members, listed in one pass."""
+    if node.kind != 'object':
+        return {}
+    document.load_children(node, limit=len(document.text))
+    return {child.key: child for child in node.children}
+
+
+def split_source(document, kind=None):
+    """Finds the entries of a source without decoding them.
+
+    Returns (kind, title, context, units) where each unit is a (key,
+    JSON text) pair that a worker converts on its own. Only the small
+    parts needed for context, like OpenAPI servers, are decoded here.
+    """
+    root = _members(document, document.root)
+    if kind is None:
+        if 'openapi' in root or 'swagger' in root:
+            kind = 'openapi'
+        elif 'log' in root:
+            kind = 'har'
+        elif 'item' in root:
+            kind = 'postman'
+        else:
+            raise ValueError("Not an OpenAPI, HAR or Postman file")
+
+    text = document.text
+    context = {}
+    title = None
+    if kind == 'openapi':
+        info = document.value(root['info']) if 'info' in root else {}
+        title = info.get('title') if isinstance(info, dict) else None
+        if 'servers' in root:
+            servers = document.value(root['servers'])
+            if servers and isinstance(servers[0], dict):
+                context['base_url'] = servers[0].get('url', '')
+        elif 'host' in root:
+            schemes = document.value(root['schemes']) if 'schemes' in root else ['https']
+            base_path = document.value(root['basePath']) if 'basePath' in root else ''
+            context['base_url'] = f"{(schemes or ['https'])[0]}://{document.value(root['host'])}{base_path}"
+        if 'consumes' in root:
+            context['consumes'] = document.value(root['consumes'])
+        entries = root.get('paths')
+    elif kind == 'har':
+        log = _members(document, root['log']) if 'log' in root else {}
+        entries = log.get('entries')
+    else:
+        info = document.value(root['info']) if 'info' in root else {}
+        title = info.get('name') if isinstance(info, dict) else None
+        entries = root.get('item')
+
+    units = []
+    if entries is not None and entries.is_container:
+        for child, _ in document.iter_children(entries):
+            units.append((child.key, text[child.start:child.end]))
+    return kind, title, context, units
+
+
+def _example(media):
+    """A request body example from an OpenAPI media type object, as text."""
+    if not isinstance(media, dict):
+        return ''
+    example = media.get('example')
+    if example is None:
+        examples = media.get('examples')
+        if isinstance(examples, dict):
+            for candidate in examples.values():
+                if isinstance(candidate, dict) and 'value' in candidate:
+                    example = candidate['value']
+                    break
+    if example is None and isinstance(media.get('schema'), dict):
+        example = media['schema'].get('example')
+    if example is None:
+        return ''
+    if isinstance(example, str):
+        return example
+    return json.dumps(example, indent=2)
+
+
+def openapi_requests(path, item, context):
+    """Yields (folder parts, name, request data) for the operations of one path."""
+    if not isinstance(item, dict):
+        return
+    base_url = (context.get('base_url') or '').rstrip('/')
+    shared = item.get('parameters') or []
+    for method in HTTP_METHODS:
+        operation = item.get(method)
+        if not isinstance(operation, dict):
+            continue
+        parameters = [p for p in shared + (operation.get('parameters') or []) if isinstance(p, dict)]
+        url = base_url + PATH_PARAMETER.sub(r'{{\1}}', path)
+        query = [f"{p['name']}={{{{{p['name']}}}}}" for p in parameters
+                 if p.get('in') == 'query' and p.get('required') and p.get('name')]
+        if query:
+            url += '?' + '&'.join(query)
+        headers = [f"{p['name']}: {{{{{p['name']}}}}}" for p in parameters
+                   if p.get('in') == 'header' and p.get('name')]
+        body = ''
+        content = (operation.get('requestBody') or {}).get('content')
+        if isinstance(content, dict) and content:
+            media_type = 'application/json' if 'application/json' in content else next(iter(content))
+            headers.append(f"Content-Type: {media_type}")
+            body = _example(content[media_type])
+        else:
+            # Swagger 2.0 describes the body as a parameter
+            for parameter in parameters:
+                if parameter.get('in') == 'body':
+                    consumes = operation.get('consumes') or context.get('consumes') or ['application/json']
+                    headers.append(f"Content-Type: {consumes[0]}")
+                    body = _example(parameter)
+                    break
+        name = operation.get('operationId') or operation.get('summary') or f"{method.upper()} {path}"
+        tags = operation.get('tags') or []
+        folder = (str(tags[0]),) if tags else ()
+        yield folder, name, {
+            'method': method.upper(),
+            'url': url,
+            'headers': "\n".join(headers),
+            'body': body,
+        }
+
+
+def har_requests(key, entry, context):
+    """Yields the request recorded in one HAR entry."""
+    request = entry.get('request') if isinstance(entry, dict) else None
+    if not isinstance(request, dict) or not request.get('url'):
+        return
+    method = (request.get('method') or 'GET').upper()
+    url = request['url']
+    headers = [f"{h.get('name')}: {h.get('value', '')}" for h in request.get('headers') or []
+               if isinstance(h, dict) and h.get('name')
+               and not h['name'].startswith(':')
+               and h['name'].lower() not in SKIPPED_HAR_HEADERS]
+    post_data = request.get('postData') or {}
+    body = post_data.get('text') or ''
+    if not body and post_data.get('params'):
+        body = urlencode([(p.get('name', ''), p.get('value', '')) for p in post_data['params']])
+    parts = urlsplit(url)
+    yield (parts.hostname or 'requests',), f"{method} {parts.path or '/'}", {
+        'method': method,
+        'url': url,
+        'headers': "\n".join(headers),
+        'body': body,
+    }
+
+
+def _postman_url(url):
+    if isinstance(url, str):
+        return url
+    if not isinstance(url, dict):
+        return ''
+    if url.get('raw'):
+        return url['raw']
+    host = url.get('host') or []
+    path = url.get('path') or []
+    host = '.'.join(host) if isinstance(host, list) else str(host)
+    path = '/'.join(str(p) for p in path) if isinstance(path, list) else str(path)
+    protocol = url.get('protocol')
+    return (f"{protocol}://" if protocol else '') + host + ('/' + path if path else '')
+
+
+def _postman_body(body):
+    if not isinstance(body, dict):
+        return ''
+    mode = body.get('mode')
+    if mode == 'raw':
+        return body.get('raw') or ''
+    if mode in ('urlencoded', 'formdata'):
+        fields = [(f.get('key', ''), f.get('value', '')) for f in body.get(mode) or []
+                  if isinstance(f, dict) and not f.get('disabled') and f.get('type', 'text') == 'text']
+        return urlencode(fields)
+    if mode == 'graphql':
+        return json.dumps(body.get('graphql') or {}, indent=2)
+    return ''
+
+
+def postman_requests(key, item, context, folder=()):
+    """Yields the requests of one Postman item, descending into folders.
+
+    Postman's {{variables}} use the same syntax as ours and are kept as is.
+    """
+    if not isinstance(item, dict):
+        return
+    if isinstance(item.get('item'), list):
+        inner = folder + (item.get('name') or 'Folder',)
+        for child in item['item']:
+            yield from postman_requests(None, child, context, inner)
+        return
+    request = item.get('request')
+    if isinstance(request, str):
+        request = {'url': request}
+    if not isinstance(request, dict):
+        return
+    headers = [f"{h.get('key')}: {h.get('value', '')}" for h in request.get('header') or []
+               if isinstance(h, dict) and h.get('key') and not h.get('disabled')]
+    yield folder, item.get('name') or 'Request', {
+        'method': (request.get('method') or 'GET').upper(),
+        'url': _postman_url(request.get('url')),
+        'headers': "\n".join(headers),
+        'body': _postman_body(request.get('body')),
+    }
+
+
+CONVERTERS = {
+    'openapi': openapi_requests,
+    'har': har_requests,
+    'postman': postman_requests,
+}
+
+
+def convert_batch(kind, units, context):
+    """Decodes and converts a batch of units; runs in a worker process.
+
+    Returns (folder parts, name, file bytes) triples, already serialized
+    so the parent process only has to write them.
+    """
+    convert = CONVERTERS[kind]
+    converted = []
+    for key, text in units:
+        for folder, name, data in convert(key, json.loads(text), context):
+            converted.append((folder, name, json.dumps(data, indent=2).encode('utf-8')))
+    return converted
+
+
+def unique_folder(parent, name):
+    """`parent`/`name`, numbered if that folder already exists."""
+    base = safe_name(name) or "Imported"
+    path = os.path.join(parent, base)
+    number = 2
+    while os.path.exists(path):
+        path = os.path.join(parent, f"{base} {number}")
+        number += 1
+    return path
+
+
+class Importer:
+    """Turns an OpenAPI, HAR or Postman file into a folder of requests.
+
+    The source is indexed lazily with JsonDocument, so the parent process
+    only finds where each entry starts and ends. Entries are decoded,
+    converted and serialized in a process pool, and the resulting files
+    are written with one CollectionManager.write_requests() call.
+    """
+
+    def __init__(self, manager, processes=0, batch_size=BATCH_SIZE):
+        self.manager = manager
+        # 0 = one per CPU; 1 converts in this process
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def convert(self, kind, units, context, progress=None, should_stop=None):
+        batches = [units[i:i + self.batch_size] for i in range(0, len(units), self.batch_size)]
+        if self.processes <= 1 or len(units) < MIN_PARALLEL_UNITS:
+            results = []
+            for number, batch in enumerate(batches):
+                if should_stop is not None and should_stop():
+                    return None
+                results.extend(convert_batch(kind, batch, context))
+                if progress is not None:
+                    progress(min(len(units), (number + 1) * self.batch_size), len(units))
+            return results
+
+        # spawn rather than fork: the GUI process has threads and Qt state
+        # that must not be duplicated into the workers
+        workers = min(self.processes, len(batches))
+        mp_context = multiprocessing.get_context('spawn')
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            futures = [pool.submit(convert_batch, kind, batch, context) for batch in batches]
+            converted = []
+            # Collect in submission order so names are numbered deterministically
+            for future, batch in zip(futures, batches):
+                if should_stop is not None and should_stop():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                converted.append(future.result())
+                done += len(batch)
+                if progress is not None:
+                    progress(done, len(units))
+        return [item for batch in converted for item in batch]
+
+    def assign_paths(self, folder, converted):
+        """Maps converted requests to file paths, numbering duplicate names."""
+        files = []
+        taken = set()
+        for parts, name, payload in converted:
+            directory = os.path.join(folder, *[safe_name(part) or "Folder" for part in parts])
+            path = self.manager.request_path(name, directory)
+            stem = path[:-5]
+            number = 2
+            while path.lower() in taken:
+                path = f"{stem} {number}.json"
+                number += 1
+            taken.add(path.lower())
+            files.append((path, payload))
+        return files
+
+    def run(self, source, target_dir=None, kind=None, progress=None, should_stop=None):
+        """Imports `source` into a new folder under `target_dir`; safe from a worker thread.
+
+        Returns a summary dict; its 'changed' directories go to
+        CollectionManager.apply_changes() on the GUI thread.
+        """
+        if target_dir is None:
+            target_dir = self.manager.root_path
+        timings = {}
+        started = time.perf_counter()
+        document = JsonDocument(load_source(source))
+        kind, title, context, units = split_source(document, kind)
+        del document
+        timings['scan'] = time.perf_counter() - started
+
+        mark = time.perf_counter()
+        converted = self.convert(kind, units, context, progress, should_stop)
+        if converted is None:
+            return None
+        timings['convert'] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        title = title or os.path.splitext(os.path.basename(source))[0]
+        folder = unique_folder(target_dir, title)
+        files = self.assign_paths(folder, converted)
+        changed = self.manager.write_requests(files) if files else []
+        timings['write'] = time.perf_counter() - mark
+        return {
+            'format': kind,
+            'folder': folder,
+            'requests': len(files),
+            'changed': changed,
+            'timings': timings,
+            'elapsed': time.perf_counter() - started,
+        }
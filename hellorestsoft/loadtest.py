@@ -0,0 +1,239 @@
+"""Load testing: latency histograms and a concurrency/RPS driven request loop"""
+import json
+import math
+import time
+import asyncio
+import threading
+from collections import Counter
+
+from hellorestsoft.models.template import RequestTemplate
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies, recorded in microseconds.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that every
+    power of two is split into 2**(sub_bucket_bits - 1) linear buckets, so
+    any recorded value is off by at most 1 / 2**(sub_bucket_bits - 1)
+    (about 1.6% by default) while memory stays proportional to log(max).
+    """
+
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts = []
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count \
+            + (value >> shift) - self.half_count
+
+    def _value(self, index):
+        """Highest value that lands in bucket `index`."""
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half_count + 1
+        sub = offset % self.half_count + self.half_count
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1e6))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, percent):
+        """Latency in seconds at or below which `percent` of samples fall."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(self.total * percent / 100.0))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._value(index), self.max) / 1e6
+        return self.max / 1e6
+
+    def mean(self):
+        return self.sum / self.total / 1e6 if self.total else 0.0
+
+    def buckets(self):
+        """Non-empty buckets as (upper bound in seconds, count) pairs."""
+        return [(self._value(index) / 1e6, count)
+                for index, count in enumerate(self.counts) if count]
+
+
+class LoadTest:
+    """Fires one saved request repeatedly on the shared engine.
+
+    With `rps` set, requests start on a fixed schedule (open model) and
+    `concurrency` only caps how many may be in flight; without it,
+    `concurrency` workers send back to back (closed model). Either way the
+    run stops after `total` requests or `duration` seconds, whichever comes
+    first. `snapshot()` may be called from any thread while it runs.
+    The request is compiled once; each send only renders it with
+    `variables`, so dynamic values like {{$uuid}} differ per request.
+    """
+
+    def __init__(self, engine, data, total=1000, duration=None, concurrency=10, rps=None,
+                 variables=None):
+        self.engine = engine
+        self.data = data
+        self.template = RequestTemplate(data)
+        self.variables = variables or {}
+        self.total = total
+        self.duration = duration
+        self.concurrency = max(1, concurrency)
+        self.rps = rps or None
+        self.lock = threading.Lock()
+        self.histogram = LatencyHistogram()
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.started = 0
+        self.completed = 0
+        self.bytes = 0
+        self.start_time = None
+        self.end_time = None
+
+    def _should_start(self):
+        if self.total and self.started >= self.total:
+            return False
+        if self.duration and time.perf_counter() - self.start_time >= self.duration:
+            return False
+        return True
+
+    async def _send(self):
+        url, headers, body = self.template.render(self.variables)
+        start = time.perf_counter()
+        error = None
+        try:
+            response = await self.engine.request(
+                self.template.method, url, headers=headers,
+                body=body or None, keep_body=False,
+                timeouts=self.data.get('timeouts'), record_metrics=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            response = None
+            error = e.__class__.__name__
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.completed += 1
+            self.histogram.record(elapsed)
+            if response is not None:
+                self.statuses[response['status_code']] += 1
+                self.bytes += response.get('size', 0)
+                if response['status_code'] >= 400:
+                    error = f"HTTP {response['status_code']}"
+            if error:
+                self.errors[error] += 1
+
+    async def _worker(self):
+        while self._should_start():
+            self.started += 1
+            await self._send()
+
+    async def _scheduled(self):
+        interval = 1.0 / self.rps
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = set()
+        next_start = time.perf_counter()
+
+        async def send():
+            try:
+                await self._send()
+            finally:
+                semaphore.release()
+
+        try:
+            while self._should_start():
+                delay = next_start - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await semaphore.acquire()
+                self.started += 1
+                task = asyncio.ensure_future(send())
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                next_start += interval
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run(self):
+        self.start_time = time.perf_counter()
+        try:
+            if self.rps:
+                await self._scheduled()
+            else:
+                await asyncio.gather(*[self._worker() for _ in range(self.concurrency)])
+        finally:
+            self.end_time = time.perf_counter()
+        return self.snapshot()
+
+    def snapshot(self):
+        with self.lock:
+            end = self.end_time or time.perf_counter()
+            elapsed = end - self.start_time if self.start_time else 0.0
+            histogram = self.histogram
+            return {
+                'started': self.started,
+                'completed': self.completed,
+                'elapsed': elapsed,
+                'throughput': self.completed / elapsed if elapsed > 0 else 0.0,
+                'bytes': self.bytes,
+                'min': (histogram.min or 0) / 1e6,
+                'max': histogram.max / 1e6,
+                'mean': histogram.mean(),
+                'percentiles': {str(p): histogram.percentile(p) for p in PERCENTILES},
+                'errors': dict(self.errors),
+                'statuses': {str(k): v for k, v in self.statuses.items()},
+                'finished': self.end_time is not None,
+            }
+
+    def export(self, path):
+        """Writes the configuration, summary and histogram as JSON."""
+        snapshot = self.snapshot()
+        with self.lock:
+            buckets = self.histogram.buckets()
+        report = {
+            'request': {
+                'method': self.data.get('method'),
+                'url': self.data.get('url'),
+            },
+            'config': {
+                'total': self.total,
+                'duration': self.duration,
+                'concurrency': self.concurrency,
+                'rps': self.rps,
+            },
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'summary': snapshot,
+            'histogram': [{'le': le, 'count': count} for le, count in buckets],
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return path
+
+
+def export_path(request_path):
+    """Load test reports live next to the request they belong to."""
+    base = request_path[:-5] if request_path.endswith('.json') else request_path
+    return base + '.loadtest.json'
@@ -5,15 +5,18 @@ import os
 # Assuming we are in the root of the workspace
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'git-cola')))
 
-from qtpy import QtWidgets
-from cola import qtutils
-from cola import themes
-from cola import icons
-from cola import i18n
-from hellorestsoft import app
 
 def main():
     argv = sys.argv
+    if len(argv) > 1 and argv[1] == 'run':
+        # Headless mode: never touches qtpy or cola
+        from hellorestsoft import cli
+        return cli.run(argv[2:])
+    if len(argv) > 1 and argv[1] == 'import':
+        from hellorestsoft import cli
+        return cli.import_files(argv[2:])
+
+    from hellorestsoft import app
     context = app.application_init(argv)
     
     # Create main window
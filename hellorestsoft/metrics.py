@@ -0,0 +1,294 @@
+"""In-process timing metrics and opt-in session profiling.
+
+Hot paths record durations into `registry`, a thread-safe ring buffer of
+recent samples. The metrics panel summarises the buffer; it can also be
+exported as Prometheus text (for the node_exporter textfile collector) or
+appended to a JSON-lines file. Nothing here imports Qt.
+"""
+import os
+import sys
+import json
+import math
+import time
+import threading
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
+
+DEFAULT_CAPACITY = 10000
+PREFIX = 'hellorestsoft_'
+
+DESCRIPTIONS = {
+    'http.connect': "TCP connect time of new connections, including DNS resolution",
+    'http.tls': "TLS handshake time of new connections",
+    'http.send': "Time spent sending request headers and body",
+    'http.ttfb': "Time from sending the request to the response headers",
+    'http.download': "Time from the response headers to the end of the body",
+    'http.total': "Total request time",
+    'tree.refresh': "Sidebar update after a batch of directory changes",
+    'tree.load': "Sidebar rebuild when a collection is opened",
+    'render.format': "Formatting a response body on a worker",
+    'render.body': "Formatting and streaming a response body into the editor",
+    'render.json_index': "Indexing a response for the JSON tab",
+    'save.write': "Writing a request file",
+    'save.latency': "Time from queueing a save until the file is on disk",
+}
+
+Sample = namedtuple('Sample', ['seq', 'timestamp', 'name', 'seconds', 'labels'])
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    rank = math.ceil(fraction * len(values)) - 1
+    return values[min(len(values) - 1, max(0, rank))]
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'max': values[-1] if values else 0.0,
+    }
+
+
+def _prometheus_name(name):
+    return PREFIX + ''.join(c if c.isalnum() else '_' for c in name) + '_seconds'
+
+
+def _prometheus_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Metrics:
+    """Thread-safe ring buffer of timing samples.
+
+    Only the newest `capacity` samples are kept for percentiles; counts
+    and sums per series are cumulative so exported counters never go
+    backwards. Recording is a lock and a deque append, cheap enough for
+    the GUI thread.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.samples = deque(maxlen=capacity)
+        self.totals = {}  # (name, labels) -> [count, sum]
+        self.enabled = True
+        self.seq = 0
+        # Last sequence number appended to each JSON-lines file
+        self.exported = {}
+        self.lock = threading.Lock()
+
+    def set_capacity(self, capacity):
+        with self.lock:
+            if capacity != self.samples.maxlen:
+                self.samples = deque(self.samples, maxlen=capacity)
+
+    def record(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        labels = tuple(sorted((key, str(value)) for key, value in labels.items()))
+        with self.lock:
+            self.seq += 1
+            self.samples.append(Sample(self.seq, time.time(), name, seconds, labels))
+            total = self.totals.get((name, labels))
+            if total is None:
+                self.totals[(name, labels)] = [1, seconds]
+            else:
+                total[0] += 1
+                total[1] += seconds
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Records how long the `with` block took, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.samples)
+
+    def clear(self):
+        """Empties the ring buffer; cumulative counts and sums are kept."""
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self, by_labels=False):
+        """Stats over the buffered samples, keyed by name or (name, labels)."""
+        series = {}
+        for sample in self.snapshot():
+            key = (sample.name, sample.labels) if by_labels else sample.name
+            series.setdefault(key, []).append(sample.seconds)
+        result = {}
+        for key, values in sorted(series.items()):
+            result[key] = summarize(values)
+            result[key]['last'] = values[-1]
+        return result
+
+    def to_prometheus(self):
+        """Renders every series as a Prometheus summary."""
+        with self.lock:
+            totals = {key: list(value) for key, value in self.totals.items()}
+        stats = self.summary(by_labels=True)
+        lines = []
+        for name in sorted({name for name, _ in totals}):
+            metric = _prometheus_name(name)
+            lines.append(f"# HELP {metric} {DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {metric} summary")
+            for (series, labels), (count, total) in sorted(totals.items()):
+                if series != name:
+                    continue
+                buffered = stats.get((name, labels))
+                if buffered is not None:
+                    for quantile, stat in (('0.5', 'p50'), ('0.95', 'p95')):
+                        lines.append(f"{metric}{_prometheus_labels(labels, [('quantile', quantile)])}"
+                                     f" {buffered[stat]:.6f}")
+                lines.append(f"{metric}_sum{_prometheus_labels(labels)} {total:.6f}")
+                lines.append(f"{metric}_count{_prometheus_labels(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def export_prometheus(self, path):
+        # Imported here: the writer itself records save timings
+        from hellorestsoft.models.writer import atomic_write
+        atomic_write(path, self.to_prometheus().encode('utf-8'))
+        return path
+
+    def export_jsonl(self, path):
+        """Appends the samples recorded since the last export to `path`.
+
+        Returns the number of lines written.
+        """
+        path = os.path.abspath(path)
+        last = self.exported.get(path, 0)
+        samples = [sample for sample in self.snapshot() if sample.seq > last]
+        if samples:
+            with open(path, 'a', encoding='utf-8') as f:
+                for sample in samples:
+                    f.write(json.dumps({
+                        'ts': round(sample.timestamp, 6),
+                        'name': sample.name,
+                        'seconds': round(sample.seconds, 6),
+                        'labels': dict(sample.labels),
+                    }) + '\n')
+            self.exported[path] = samples[-1].seq
+        return len(samples)
+
+    def export(self, path):
+        """Exports by file extension: .jsonl/.ndjson appends samples, anything else is Prometheus text."""
+        if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson'):
+            self.export_jsonl(path)
+        else:
+            self.export_prometheus(path)
+        return path
+
+
+registry = Metrics()
+
+
+def record(name, seconds, **labels):
+    registry.record(name, seconds, **labels)
+
+
+def timer(name, **labels):
+    return registry.timer(name, **labels)
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread from a background thread.
+
+    Unlike cProfile, which only sees the thread it was enabled on, this
+    also catches time spent on the engine loop and workers. Stacks are
+    written in the folded format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='hellorestsoft-sampler', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def dump(self, path):
+        from hellorestsoft.models.writer import atomic_write
+        text = ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        atomic_write(path, text.encode('utf-8'))
+
+
+class SessionProfiler:
+    """Profiles from start() to stop() and writes the result to `directory`.
+
+    mode='cprofile' profiles the GUI thread (the thread calling start())
+    with cProfile and writes a .prof file for pstats/snakeviz;
+    mode='sampling' samples all threads and writes a .folded file.
+    """
+
+    MODES = ('cprofile', 'sampling')
+
+    def __init__(self, directory, mode='cprofile', interval=0.005):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; use one of {', '.join(self.MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        self.profiler = None
+        self.started = None
+
+    def start(self):
+        if self.mode == 'cprofile':
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = SamplingProfiler(self.interval)
+            self.profiler.start()
+        self.started = time.time()
+
+    def stop(self):
+        """Stops profiling and returns the path of the written profile."""
+        if self.profiler is None:
+            return None
+        profiler, self.profiler = self.profiler, None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started))
+        if self.mode == 'cprofile':
+            profiler.disable()
+            path = os.path.join(self.directory, f"session-{stamp}-{os.getpid()}.prof")
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = os.path.join(self.directory, f"session-{stamp}-{os.getpid()}.folded")
+            profiler.dump(path)
+        return path
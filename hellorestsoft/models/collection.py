@@ -1,39 +1,276 @@
 import os
 import json
 import shutil
+import sqlite3
+import threading
+
+from hellorestsoft import metrics
+from hellorestsoft.models.index import MetadataIndex, is_request_file, metadata_dir, response_text
+from hellorestsoft.models.writer import BackgroundWriter, atomic_write_json, atomic_write_many
+
+
+def safe_name(name):
+    """Strips a request or folder name down to characters safe in file names."""
+    return "".join([c for c in name if c.isalpha() or c.isdigit() or c in (' ', '-', '_')]).strip()
+
+
+def entry_sort_key(entry):
+    """Directories first, then requests, each alphabetically."""
+    return (entry['type'] != 'dir', entry['name'])
+
+
+def scan_dir(path):
+    """Lists one directory level as sorted entry dicts.
+
+    Uses os.scandir so the file type comes from the directory listing
+    instead of an extra stat() per entry. Hidden entries are skipped; they
+    hold app metadata rather than requests.
+    """
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for item in it:
+                if item.name.startswith('.'):
+                    continue
+                try:
+                    is_dir = item.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    entries.append({'type': 'dir', 'name': item.name, 'path': item.path})
+                elif is_request_file(item.name):
+                    entries.append({'type': 'file', 'name': item.name[:-5], 'path': item.path})
+    except OSError:
+        return []
+    entries.sort(key=entry_sort_key)
+    return entries
+
+
+class CollectionIndex:
+    """Lazily populated, per-directory cache of the collection tree.
+
+    Directories are only scanned when first listed, and a change to one
+    directory only rescans that directory. With a MetadataIndex the first
+    listing comes straight from the persistent index, and rescans go
+    through it so request metadata stays current.
+    """
+
+    def __init__(self, root_path, metadata=None):
+        self.root_path = root_path
+        self.metadata = metadata
+        self.dirs = {}
+
+    def _scan(self, path):
+        if self.metadata is None:
+            return scan_dir(path)
+        self.metadata.reconcile_dir(path)
+        entries = self.metadata.children(path) or []
+        entries.sort(key=entry_sort_key)
+        return entries
+
+    def list_dir(self, path):
+        entries = self.dirs.get(path)
+        if entries is None:
+            if self.metadata is not None:
+                # Trust the persistent index for the first paint; background
+                # reconciliation corrects it afterwards.
+                entries = self.metadata.children(path)
+                if entries is not None:
+                    entries.sort(key=entry_sort_key)
+            if entries is None:
+                entries = self._scan(path)
+            self.dirs[path] = entries
+        return entries
+
+    def is_loaded(self, path):
+        return path in self.dirs
+
+    def refresh_dir(self, path):
+        """Rescans a directory if it was loaded; returns True if it changed."""
+        old = self.dirs.get(path)
+        if old is None:
+            return False
+        entries = self._scan(path)
+        if entries == old:
+            return False
+        self.dirs[path] = entries
+        # Forget the cached listings of subdirectories that went away
+        kept = {e['path'] for e in entries if e['type'] == 'dir'}
+        for entry in old:
+            if entry['type'] == 'dir' and entry['path'] not in kept:
+                self.forget(entry['path'])
+        return True
+
+    def forget(self, path):
+        prefix = path + os.sep
+        for cached in list(self.dirs):
+            if cached == path or cached.startswith(prefix):
+                del self.dirs[cached]
+
+    def clear(self):
+        self.dirs = {}
+
 
 class CollectionManager:
-    def __init__(self, root_path):
+    def __init__(self, root_path, use_index=True):
         self.root_path = root_path
         if not os.path.exists(self.root_path):
             try:
                 os.makedirs(self.root_path)
             except OSError:
                 pass
+        self.metadata = None
+        if use_index:
+            try:
+                self.metadata = MetadataIndex(self.root_path)
+            except (OSError, sqlite3.Error):
+                self.metadata = None  # Read-only root; fall back to plain scans
+        self.index = CollectionIndex(self.root_path, self.metadata)
+        self.listeners = []
+        self.watcher = None
+        self.reconcile_thread = None
+        self._stop_reconcile = threading.Event()
+        self._search = None
+        self._history = None
+        self.writer = BackgroundWriter(on_written=self._written)
+        self._environments = None
+
+    @property
+    def history(self):
+        """The collection's HistoryStore, opened on first use; None if unavailable."""
+        if self._history is None:
+            from hellorestsoft.models.history import HistoryStore
+            try:
+                self._history = HistoryStore(self.root_path, on_record=self._recorded)
+            except (OSError, sqlite3.Error):
+                return None
+        return self._history
+
+    @property
+    def environments(self):
+        """The collection's EnvironmentStore, loaded on first use."""
+        if self._environments is None:
+            from hellorestsoft.models.environment import EnvironmentStore
+            self._environments = EnvironmentStore(self.root_path)
+        return self._environments
+
+    def search(self, query, limit=50):
+        """Quick-open search by fuzzy name and full text; see RequestSearch."""
+        if self.metadata is None:
+            return []
+        if self._search is None:
+            from hellorestsoft.models.search import RequestSearch
+            self._search = RequestSearch(self.metadata)
+        return self._search.search(query, limit)
+
+    def reconcile(self):
+        """Validates the persistent index against the filesystem.
+
+        Safe to call from a worker thread. Returns the changed directories,
+        which should then be passed to apply_changes() on the GUI thread.
+        """
+        if self.metadata is None:
+            return []
+        return self.metadata.reconcile(should_stop=self._stop_reconcile.is_set)
+
+    def reconcile_in_background(self, callback):
+        """Runs reconcile() on a thread and hands the result to `callback`."""
+        def run():
+            try:
+                changed = self.reconcile()
+            except sqlite3.Error:
+                changed = []
+            if not self._stop_reconcile.is_set():
+                callback(changed)
+
+        self.reconcile_thread = threading.Thread(
+            target=run, name='hellorestsoft-reconcile', daemon=True)
+        self.reconcile_thread.start()
+
+    def close(self):
+        self.writer.close()
+        self.stop_watching()
+        self._stop_reconcile.set()
+        if self.reconcile_thread is not None:
+            self.reconcile_thread.join()
+            self.reconcile_thread = None
+        if self.metadata is not None:
+            self.metadata.close()
+            self.metadata = None
+            self.index.metadata = None
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
+    def add_listener(self, callback):
+        """Registers `callback(dir_path)`, called when a directory's listing changes."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def notify_changed(self, dir_path):
+        if self.index.refresh_dir(dir_path):
+            for callback in list(self.listeners):
+                callback(dir_path)
+            return True
+        return False
+
+    def apply_changes(self, dir_paths):
+        """Rescans a batch of changed directories, parents before children.
+
+        Returns the directories whose listing actually changed.
+        """
+        with metrics.timer('tree.refresh'):
+            changed = [path for path in sorted(dir_paths) if self.notify_changed(path)]
+            if changed and self.watcher is not None:
+                self.watcher.sync(self.index.dirs)
+        return changed
+
+    def start_watching(self, **kwargs):
+        """Follows external changes (git pull, other editors) to loaded directories.
+
+        Requires a running Qt event loop; see CollectionWatcher for options.
+        """
+        if self.watcher is None:
+            from hellorestsoft.models.watcher import CollectionWatcher
+            self.watcher = CollectionWatcher(self, **kwargs)
+            self.watcher.sync(self.index.dirs)
+        return self.watcher
+
+    def stop_watching(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def list_dir(self, path=None):
+        """Returns the sorted entries of a single directory."""
+        if path is None:
+            path = self.root_path
+        loaded = self.index.is_loaded(path)
+        entries = self.index.list_dir(path)
+        if not loaded and self.watcher is not None:
+            self.watcher.watch(path)
+        return entries
 
     def get_tree(self):
         """Returns a nested dictionary representing the file structure."""
         if not os.path.exists(self.root_path):
             return {}
-            
+
         def build_tree(path):
             tree = {'files': [], 'dirs': {}}
-            try:
-                items = sorted(os.listdir(path))
-            except OSError:
-                return tree
-
-            for item in items:
-                full_path = os.path.join(path, item)
-                if os.path.isdir(full_path):
-                    tree['dirs'][item] = build_tree(full_path)
-                elif item.endswith('.json'):
+            for entry in scan_dir(path):
+                if entry['type'] == 'dir':
+                    tree['dirs'][entry['name']] = build_tree(entry['path'])
+                else:
                     tree['files'].append({
-                        'name': item[:-5],
-                        'path': full_path
+                        'name': entry['name'],
+                        'path': entry['path']
                     })
             return tree
-            
+
         return build_tree(self.root_path)
 
     def create_collection(self, name, parent_path=None):
@@ -41,33 +278,117 @@ class CollectionManager:
         if parent_path is None:
             parent_path = self.root_path
         
-        # Sanitize name
-        safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c in (' ', '-', '_')]).strip()
-        if not safe_name:
+        folder_name = safe_name(name)
+        if not folder_name:
             raise ValueError("Invalid collection name")
             
-        path = os.path.join(parent_path, safe_name)
+        path = os.path.join(parent_path, folder_name)
         if os.path.exists(path):
             raise FileExistsError("Collection already exists")
             
         os.makedirs(path)
+        if self.metadata is not None:
+            self.metadata.add_dir(path)
+        self.apply_changes([parent_path])
         return path
 
-    def save_request(self, name, data, parent_path=None):
-        """Saves a request to a JSON file."""
+    def request_path(self, name, parent_path=None):
+        """Path a request saved under `name` would be written to."""
         if parent_path is None:
             parent_path = self.root_path
             
-        # Ensure name is safe
-        safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c in (' ', '-', '_')]).strip()
-        if not safe_name:
-            safe_name = "untitled"
-            
-        path = os.path.join(parent_path, safe_name + ".json")
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
+        file_name = safe_name(name) or "untitled"
+        return os.path.join(parent_path, file_name + ".json")
+
+    def save_request(self, name, data, parent_path=None):
+        """Saves a request to a JSON file, atomically, and waits for it."""
+        path = self.request_path(name, parent_path)
+        with metrics.timer('save.write', mode='sync'):
+            atomic_write_json(path, data)
+        self._written(path)
+        self.apply_changes([os.path.dirname(path)])
         return path
+
+    def save_request_async(self, path, data, callback=None):
+        """Queues a request write on the background writer.
+
+        Repeated saves of one path that are still queued collapse into a
+        single write of the newest data. `callback(path, error)` is called
+        from the writer thread once the file is on disk (or failed); the
+        caller should then pass the directory to apply_changes() on the GUI
+        thread.
+        """
+        self.writer.submit(path, data, callback)
+
+    def write_requests(self, files):
+        """Writes a batch of request files at once; safe from a worker thread.
+
+        `files` holds (path, JSON bytes) pairs. The files are staged and
+        renamed into place together, and indexed in one transaction.
+        Returns the directories to pass to apply_changes() on the GUI
+        thread, which then refreshes the sidebar once for the batch.
+        """
+        atomic_write_many(files, metadata_dir(self.root_path))
+        if self.metadata is not None:
+            self.metadata.update_files(files)
+        changed = set()
+        for path, _ in files:
+            directory = os.path.dirname(path)
+            while directory not in changed:
+                changed.add(directory)
+                if directory == self.root_path or os.path.dirname(directory) == directory:
+                    break
+                directory = os.path.dirname(directory)
+        return sorted(changed)
+
+    def flush_writes(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def _written(self, path):
+        if self.metadata is not None:
+            self.metadata.update_file(path)
+
+    def _recorded(self, path, response):
+        # Keeps the newest response searchable now that it is not in the file
+        if self.metadata is not None:
+            self.metadata.update_response(path, response_text(response))
+
+    def delete(self, path):
+        """Deletes a request file or a whole collection folder."""
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        if self.metadata is not None:
+            self.metadata.remove(path)
+        if self.history is not None:
+            self.history.forget(path)
+        self.apply_changes([os.path.dirname(path)])
             
+    def collect_requests(self, folder=None):
+        """Loads every saved request below `folder`, in sidebar order.
+
+        Returns a list of (path, name, data) tuples; unreadable files are
+        returned with data=None so callers can report them.
+        """
+        if folder is None:
+            folder = self.root_path
+        requests = []
+
+        def walk(path):
+            for entry in scan_dir(path):
+                if entry['type'] == 'dir':
+                    walk(entry['path'])
+                    continue
+                try:
+                    data = self.load_request(entry['path'])
+                except (OSError, ValueError):
+                    data = None
+                requests.append((entry['path'], entry['name'], data))
+
+        walk(folder)
+        return requests
+
     def load_request(self, path):
         with open(path, 'r') as f:
             return json.load(f)
@@ -0,0 +1,108 @@
+"""Per-collection environments: named sets of template variables"""
+import os
+import json
+import threading
+
+from hellorestsoft.models.index import metadata_dir
+from hellorestsoft.models.writer import atomic_write_json
+
+
+class EnvironmentStore:
+    """Environments of one collection, kept in .hellorestsoft/environments.json.
+
+    Each environment maps variable names to values; one of them may be
+    active. Values captured from responses are held in memory for the
+    session and take precedence over the environment's own values.
+    """
+
+    def __init__(self, root_path, path=None):
+        self.root_path = root_path
+        self.path = path or os.path.join(metadata_dir(root_path), 'environments.json')
+        self.lock = threading.Lock()
+        self.environments = {}
+        self.active = None
+        self.captured = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        environments = data.get('environments')
+        if not isinstance(environments, dict):
+            environments = {}
+        with self.lock:
+            self.environments = {
+                name: {str(k): str(v) for k, v in values.items()}
+                for name, values in environments.items() if isinstance(values, dict)}
+            active = data.get('active')
+            self.active = active if active in self.environments else None
+
+    def save(self):
+        with self.lock:
+            data = {'active': self.active, 'environments': self.environments}
+        parent = os.path.dirname(self.path)
+        if not os.path.exists(parent):
+            os.makedirs(parent)
+        atomic_write_json(self.path, data)
+
+    def names(self):
+        with self.lock:
+            return sorted(self.environments)
+
+    def get(self, name):
+        with self.lock:
+            return dict(self.environments.get(name, {}))
+
+    def set(self, name, values):
+        with self.lock:
+            self.environments[name] = {str(k): str(v) for k, v in values.items()}
+
+    def remove(self, name):
+        with self.lock:
+            self.environments.pop(name, None)
+            if self.active == name:
+                self.active = None
+
+    def set_active(self, name):
+        with self.lock:
+            self.active = name if name in self.environments else None
+            # Captured values belong to the environment they were captured in
+            self.captured = {}
+
+    def capture(self, values):
+        """Stores values extracted from a response; safe from any thread."""
+        if not values:
+            return
+        with self.lock:
+            self.captured.update(values)
+
+    def variables(self, overrides=None):
+        """Values visible to templates: environment, then captured, then overrides."""
+        with self.lock:
+            variables = dict(self.environments.get(self.active, {}))
+            variables.update(self.captured)
+        if overrides:
+            variables.update(overrides)
+        return variables
+
+
+def find_environments(path):
+    """The EnvironmentStore of the collection containing `path`, or None.
+
+    Walks up from `path` to the nearest directory with a .hellorestsoft
+    metadata folder, so a subfolder run still sees its collection's
+    environments.
+    """
+    path = os.path.abspath(path)
+    while True:
+        if os.path.exists(os.path.join(metadata_dir(path), 'environments.json')):
+            return EnvironmentStore(path)
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
@@ -0,0 +1,251 @@
+"""Per-request response history, kept apart from the request files"""
+import os
+import json
+import time
+import zlib
+import hashlib
+import sqlite3
+import threading
+
+from hellorestsoft.models.index import metadata_dir
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HISTORY_SCHEMA_VERSION = 1
+
+# Responses kept per request unless the caller asks otherwise
+DEFAULT_KEEP = 100
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    request TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    method TEXT,
+    url TEXT,
+    status_code INTEGER,
+    elapsed REAL,
+    size INTEGER,
+    http_version TEXT,
+    encoding TEXT,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    headers TEXT,
+    timings TEXT,
+    body_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS responses_request ON responses(request, timestamp);
+CREATE INDEX IF NOT EXISTS responses_body ON responses(body_hash);
+"""
+
+
+def compress(data):
+    """Returns (codec, compressed bytes); zstd when available, else zlib."""
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=3).compress(data)
+    return 'zlib', zlib.compress(data, 6)
+
+
+def decompress(codec, data):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("History entry is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    return data
+
+
+class HistoryStore:
+    """Append-only SQLite log of the responses received for each request.
+
+    Each response is one row of status, latency, size and headers keyed by
+    the request's path relative to the collection root. Bodies live in a
+    separate content-addressed table, compressed, so a request that keeps
+    returning the same payload stores it once. Only the newest `keep`
+    responses per request are retained; bodies nothing refers to any more
+    are dropped along with them.
+    """
+
+    def __init__(self, root_path, db_path=None, on_record=None):
+        self.root_path = root_path
+        self.on_record = on_record
+        if db_path is None:
+            db_dir = metadata_dir(root_path)
+            if not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            db_path = os.path.join(db_dir, 'history.sqlite')
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+
+    def _migrate(self):
+        with self.lock, self.conn:
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, HISTORY_SCHEMA_VERSION):
+                self.conn.execute('DROP TABLE IF EXISTS responses')
+                self.conn.execute('DROP TABLE IF EXISTS blobs')
+            self.conn.executescript(HISTORY_SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {HISTORY_SCHEMA_VERSION}')
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _rel(self, path):
+        prefix = self.root_path + os.sep
+        if path.startswith(prefix):
+            rel = path[len(prefix):]
+        else:
+            rel = os.path.relpath(path, self.root_path)
+        return rel.replace(os.sep, '/')
+
+    def _store_body(self, text):
+        if text is None:
+            return None
+        raw = text.encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha256(raw).hexdigest()
+        exists = self.conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if exists is None:
+            codec, data = compress(raw)
+            self.conn.execute(
+                'INSERT INTO blobs (hash, codec, size, data) VALUES (?, ?, ?, ?)',
+                (digest, codec, len(raw), sqlite3.Binary(data)))
+        return digest
+
+    def _drop_unreferenced(self, hashes):
+        for digest in set(hashes):
+            if digest is None:
+                continue
+            self.conn.execute(
+                'DELETE FROM blobs WHERE hash = ?'
+                ' AND NOT EXISTS (SELECT 1 FROM responses WHERE body_hash = ?)',
+                (digest, digest))
+
+    def record(self, path, response, method=None, url=None, keep=DEFAULT_KEEP, timestamp=None):
+        """Appends a response dict as returned by HttpEngine.request().
+
+        Spool file references are not kept; only the text the response
+        carried (the preview, for spooled bodies) is stored. Returns the
+        new entry's id. `on_record(path, response)` is called afterwards,
+        on the calling thread.
+        """
+        rel = self._rel(path)
+        if timestamp is None:
+            timestamp = time.time()
+        timings = response.get('timings')
+        with self.lock, self.conn:
+            body_hash = self._store_body(response.get('text'))
+            cursor = self.conn.execute(
+                'INSERT INTO responses (request, timestamp, method, url, status_code, elapsed,'
+                ' size, http_version, encoding, truncated, headers, timings, body_hash)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (rel, timestamp, method, url, response.get('status_code'),
+                 response.get('elapsed'), response.get('size'), response.get('http_version'),
+                 response.get('encoding'), int(bool(response.get('truncated'))),
+                 json.dumps(response.get('headers') or {}),
+                 json.dumps(timings) if timings is not None else None, body_hash))
+            if keep:
+                pruned = self.conn.execute(
+                    'SELECT id, body_hash FROM responses WHERE request = ?'
+                    ' ORDER BY timestamp DESC, id DESC LIMIT -1 OFFSET ?',
+                    (rel, keep)).fetchall()
+                if pruned:
+                    self.conn.executemany(
+                        'DELETE FROM responses WHERE id = ?', [(row['id'],) for row in pruned])
+                    self._drop_unreferenced(row['body_hash'] for row in pruned)
+        if self.on_record is not None:
+            self.on_record(path, response)
+        return cursor.lastrowid
+
+    def entries(self, path, limit=100):
+        """Newest-first time series of one request, without bodies."""
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, timestamp, method, url, status_code, elapsed, size, timings'
+                ' FROM responses WHERE request = ? ORDER BY timestamp DESC, id DESC LIMIT ?',
+                (self._rel(path), limit)).fetchall()
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry['timings'] = json.loads(row['timings']) if row['timings'] else None
+            entries.append(entry)
+        return entries
+
+    def load(self, entry_id):
+        """Rebuilds the response dict of one entry, or None if it is gone."""
+        with self.lock:
+            row = self.conn.execute('SELECT * FROM responses WHERE id = ?', (entry_id,)).fetchone()
+            if row is None:
+                return None
+            blob = None
+            if row['body_hash'] is not None:
+                blob = self.conn.execute(
+                    'SELECT codec, data FROM blobs WHERE hash = ?', (row['body_hash'],)).fetchone()
+        text = ''
+        if blob is not None:
+            text = decompress(blob['codec'], bytes(blob['data'])).decode('utf-8', 'surrogatepass')
+        return {
+            'status_code': row['status_code'],
+            'headers': json.loads(row['headers']) if row['headers'] else {},
+            'elapsed': row['elapsed'],
+            'http_version': row['http_version'],
+            'timings': json.loads(row['timings']) if row['timings'] else None,
+            'size': row['size'],
+            'encoding': row['encoding'],
+            'text': text,
+            'truncated': bool(row['truncated']),
+            'timestamp': row['timestamp'],
+        }
+
+    def latest(self, path):
+        """The most recent response recorded for a request, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT id FROM responses WHERE request = ? ORDER BY timestamp DESC, id DESC LIMIT 1',
+                (self._rel(path),)).fetchone()
+        return self.load(row['id']) if row is not None else None
+
+    def adopt(self, path, response, method=None, url=None):
+        """The latest response of a request, recording `response` first if it has none.
+
+        Used for the response older request files carry inline.
+        """
+        latest = self.latest(path)
+        if latest is None and isinstance(response, dict) and 'status_code' in response:
+            self.record(path, response, method, url)
+            latest = response
+        return latest
+
+    def forget(self, path):
+        """Drops the history of a request, or of everything below a folder."""
+        rel = self._rel(path)
+        # '0' sorts right after '/', so this range is everything below rel
+        where = 'request = ? OR (request >= ? AND request < ?)'
+        args = (rel, rel + '/', rel + '0')
+        with self.lock, self.conn:
+            hashes = [row[0] for row in self.conn.execute(
+                f'SELECT DISTINCT body_hash FROM responses WHERE {where}', args)]
+            self.conn.execute(f'DELETE FROM responses WHERE {where}', args)
+            self._drop_unreferenced(hashes)
+
+    def stats(self):
+        """Entry and blob counts plus raw vs stored body bytes."""
+        with self.lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            row = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0)'
+                ' FROM blobs').fetchone()
+        return {'entries': entries, 'blobs': row[0], 'raw_bytes': row[1], 'stored_bytes': row[2]}
@@ -0,0 +1,205 @@
+"""On-disk HTTP cache for conditional GET requests"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import sqlite3
+import tempfile
+import threading
+
+CACHE_SCHEMA_VERSION = 1
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_access ON entries(last_access);
+"""
+
+# Bodies are copied in and out of the cache in chunks of this size
+COPY_CHUNK = 1024 * 1024
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def is_cacheable(status_code, headers):
+    """True for complete responses carrying a validator the server can check."""
+    if status_code != 200:
+        return False
+    cache_control = (_header(headers, 'cache-control') or '').lower()
+    if 'no-store' in cache_control:
+        return False
+    return bool(_header(headers, 'etag') or _header(headers, 'last-modified'))
+
+
+class HttpCache:
+    """Stores GET responses with their validators, bounded by total body size.
+
+    Entries are keyed by URL and request headers, so requests that differ
+    in e.g. Authorization or Accept never share a body. Bodies live in
+    files next to a small SQLite index; the least recently used entries
+    are evicted once the bodies exceed `max_size` bytes.
+    """
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        self.body_dir = os.path.join(directory, 'bodies')
+        if not os.path.exists(self.body_dir):
+            os.makedirs(self.body_dir)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.lock, self.conn:
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, CACHE_SCHEMA_VERSION):
+                self.conn.execute('DROP TABLE IF EXISTS entries')
+            self.conn.executescript(CACHE_SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {CACHE_SCHEMA_VERSION}')
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    @staticmethod
+    def key(url, headers=None):
+        items = sorted((k.lower(), v) for k, v in (headers or {}).items())
+        return hashlib.sha256(json.dumps([url, items]).encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.body_dir, key)
+
+    def lookup(self, key):
+        """The cached entry for `key` as a dict, or None; a hit counts as a use for eviction."""
+        with self.lock:
+            row = self.conn.execute('SELECT * FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if not os.path.exists(self._body_path(key)):
+            self.remove(key)
+            return None
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+        entry = dict(row)
+        entry['last_access'] = now
+        entry['headers'] = json.loads(row['headers'])
+        return entry
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a cached entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key, url, status_code, headers, spool):
+        """Saves a finished response whose body is in a closed SpoolBuffer."""
+        fd, tmp_path = tempfile.mkstemp(prefix='.body-', dir=self.body_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if spool.spooled:
+                    with open(spool.path, 'rb') as source:
+                        shutil.copyfileobj(source, f, COPY_CHUNK)
+                else:
+                    f.write(spool.preview())
+            os.replace(tmp_path, self._body_path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO entries (key, url, etag, last_modified, status_code,'
+                ' headers, size, stored_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, _header(headers, 'etag'), _header(headers, 'last-modified'),
+                 status_code, json.dumps(headers), spool.size, now, now))
+        self.evict()
+
+    def revalidated(self, key, headers):
+        """Refreshes an entry after a 304, merging in the new headers."""
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        merged = dict(entry['headers'])
+        lowered = {k.lower(): k for k in merged}
+        for name, value in (headers or {}).items():
+            # A 304 has no body, so its framing headers don't describe ours
+            if name.lower() in ('content-length', 'transfer-encoding', 'content-encoding'):
+                continue
+            merged.pop(lowered.get(name.lower(), name), None)
+            merged[name] = value
+        with self.lock, self.conn:
+            self.conn.execute(
+                'UPDATE entries SET headers = ?, etag = ?, last_modified = ?, last_access = ?'
+                ' WHERE key = ?',
+                (json.dumps(merged), _header(merged, 'etag'), _header(merged, 'last-modified'),
+                 time.time(), key))
+        entry['headers'] = merged
+        entry['etag'] = _header(merged, 'etag')
+        entry['last_modified'] = _header(merged, 'last-modified')
+        return entry
+
+    def read_into(self, key, spool):
+        """Feeds a cached body into a SpoolBuffer, as if it came off the wire."""
+        with open(self._body_path(key), 'rb') as f:
+            while True:
+                chunk = f.read(COPY_CHUNK)
+                if not chunk:
+                    break
+                spool.write(chunk)
+
+    def remove(self, key):
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def total_size(self):
+        with self.lock:
+            return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def evict(self):
+        """Drops least recently used entries until the bodies fit in max_size."""
+        with self.lock:
+            total = self.total_size()
+            if total <= self.max_size:
+                return
+            rows = self.conn.execute(
+                'SELECT key, size FROM entries ORDER BY last_access').fetchall()
+            for row in rows:
+                if total <= self.max_size:
+                    break
+                self.remove(row['key'])
+                total -= row['size']
+
+    def clear(self):
+        with self.lock:
+            keys = [row[0] for row in self.conn.execute('SELECT key FROM entries')]
+            for key in keys:
+                self.remove(key)
@@ -0,0 +1,485 @@
+import os
+import re
+import json
+import hashlib
+import sqlite3
+import threading
+
+SCHEMA_VERSION = 2
+
+# Only this much of each text field goes into the full-text index
+MAX_INDEXED_TEXT = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    method TEXT,
+    url TEXT,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+CREATE TABLE IF NOT EXISTS scanned_dirs (
+    path TEXT PRIMARY KEY
+);
+"""
+
+# Full-text index over request contents; rowid mirrors entries.rowid
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    name, method, url, headers, body, response
+);
+"""
+
+
+# Sidecar files written next to requests that are not requests themselves
+SIDECAR_SUFFIXES = ('.loadtest.json',)
+
+
+def is_request_file(name):
+    return name.endswith('.json') and not name.endswith(SIDECAR_SUFFIXES)
+
+
+def metadata_dir(root_path):
+    """Hidden per-collection directory holding app metadata."""
+    return os.path.join(root_path, '.hellorestsoft')
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        value = "\n".join(f"{k}: {v}" for k, v in value.items())
+    elif not isinstance(value, str):
+        value = str(value)
+    return value[:MAX_INDEXED_TEXT]
+
+
+def response_text(response):
+    """The searchable text of a response dict: its body and headers."""
+    return _text(response.get('text')) + "\n" + _text(response.get('headers'))
+
+
+def read_request_metadata(path, raw=None):
+    """Reads a request file into a record of indexed fields.
+
+    Pass `raw` when the file's bytes are already at hand, e.g. right
+    after writing them, to skip reading the file back.
+    """
+    if raw is None:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    record = {
+        'hash': hashlib.sha1(raw).hexdigest(),
+        'method': None,
+        'url': None,
+        'headers': '',
+        'body': '',
+        'response': '',
+    }
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except ValueError:
+        return record
+    if not isinstance(data, dict):
+        return record
+    response = data.get('response')
+    record.update({
+        'method': data.get('method'),
+        'url': data.get('url'),
+        'headers': _text(data.get('headers')),
+        'body': _text(data.get('body')),
+        'response': response_text(response) if isinstance(response, dict) else '',
+    })
+    return record
+
+
+def make_snippet(texts, words, context=40):
+    """Returns the text around the first hit of any word, hit in [brackets]."""
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    for text in texts:
+        if not text:
+            continue
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = max(0, match.start() - context)
+        end = min(len(text), match.end() + context)
+        snippet = (text[start:match.start()] + '[' + match.group(0) + ']'
+                   + text[match.end():end])
+        if start > 0:
+            snippet = '...' + snippet
+        if end < len(text):
+            snippet += '...'
+        return snippet
+    return ''
+
+
+class MetadataIndex:
+    """Persistent SQLite index of a collection root.
+
+    Stores the listing of every scanned directory plus each request's
+    stat result, method, URL and content hash, so the sidebar can paint
+    without touching the request files. Paths are stored relative to the
+    root so a moved collection keeps its index. `reconcile_dir` validates a
+    directory against the filesystem by stat() and only re-reads requests
+    whose mtime or size changed.
+    """
+
+    def __init__(self, root_path, db_path=None):
+        self.root_path = root_path
+        if db_path is None:
+            db_dir = metadata_dir(root_path)
+            if not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            db_path = os.path.join(db_dir, 'index.sqlite')
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.fts = True
+        # Bumped on every write so callers can cache derived data
+        self.generation = 0
+        # Response text recorded for requests whose file is not indexed yet
+        self.pending_responses = {}
+        self._migrate()
+
+    def _migrate(self):
+        with self.lock, self.conn:
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self.conn.execute('DROP TABLE IF EXISTS entries')
+                self.conn.execute('DROP TABLE IF EXISTS scanned_dirs')
+                self.conn.execute('DROP TABLE IF EXISTS search')
+            self.conn.executescript(SCHEMA)
+            try:
+                self.conn.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                self.fts = False  # SQLite built without FTS5
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _rel(self, path):
+        if path == self.root_path:
+            return ''
+        prefix = self.root_path + os.sep
+        if path.startswith(prefix):
+            rel = path[len(prefix):]
+        else:
+            rel = os.path.relpath(path, self.root_path)
+        return rel.replace(os.sep, '/')
+
+    def _abs(self, rel):
+        if not rel:
+            return self.root_path
+        return os.path.join(self.root_path, *rel.split('/'))
+
+    def _entry(self, row):
+        return {
+            'type': row['type'],
+            'name': row['name'],
+            'path': self._abs(row['path']),
+            'method': row['method'],
+            'url': row['url'],
+        }
+
+    def is_scanned(self, dir_path):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT 1 FROM scanned_dirs WHERE path = ?', (self._rel(dir_path),)).fetchone()
+        return row is not None
+
+    def children(self, dir_path):
+        """Indexed entries of a directory (unsorted), or None if it was never scanned."""
+        rel = self._rel(dir_path)
+        with self.lock:
+            if self.conn.execute('SELECT 1 FROM scanned_dirs WHERE path = ?', (rel,)).fetchone() is None:
+                return None
+            rows = self.conn.execute('SELECT * FROM entries WHERE parent = ?', (rel,)).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def get(self, path):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT * FROM entries WHERE path = ?', (self._rel(path),)).fetchone()
+        return self._entry(row) if row is not None else None
+
+    def _delete_tree(self, rel):
+        self.generation += 1
+        # '0' sorts right after '/', so this range is everything below rel
+        prefix = rel + '/'
+        upper = rel + '0'
+        where = 'path = ? OR (path >= ? AND path < ?)'
+        if self.fts:
+            self.conn.execute(
+                f'DELETE FROM search WHERE rowid IN (SELECT rowid FROM entries WHERE {where})',
+                (rel, prefix, upper))
+        for table in ('entries', 'scanned_dirs'):
+            self.conn.execute(f'DELETE FROM {table} WHERE {where}', (rel, prefix, upper))
+
+    def _upsert_file(self, rel, parent, name, stat, record):
+        self.generation += 1
+        response = record['response']
+        if self.fts:
+            pending = self.pending_responses.pop(rel, None)
+            if not response:
+                # Responses now live in the history store; keep the text
+                # update_response() put there when the file has none inline
+                row = self.conn.execute(
+                    'SELECT response FROM search WHERE rowid IN'
+                    ' (SELECT rowid FROM entries WHERE path = ?)', (rel,)).fetchone()
+                response = row[0] if row is not None else pending or ''
+            self.conn.execute(
+                'DELETE FROM search WHERE rowid IN (SELECT rowid FROM entries WHERE path = ?)',
+                (rel,))
+        cursor = self.conn.execute(
+            'INSERT OR REPLACE INTO entries'
+            ' (path, parent, type, name, mtime_ns, size, method, url, hash)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (rel, parent, 'file', name, stat.st_mtime_ns, stat.st_size,
+             record['method'], record['url'], record['hash']))
+        if self.fts:
+            self.conn.execute(
+                'INSERT INTO search (rowid, name, method, url, headers, body, response)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (cursor.lastrowid, name, record['method'] or '', record['url'] or '',
+                 record['headers'], record['body'], response))
+
+    def update_response(self, path, text):
+        """Replaces the indexed response text of a request, e.g. its latest history entry."""
+        if not self.fts:
+            return
+        rel = self._rel(path)
+        with self.lock, self.conn:
+            self.generation += 1
+            cursor = self.conn.execute(
+                'UPDATE search SET response = ? WHERE rowid IN'
+                ' (SELECT rowid FROM entries WHERE path = ?)', (text, rel))
+            if not cursor.rowcount:
+                # A new request can be recorded before its file is indexed
+                self.pending_responses[rel] = text
+
+    def update_file(self, path):
+        """Re-indexes a single request file after it was written."""
+        try:
+            stat = os.stat(path)
+            record = read_request_metadata(path)
+        except OSError:
+            self.remove(path)
+            return
+        rel = self._rel(path)
+        parent = self._rel(os.path.dirname(path))
+        name = os.path.basename(path)[:-5]
+        with self.lock, self.conn:
+            self._upsert_file(rel, parent, name, stat, record)
+
+    def update_files(self, files):
+        """Indexes many freshly written request files in one transaction.
+
+        `files` holds (path, raw bytes) pairs; directories are recorded
+        along the way, so a bulk import is a single commit.
+        """
+        rows = []
+        for path, raw in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            rows.append((path, stat, read_request_metadata(path, raw)))
+        with self.lock, self.conn:
+            known = set()
+            for path, stat, record in rows:
+                parent = os.path.dirname(path)
+                # Register new folders up to the first one already indexed
+                directory = parent
+                while directory not in known and directory != self.root_path:
+                    rel = self._rel(directory)
+                    exists = self.conn.execute(
+                        'SELECT 1 FROM entries WHERE path = ?', (rel,)).fetchone()
+                    known.add(directory)
+                    if exists:
+                        break
+                    self.generation += 1
+                    self.conn.execute(
+                        'INSERT INTO entries (path, parent, type, name) VALUES (?, ?, ?, ?)',
+                        (rel, self._rel(os.path.dirname(directory)), 'dir',
+                         os.path.basename(directory)))
+                    # A new folder holds only what this batch put there, so
+                    # its listing is complete without a scan
+                    self.conn.execute(
+                        'INSERT OR IGNORE INTO scanned_dirs (path) VALUES (?)', (rel,))
+                    directory = os.path.dirname(directory)
+                self._upsert_file(self._rel(path), self._rel(parent),
+                                  os.path.basename(path)[:-5], stat, record)
+
+    def add_dir(self, path):
+        rel = self._rel(path)
+        parent = self._rel(os.path.dirname(path))
+        with self.lock, self.conn:
+            self.generation += 1
+            self.conn.execute(
+                'INSERT OR REPLACE INTO entries (path, parent, type, name) VALUES (?, ?, ?, ?)',
+                (rel, parent, 'dir', os.path.basename(path)))
+
+    def remove(self, path):
+        with self.lock, self.conn:
+            self._delete_tree(self._rel(path))
+
+    def reconcile_dir(self, dir_path):
+        """Brings one directory's rows in line with the filesystem.
+
+        Returns True if anything about the directory's entries changed.
+        """
+        rel_dir = self._rel(dir_path)
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT path, type, mtime_ns, size FROM entries WHERE parent = ?',
+                (rel_dir,)).fetchall()
+            scanned = self.conn.execute(
+                'SELECT 1 FROM scanned_dirs WHERE path = ?', (rel_dir,)).fetchone() is not None
+        known = {row['path']: row for row in rows}
+
+        seen = set()
+        dirs = []
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    if item.name.startswith('.'):
+                        continue
+                    try:
+                        if item.is_dir():
+                            dirs.append(item)
+                        elif is_request_file(item.name):
+                            files.append((item, item.stat()))
+                    except OSError:
+                        continue
+        except OSError:
+            # The directory itself is gone
+            if scanned or known:
+                self.remove(dir_path)
+                return True
+            return False
+
+        new_dirs = []
+        updates = []
+        for item in dirs:
+            rel = self._rel(item.path)
+            seen.add(rel)
+            row = known.get(rel)
+            if row is None or row['type'] != 'dir':
+                new_dirs.append((rel, item.name))
+        for item, stat in files:
+            rel = self._rel(item.path)
+            seen.add(rel)
+            row = known.get(rel)
+            if (row is not None and row['type'] == 'file'
+                    and row['mtime_ns'] == stat.st_mtime_ns and row['size'] == stat.st_size):
+                continue
+            try:
+                record = read_request_metadata(item.path)
+            except OSError:
+                continue
+            updates.append((rel, item.name[:-5], stat, record))
+        removed = [rel for rel in known if rel not in seen]
+
+        changed = bool(new_dirs or updates or removed or not scanned)
+        if not changed:
+            return False
+        with self.lock, self.conn:
+            for rel in removed:
+                self._delete_tree(rel)
+            for rel, name in new_dirs:
+                self._delete_tree(rel)
+                self.generation += 1
+                self.conn.execute(
+                    'INSERT INTO entries (path, parent, type, name) VALUES (?, ?, ?, ?)',
+                    (rel, rel_dir, 'dir', name))
+            for rel, name, stat, record in updates:
+                self._upsert_file(rel, rel_dir, name, stat, record)
+            self.conn.execute('INSERT OR IGNORE INTO scanned_dirs (path) VALUES (?)', (rel_dir,))
+        return True
+
+    def requests(self):
+        """All indexed requests as (name, path, method, url) tuples."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT name, path, method, url FROM entries WHERE type = 'file'").fetchall()
+        return [(row['name'], self._abs(row['path']), row['method'], row['url']) for row in rows]
+
+    def search_content(self, query, limit=50):
+        """Full-text search over request contents, best matches first.
+
+        Every word in `query` must match, as a prefix. Returns
+        (path, name, method, url, snippet) tuples. Without FTS5 only name,
+        method and URL are searched, using LIKE.
+        """
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+        match = ' '.join(f'"{word}"*' for word in words)
+        with self.lock:
+            if self.fts:
+                # FTS5 ranks by bm25 and stops after `limit` rows itself when
+                # ordered by rank. Snippets are cut in Python from the stored
+                # columns, which avoids a second MATCH pass.
+                rowids = [row[0] for row in self.conn.execute(
+                    "SELECT rowid FROM search WHERE search MATCH ? ORDER BY rank LIMIT ?",
+                    (match, limit))]
+                if not rowids:
+                    return []
+                placeholders = ','.join('?' * len(rowids))
+                found = {row['rowid']: row for row in self.conn.execute(
+                    "SELECT e.rowid AS rowid, e.path, e.name, e.method, e.url,"
+                    " s.url AS s_url, s.headers, s.body, s.response"
+                    " FROM entries e JOIN search s ON s.rowid = e.rowid"
+                    f" WHERE e.rowid IN ({placeholders})", rowids)}
+                rows = []
+                for rowid in rowids:
+                    row = found.get(rowid)
+                    if row is not None:
+                        texts = (row['s_url'], row['headers'], row['body'], row['response'])
+                        rows.append((row, make_snippet(texts, words)))
+                return [(self._abs(row['path']), row['name'], row['method'], row['url'], snippet)
+                        for row, snippet in rows]
+            else:
+                pattern = f"%{query.strip()}%"
+                rows = self.conn.execute(
+                    "SELECT path, name, method, url FROM entries"
+                    " WHERE type = 'file' AND (name LIKE ? OR url LIKE ? OR method LIKE ?)"
+                    " LIMIT ?", (pattern, pattern, pattern, limit)).fetchall()
+        return [(self._abs(row['path']), row['name'], row['method'], row['url'], '')
+                for row in rows]
+
+    def subdirs(self, dir_path):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT path FROM entries WHERE parent = ? AND type = 'dir'",
+                (self._rel(dir_path),)).fetchall()
+        return [self._abs(row['path']) for row in rows]
+
+    def reconcile(self, should_stop=None):
+        """Walks the whole collection, validating each directory by stat().
+
+        Unchanged requests cost one stat() each; only new or modified files
+        are read. Returns the directories whose entries changed.
+        """
+        changed = []
+        pending = [self.root_path]
+        while pending:
+            if should_stop is not None and should_stop():
+                break
+            path = pending.pop()
+            if self.reconcile_dir(path):
+                changed.append(path)
+            pending.extend(self.subdirs(path))
+        return changed
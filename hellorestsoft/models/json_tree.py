@@ -0,0 +1,474 @@
+"""Lazily indexed JSON documents and path queries over them"""
+import re
+import json
+import itertools
+
+# Children listed per expansion; the rest are behind a "more" entry
+PAGE_SIZE = 500
+# Characters of a string value kept for display
+PREVIEW_SIZE = 200
+# Containers at least this long have their extent remembered once scanned
+SPAN_CACHE_MIN = 64 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+# Decodes a container only far enough to find its end: objects collapse to
+# their key count as soon as they are parsed, so no tree is ever built
+_skipper = json.JSONDecoder(object_pairs_hook=len)
+_scanstring = json.decoder.scanstring
+
+
+def _skip(text, pos):
+    return WHITESPACE.match(text, pos).end()
+
+
+def _kind(value):
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, bool):
+        return 'boolean'
+    if value is None:
+        return 'null'
+    return 'number'
+
+
+class JsonNode:
+    """One value of a document, located by its offsets in the source text.
+
+    Containers don't hold their children until JsonDocument.load_children()
+    is called; `resume` is where the next page of children starts. Nodes
+    built from an already decoded value (query results below a recursive
+    descent, for instance) carry it in `obj` instead of offsets.
+    """
+
+    __slots__ = ('key', 'kind', 'start', 'end', 'size', 'value', 'obj',
+                 'children', 'resume', 'complete')
+
+    def __init__(self, key, kind, start=None, end=None, size=None, value=None, obj=None):
+        self.key = key
+        self.kind = kind
+        self.start = start
+        self.end = end
+        # Number of children, when known
+        self.size = size
+        # Display value of scalars; strings are cut at PREVIEW_SIZE
+        self.value = value
+        self.obj = obj
+        self.children = []
+        self.resume = None
+        self.complete = kind not in ('object', 'array')
+
+    @property
+    def is_container(self):
+        return self.kind in ('object', 'array')
+
+    def summary(self):
+        """Short text for the value column."""
+        if self.kind == 'object':
+            return '{…}' if self.size is None else f'{{{self.size} keys}}'
+        if self.kind == 'array':
+            return '[…]' if self.size is None else f'[{self.size} items]'
+        return json.dumps(self.value)
+
+
+def make_node(key, value, start=None, end=None, detached=False):
+    kind = _kind(value)
+    if kind in ('object', 'array'):
+        return JsonNode(key, kind, start, end, len(value), obj=value if detached else None)
+    if kind == 'string' and len(value) > PREVIEW_SIZE:
+        # Without offsets to go back to, the full string has to be kept
+        return JsonNode(key, kind, start, end, value=value[:PREVIEW_SIZE] + '…',
+                        obj=value if detached else None)
+    return JsonNode(key, kind, start, end, value=value)
+
+
+class JsonDocument:
+    """A JSON text indexed on demand.
+
+    Nothing is parsed up front. Listing a container's children runs the
+    C scanner over each child just to find where it ends, keeping only
+    its offsets and a summary. Expanding a node therefore costs time
+    proportional to the children shown, and memory stays at the source
+    text plus the nodes actually visited.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        # start -> (end, size) of large containers already scanned
+        self.spans = {}
+        start = _skip(text, 0)
+        if start >= len(text):
+            raise ValueError("Empty document")
+        first = text[start]
+        if first == '{':
+            self.root = JsonNode('$', 'object', start)
+        elif first == '[':
+            self.root = JsonNode('$', 'array', start)
+        else:
+            value, end = _decoder.raw_decode(text, start)
+            if _skip(text, end) < len(text):
+                raise ValueError("Extra data after the document")
+            self.root = make_node('$', value, start, end)
+
+    @classmethod
+    def from_file(cls, path, encoding=None):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return cls(data.decode(encoding or 'utf-8', 'replace'))
+
+    def iter_children(self, node, pos=None):
+        """Yields (child, next_position) for the children of a container node."""
+        if node.obj is not None:
+            start = pos or 0
+            count = len(node.obj)
+            if node.kind == 'object':
+                items = itertools.islice(node.obj.items(), start, None)
+            else:
+                items = enumerate(itertools.islice(node.obj, start, None), start)
+            for index, (key, value) in enumerate(items, start):
+                yield make_node(key, value, detached=True), index + 1 if index + 1 < count else None
+            return
+        text = self.text
+        is_object = node.kind == 'object'
+        close = '}' if is_object else ']'
+        index = len(node.children) if pos is not None else 0
+        pos = _skip(text, node.start + 1 if pos is None else pos)
+        if text[pos:pos + 1] == close:
+            node.end = pos + 1
+            return
+        while True:
+            if is_object:
+                if text[pos:pos + 1] != '"':
+                    raise ValueError(f"Expected a key at offset {pos}")
+                key, pos = _scanstring(text, pos + 1)
+                pos = _skip(text, pos)
+                if text[pos:pos + 1] != ':':
+                    raise ValueError(f"Expected ':' at offset {pos}")
+                pos = _skip(text, pos + 1)
+            else:
+                key = index
+            try:
+                child = self._scan(key, pos)
+            except json.JSONDecodeError as e:
+                raise ValueError(str(e))
+            end = child.end
+            index += 1
+            pos = _skip(text, end)
+            separator = text[pos:pos + 1]
+            if separator == ',':
+                yield child, _skip(text, pos + 1)
+                pos = _skip(text, pos + 1)
+            elif separator == close:
+                node.end = pos + 1
+                yield child, None
+                return
+            else:
+                raise ValueError(f"Expected ',' or '{close}' at offset {pos}")
+
+    def _scan(self, key, pos):
+        """The node for the value at `pos`, without keeping containers decoded."""
+        first = self.text[pos]
+        if first not in '{[':
+            value, end = _decoder.raw_decode(self.text, pos)
+            return make_node(key, value, pos, end)
+        span = self.spans.get(pos)
+        if span is None:
+            size, end = _skipper.raw_decode(self.text, pos)
+            if first == '[':
+                size = len(size)
+            span = (end, size)
+            if end - pos >= SPAN_CACHE_MIN:
+                self.spans[pos] = span
+        end, size = span
+        return JsonNode(key, 'object' if first == '{' else 'array', pos, end, size)
+
+    def load_children(self, node, limit=PAGE_SIZE):
+        """Reads the next page of a node's children; meant to run on a worker.
+
+        Returns the new children, which are also appended to node.children.
+        """
+        if node.complete:
+            return []
+        page = []
+        resume = None
+        for child, resume in self.iter_children(node, node.resume):
+            page.append(child)
+            if len(page) >= limit:
+                break
+        node.children.extend(page)
+        node.resume = resume
+        node.complete = resume is None
+        if node.complete:
+            node.size = len(node.children)
+        return page
+
+    def value(self, node):
+        """The fully decoded value of a node."""
+        if node.obj is not None:
+            return node.obj
+        if node.start is None:
+            return node.value
+        if node.end is None:
+            return _decoder.raw_decode(self.text, node.start)[0]
+        return json.loads(self.text[node.start:node.end])
+
+    def child(self, node, key):
+        """The child of `node` at `key` (a name or index), or None."""
+        if node.kind == 'object' and not isinstance(key, str):
+            return None
+        if node.kind == 'array' and not isinstance(key, int):
+            return None
+        if node.kind == 'array' and key < 0:
+            children = list(self.iter_children(node))
+            return children[key][0] if -key <= len(children) else None
+        for child, _ in self.iter_children(node):
+            if child.key == key:
+                return child
+        return None
+
+
+# Query language: a subset of JSONPath with jq-style shorthands
+#   $ or .            the document
+#   .name ["name"]    member of an object
+#   [2] [-1] [1:5]    array index or slice
+#   [*] []  .*        every child
+#   ..name            `name` anywhere below
+#   [?(@.a.b > 3)]    children whose sub-path compares true (== != < <= > >=)
+TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<recursive>\.\.)(?P<rname>[A-Za-z_$][\w$-]*|\*)
+    | \.(?P<name>[A-Za-z_$][\w$-]*)
+    | \.(?P<dotstar>\*)
+    | \[\s*(?P<star>\*?)\s*\]
+    | \[\s*(?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')\s*\]
+    | \[\s*(?P<slice>-?\d*\s*:\s*-?\d*)\s*\]
+    | \[\s*(?P<index>-?\d+)\s*\]
+    | \[\s*\?\(?\s*@(?P<fpath>(?:\.[A-Za-z_$][\w$-]*|\[\d+\])*)\s*
+        (?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<literal>"(?:[^"\\]|\\.)*"|[^\s)\]]+))?\s*\)?\s*\]
+    )""", re.VERBOSE)
+
+OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def compile_query(expression):
+    """Parses a query into a list of steps; raises ValueError on bad syntax."""
+    expression = expression.strip()
+    if expression.startswith('$'):
+        expression = expression[1:]
+    elif expression == '.':
+        expression = ''
+    elif expression and expression[0] not in '.[':
+        expression = '.' + expression
+    steps = []
+    pos = 0
+    while pos < len(expression):
+        if expression[pos:].strip() == '':
+            break
+        match = TOKEN.match(expression, pos)
+        if match is None:
+            raise ValueError(f"Invalid query at '{expression[pos:]}'")
+        pos = match.end()
+        if match.group('recursive'):
+            name = match.group('rname')
+            steps.append(('recursive', None if name == '*' else name))
+        elif match.group('name') is not None:
+            steps.append(('key', match.group('name')))
+        elif match.group('dotstar') is not None or match.group('star') is not None:
+            steps.append(('all',))
+        elif match.group('quoted') is not None:
+            quoted = match.group('quoted')
+            if quoted[0] == "'":
+                quoted = '"' + quoted[1:-1].replace('"', '\\"') + '"'
+            steps.append(('key', json.loads(quoted)))
+        elif match.group('slice') is not None:
+            start, _, stop = match.group('slice').partition(':')
+            steps.append(('slice', int(start) if start.strip() else None,
+                          int(stop) if stop.strip() else None))
+        elif match.group('index') is not None:
+            steps.append(('index', int(match.group('index'))))
+        else:
+            path = re.findall(r'\.([^.\[]+)|\[(\d+)\]', match.group('fpath'))
+            path = [name if name else int(index) for name, index in path]
+            literal = match.group('literal')
+            if literal is not None:
+                try:
+                    literal = json.loads(literal)
+                except ValueError:
+                    pass  # Bare words compare as strings
+            steps.append(('filter', path, match.group('op'), literal))
+    return steps
+
+
+def _lookup(value, path):
+    for key in path:
+        if isinstance(value, dict) and isinstance(key, str) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+            value = value[key]
+        else:
+            return None, False
+    return value, True
+
+
+def _matches(value, path, op, literal):
+    found, ok = _lookup(value, path)
+    if not ok:
+        return False
+    if op is None:
+        return bool(found)
+    try:
+        return OPERATORS[op](found, literal)
+    except TypeError:
+        return False
+
+
+IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+
+def _label(parent, key):
+    if isinstance(key, int):
+        return f'{parent}[{key}]'
+    if IDENTIFIER.match(key):
+        return f'{parent}.{key}'
+    return f'{parent}[{json.dumps(key)}]'
+
+
+def _containers(value, label):
+    """Yields (value, label) for every object and list in a decoded value, in document order."""
+    stack = [(value, label)]
+    while stack:
+        value, label = stack.pop()
+        yield value, label
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        nested = [(child, _label(label, key)) for key, child in items
+                  if isinstance(child, (dict, list))]
+        stack.extend(reversed(nested))
+
+
+def _decodes(step):
+    """True for steps that visit every child, which is cheaper on decoded values."""
+    kind = step[0]
+    if kind in ('all', 'filter', 'recursive'):
+        return True
+    if kind == 'index':
+        return step[1] < 0
+    if kind == 'slice':
+        return any(bound is not None and bound < 0 for bound in step[1:])
+    return False
+
+
+def _apply_lazy(document, step, node, label):
+    """Applies a key, index or slice step to an undecoded node by scanning."""
+    kind = step[0]
+    if kind == 'key' and node.kind == 'object':
+        child = document.child(node, step[1])
+        if child is not None:
+            yield child, _label(label, step[1])
+    elif kind == 'index' and node.kind == 'array':
+        child = document.child(node, step[1])
+        if child is not None:
+            yield child, _label(label, child.key)
+    elif kind == 'slice' and node.kind == 'array':
+        start, stop = step[1], step[2]
+        for child, _ in document.iter_children(node):
+            if stop is not None and child.key >= stop:
+                break
+            if start is None or child.key >= start:
+                yield child, _label(label, child.key)
+
+
+def _apply_value(step, value, label):
+    """Applies a step to a decoded value, yielding (value, label) pairs."""
+    kind = step[0]
+    if kind == 'key':
+        if isinstance(value, dict) and step[1] in value:
+            yield value[step[1]], _label(label, step[1])
+    elif kind == 'index':
+        if isinstance(value, list) and -len(value) <= step[1] < len(value):
+            index = step[1] % len(value)
+            yield value[index], _label(label, index)
+    elif kind == 'slice':
+        if isinstance(value, list):
+            for index in range(*slice(step[1], step[2]).indices(len(value))):
+                yield value[index], _label(label, index)
+    elif kind == 'all':
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, child in items:
+            yield child, _label(label, key)
+    elif kind == 'recursive':
+        name = step[1]
+        for container, found_label in _containers(value, label):
+            if name is None:
+                items = container.items() if isinstance(container, dict) else enumerate(container)
+                for key, child in items:
+                    yield child, _label(found_label, key)
+            elif isinstance(container, dict) and name in container:
+                yield container[name], _label(found_label, name)
+    elif kind == 'filter':
+        _, path, op, literal = step
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, child in items:
+            if _matches(child, path, op, literal):
+                yield child, _label(label, key)
+
+
+def _apply(document, step, node, value, label):
+    """Yields (node, value, label); node is None once the value is decoded."""
+    if node is not None:
+        if not node.is_container:
+            return
+        small = node.end is not None and node.end - node.start < SPAN_CACHE_MIN
+        if not (small or _decodes(step)):
+            for child, child_label in _apply_lazy(document, step, node, label):
+                yield child, None, child_label
+            return
+        value = document.value(node)
+    if not isinstance(value, (dict, list)):
+        return
+    for child, child_label in _apply_value(step, value, label):
+        yield None, child, child_label
+
+
+def run_query(document, expression, limit=10000, should_stop=None):
+    """Evaluates a query; meant to run on a worker.
+
+    Returns (nodes, truncated). Each node's key is replaced by the path
+    it was found at, so results can be shown as a flat list that is
+    still lazily expandable. Steps that only pick one member scan the
+    text; steps that visit every child decode the container once.
+    """
+    steps = compile_query(expression)
+    current = [(document.root, None, '$')]
+    for number, step in enumerate(steps):
+        last = number == len(steps) - 1
+        following = []
+        for node, value, label in current:
+            for found in _apply(document, step, node, value, label):
+                following.append(found)
+                if last and len(following) > limit:
+                    break
+            if should_stop is not None and should_stop():
+                return [], False
+            if last and len(following) > limit:
+                break
+        current = following
+    truncated = len(current) > limit
+    results = []
+    for node, value, label in current[:limit]:
+        if node is None:
+            node = make_node(label, value, detached=True)
+        else:
+            node.key = label
+        results.append(node)
+    return results, truncated
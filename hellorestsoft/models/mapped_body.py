@@ -0,0 +1,157 @@
+"""Memory-mapped access to large spooled response bodies"""
+import os
+import re
+import mmap
+import codecs
+from array import array
+from bisect import bisect_right
+
+# Granularity of the line index: one checkpoint per block of this many bytes
+INDEX_BLOCK = 64 * 1024
+# Lines are cut at this many bytes when displayed
+MAX_LINE_BYTES = 16 * 1024
+
+
+class MappedBody:
+    """A body file mapped into memory, addressed by line number.
+
+    The line index is sparse: build_index() records, for every
+    INDEX_BLOCK bytes, how many lines start before it. Looking up a line
+    then only scans one block, so the index of a 500 MB body is a few
+    hundred KB and the file itself is never decoded as a whole.
+    """
+
+    def __init__(self, path, encoding=None):
+        self.path = path
+        self.encoding = encoding or 'utf-8'
+        try:
+            codecs.lookup(self.encoding)
+        except LookupError:
+            self.encoding = 'utf-8'
+        self.size = os.path.getsize(path)
+        self.file = open(path, 'rb')
+        self.mm = None
+        if self.size:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        # lines_before[i] = number of newlines before byte i * INDEX_BLOCK
+        self.lines_before = array('q')
+        self.line_count = 0
+        self.indexed = False
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        self.file.close()
+
+    def build_index(self, should_stop=None, progress=None):
+        """Counts newlines block by block; meant to run on a worker thread.
+
+        Returns False if `should_stop()` interrupted it.
+        """
+        lines_before = array('q')
+        newlines = 0
+        mm = self.mm
+        for start in range(0, self.size, INDEX_BLOCK):
+            if should_stop is not None and should_stop():
+                return False
+            lines_before.append(newlines)
+            newlines += mm[start:start + INDEX_BLOCK].count(b'\n')
+            if progress is not None and len(lines_before) % 1024 == 0:
+                progress(start, self.size)
+        line_count = newlines
+        if self.size and mm[self.size - 1:self.size] != b'\n':
+            line_count += 1  # Last line without a trailing newline
+        self.lines_before = lines_before
+        self.line_count = max(1, line_count)
+        self.indexed = True
+        return True
+
+    def line_offset(self, line):
+        """Byte offset where `line` (0-based) starts."""
+        if line <= 0 or self.mm is None:
+            return 0
+        block = bisect_right(self.lines_before, line - 1) - 1
+        offset = block * INDEX_BLOCK
+        remaining = line - self.lines_before[block]
+        mm = self.mm
+        while remaining > 0:
+            newline = mm.find(b'\n', offset)
+            if newline < 0:
+                return self.size
+            offset = newline + 1
+            remaining -= 1
+        return offset
+
+    def line_at(self, offset):
+        """Line number containing byte `offset`."""
+        if self.mm is None or offset <= 0:
+            return 0
+        block = min(offset // INDEX_BLOCK, len(self.lines_before) - 1)
+        start = block * INDEX_BLOCK
+        return self.lines_before[block] + self.mm[start:offset].count(b'\n')
+
+    def lines(self, first, count):
+        """Decoded text of up to `count` lines from `first`, each cut at MAX_LINE_BYTES."""
+        if self.mm is None:
+            return []
+        mm = self.mm
+        offset = self.line_offset(first)
+        result = []
+        while len(result) < count and offset < self.size:
+            newline = mm.find(b'\n', offset, offset + MAX_LINE_BYTES + 1)
+            if newline < 0:
+                end = min(offset + MAX_LINE_BYTES, self.size)
+                text = mm[offset:end].decode(self.encoding, 'replace').rstrip('\r')
+                if end < self.size:
+                    text += ' …'
+                result.append(text)
+                # Skip the rest of an overlong line
+                newline = mm.find(b'\n', end)
+                offset = self.size if newline < 0 else newline + 1
+            else:
+                result.append(mm[offset:newline].decode(self.encoding, 'replace').rstrip('\r'))
+                offset = newline + 1
+        return result
+
+    def column_of(self, offset):
+        """Character column of byte `offset` within its line."""
+        line_start = self.line_offset(self.line_at(offset))
+        return len(self.mm[line_start:offset].decode(self.encoding, 'replace'))
+
+    def find(self, text, start=0, backwards=False, case_sensitive=False):
+        """Byte range (start, end) of the next match of `text`, or None.
+
+        Searches the mapped bytes directly, wrapping around at the end.
+        """
+        if self.mm is None or not text:
+            return None
+        needle = text.encode(self.encoding, 'replace')
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = re.compile(re.escape(needle), flags)
+        mm = self.mm
+        if backwards:
+            match = self._last_before(pattern, start, 0, len(needle))
+            if match is None:
+                match = self._last_before(pattern, self.size, start, len(needle))
+        else:
+            match = pattern.search(mm, start)
+            if match is None and start > 0:
+                match = pattern.search(mm, 0, start + len(needle))
+        if match is None:
+            return None
+        return match.start(), match.end()
+
+    def _last_before(self, pattern, end, stop, width):
+        """Last match starting in [stop, end), scanning back a window at a time."""
+        window = 16 * INDEX_BLOCK
+        while end > stop:
+            begin = max(stop, end - window)
+            match = None
+            for candidate in pattern.finditer(self.mm, begin, min(self.size, end + width - 1)):
+                if candidate.start() < end:
+                    match = candidate
+            if match is not None:
+                return match
+            end = begin
+        return None
@@ -0,0 +1,46 @@
+import json
+
+# Bodies larger than this are shown as-is instead of being re-indented
+MAX_FORMAT_SIZE = 5 * 1024 * 1024
+# Amount of text handed to the editor per event-loop iteration
+CHUNK_SIZE = 64 * 1024
+
+
+def format_body(text, max_format_size=MAX_FORMAT_SIZE, truncated=False):
+    """Pretty-prints JSON bodies, leaving everything else untouched.
+
+    Truncated previews and bodies above `max_format_size` are returned
+    unchanged: they either cannot parse or would cost more to format than
+    they are worth.
+    """
+    if truncated or not text or len(text) > max_format_size:
+        return text
+    stripped = text.lstrip()
+    if not stripped or stripped[0] not in '[{':
+        return text
+    try:
+        return json.dumps(json.loads(text), indent=2)
+    except ValueError:
+        return text
+
+
+def chunk_text(text, chunk_size=CHUNK_SIZE):
+    """Splits text into roughly `chunk_size` pieces, breaking at newlines."""
+    chunks = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start + chunk_size
+        if end < length:
+            newline = text.rfind('\n', start, end)
+            if newline > start:
+                end = newline + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def render_body(text, max_format_size=MAX_FORMAT_SIZE, chunk_size=CHUNK_SIZE,
+                truncated=False):
+    """Formats and chunks a body; meant to run on a worker thread."""
+    return chunk_text(format_body(text, max_format_size, truncated), chunk_size)
@@ -0,0 +1,189 @@
+import os
+import zlib
+import codecs
+import tempfile
+from collections import OrderedDict
+
+
+def format_size(num):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num < 1024 or unit == 'GB':
+            if unit == 'B':
+                return f"{num} {unit}"
+            return f"{num:.1f} {unit}"
+        num /= 1024.0
+
+
+def _decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def decode_head(data, encoding):
+    """Decodes a byte prefix without emitting a broken trailing character.
+
+    Returns the text and the number of bytes it consumed, so paging can
+    resume exactly where the preview stopped.
+    """
+    decoder = _decoder(encoding)
+    text = decoder.decode(bytes(data), final=False)
+    pending = decoder.getstate()[0]
+    return text, len(data) - len(pending)
+
+
+class SpoolBuffer:
+    """Accumulates a response body, spilling to disk past a size threshold.
+
+    Small bodies never touch the filesystem. Large ones keep only the first
+    `preview_size` bytes in memory; the rest is streamed into a spool file.
+    """
+
+    def __init__(self, threshold, preview_size, spool_dir=None):
+        self.threshold = threshold
+        self.preview_size = preview_size
+        self.spool_dir = spool_dir
+        self.buffer = bytearray()
+        self.head = None
+        self.file = None
+        self.path = None
+        self.size = 0
+
+    def write(self, chunk):
+        self.size += len(chunk)
+        if self.file is None:
+            self.buffer.extend(chunk)
+            if len(self.buffer) > self.threshold:
+                self._spill()
+        else:
+            self.file.write(chunk)
+
+    def _spill(self):
+        if self.spool_dir and not os.path.exists(self.spool_dir):
+            os.makedirs(self.spool_dir)
+        fd, self.path = tempfile.mkstemp(prefix='body-', suffix='.bin', dir=self.spool_dir)
+        self.file = os.fdopen(fd, 'wb')
+        self.file.write(self.buffer)
+        self.head = bytes(self.buffer[:self.preview_size])
+        self.buffer = bytearray()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    @property
+    def spooled(self):
+        return self.path is not None
+
+    def preview(self):
+        """Returns the in-memory bytes: the full body, or its head if spooled."""
+        if self.spooled:
+            return self.head
+        return bytes(self.buffer)
+
+
+class BodyPager:
+    """Reads a spooled body back in text pages, on demand."""
+
+    def __init__(self, path, encoding=None, offset=0):
+        self.path = path
+        self.offset = offset
+        self.size = os.path.getsize(path)
+        self.decoder = _decoder(encoding)
+
+    @property
+    def at_end(self):
+        return self.offset >= self.size
+
+    def next_page(self, page_size):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(page_size)
+        self.offset += len(data)
+        return self.decoder.decode(data, final=self.at_end)
+
+
+def response_cost(response):
+    """Rough in-memory size of a response dict, dominated by its text."""
+    text = response.get('text') or ''
+    return len(text) * 2 + sum(len(k) + len(v) for k, v in (response.get('headers') or {}).items())
+
+
+class ResponseCache:
+    """Holds the latest response of every tab within a global memory budget.
+
+    Bodies are kept in LRU order; once their total cost passes `budget`
+    bytes, the least recently used bodies are spilled to zlib-compressed
+    files and read back on the next get(). Metadata (status, headers,
+    timings) always stays in memory.
+    """
+
+    def __init__(self, budget, spool_dir=None):
+        self.budget = budget
+        self.spool_dir = spool_dir
+        self.entries = OrderedDict()
+        self.total = 0
+
+    def put(self, key, response):
+        self.discard(key)
+        cost = response_cost(response)
+        self.entries[key] = {'response': response, 'cost': cost, 'spill': None}
+        self.total += cost
+        self._enforce(keep=key)
+
+    def get(self, key):
+        """The full response for `key`, or None; reloads spilled bodies."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        if entry['spill'] is not None:
+            with open(entry['spill'], 'rb') as f:
+                text = zlib.decompress(f.read()).decode('utf-8', 'surrogatepass')
+            os.remove(entry['spill'])
+            entry['spill'] = None
+            entry['response'] = dict(entry['response'], text=text)
+            entry['cost'] = response_cost(entry['response'])
+            self.total += entry['cost']
+            self._enforce(keep=key)
+        return entry['response']
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def spill(self, key):
+        """Moves the body of `key` out of memory, e.g. when its tab hibernates."""
+        entry = self.entries.get(key)
+        if entry is None or entry['spill'] is not None:
+            return
+        response = entry['response']
+        fd, path = tempfile.mkstemp(prefix='hellorestsoft-tab-', suffix='.z', dir=self.spool_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(zlib.compress((response.get('text') or '').encode('utf-8', 'surrogatepass'), 1))
+        entry['spill'] = path
+        entry['response'] = dict(response, text=None)
+        self.total -= entry['cost']
+        entry['cost'] = 0
+
+    def _enforce(self, keep=None):
+        for key in list(self.entries):
+            if self.total <= self.budget:
+                break
+            if key != keep:
+                self.spill(key)
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self.total -= entry['cost']
+        if entry['spill'] is not None:
+            try:
+                os.remove(entry['spill'])
+            except OSError:
+                pass
+
+    def clear(self):
+        for key in list(self.entries):
+            self.discard(key)
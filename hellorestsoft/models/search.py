@@ -0,0 +1,101 @@
+import os
+import re
+import heapq
+import bisect
+
+
+def fuzzy_pattern(query):
+    """Compiles a subsequence pattern: 'gtord' matches 'get-orders'."""
+    chars = [c for c in query.lower() if not c.isspace()]
+    if not chars:
+        return None
+    return re.compile('.*?'.join(re.escape(c) for c in chars))
+
+
+def fuzzy_score(start, span, length):
+    """Lower is better: tight, early matches of the query win."""
+    score = (span - length) * 2 + start
+    if start == 0:
+        score -= 5
+    return score
+
+
+class RequestSearch:
+    """Quick-open search over a MetadataIndex.
+
+    Names are matched fuzzily against an in-memory list that is rebuilt
+    only when the index generation changes; method, URL, headers, body and
+    stored response text go through the index's full-text search.
+
+    The lowercased names are kept joined into one newline-separated string,
+    so a fuzzy query is a single regex scan in C rather than a Python loop
+    over every request.
+    """
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.generation = None
+        self.names = []
+        self.blob = ''
+        self.offsets = []
+
+    def _refresh(self):
+        generation = self.metadata.generation
+        if generation != self.generation:
+            self.names = self.metadata.requests()
+            lowered = [name.lower().replace('\n', ' ') for name, _, _, _ in self.names]
+            self.offsets = []
+            offset = 0
+            for name in lowered:
+                self.offsets.append(offset)
+                offset += len(name) + 1
+            self.blob = '\n'.join(lowered)
+            self.generation = generation
+
+    def _result(self, path, name, method, url, match, snippet=''):
+        return {
+            'path': path,
+            'name': name,
+            'method': method,
+            'url': url,
+            'relpath': os.path.relpath(path, self.metadata.root_path),
+            'match': match,
+            'snippet': snippet,
+        }
+
+    def fuzzy(self, query, limit=50):
+        pattern = fuzzy_pattern(query)
+        if pattern is None:
+            return []
+        self._refresh()
+        length = len([c for c in query if not c.isspace()])
+        offsets = self.offsets
+        scored = []
+        last_line = -1
+        # '.' never crosses the newline separators, so each match lies
+        # within one name; the first match per name is its leftmost one.
+        for match in pattern.finditer(self.blob):
+            line = bisect.bisect_right(offsets, match.start()) - 1
+            if line == last_line:
+                continue
+            last_line = line
+            start = match.start() - offsets[line]
+            span = match.end() - match.start()
+            scored.append((fuzzy_score(start, span, length), line))
+        best = heapq.nsmallest(limit, scored)
+        results = []
+        for _score, line in best:
+            name, path, method, url = self.names[line]
+            results.append(self._result(path, name, method, url, 'name'))
+        return results
+
+    def search(self, query, limit=50):
+        """Up to `limit` fuzzy name matches, followed by up to `limit`
+        full-text matches on contents that were not already listed."""
+        results = self.fuzzy(query, limit)
+        seen = {result['path'] for result in results}
+        for path, name, method, url, snippet in self.metadata.search_content(query, limit):
+            if path not in seen:
+                seen.add(path)
+                results.append(self._result(path, name, method, url, 'content', snippet))
+        return results
@@ -0,0 +1,180 @@
+"""{{variable}} templating for request URLs, headers and bodies"""
+import re
+import json
+import time
+import uuid
+import random
+import datetime
+import functools
+
+from hellorestsoft.engine import parse_headers
+
+PLACEHOLDER = re.compile(r'\{\{\s*([^{}]+?)\s*\}\}')
+
+# Values computed fresh every time a template renders
+DYNAMIC_VALUES = {
+    '$timestamp': lambda: str(int(time.time())),
+    '$timestampMs': lambda: str(int(time.time() * 1000)),
+    '$isoTimestamp': lambda: datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    '$uuid': lambda: str(uuid.uuid4()),
+    '$randomInt': lambda: str(random.randint(0, 1000)),
+}
+
+
+class Template:
+    """A string split once into literal text and variable names.
+
+    Rendering only joins the pieces, so a template compiled up front can
+    be rendered on every iteration of a run without re-parsing. Unknown
+    variables are left in place as `{{name}}`.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.parts = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            if match.start() > position:
+                self.parts.append((False, source[position:match.start()]))
+            self.parts.append((True, match.group(1)))
+            position = match.end()
+        if position < len(source):
+            self.parts.append((False, source[position:]))
+        self.static = not any(is_var for is_var, _ in self.parts)
+
+    def names(self):
+        return {value for is_var, value in self.parts if is_var}
+
+    def render(self, variables):
+        if self.static:
+            return self.source
+        out = []
+        for is_var, value in self.parts:
+            if not is_var:
+                out.append(value)
+            elif value in variables:
+                out.append(str(variables[value]))
+            elif value in DYNAMIC_VALUES:
+                out.append(DYNAMIC_VALUES[value]())
+            else:
+                out.append('{{' + value + '}}')
+        return ''.join(out)
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(source):
+    return Template(source or '')
+
+
+def parse_captures(text):
+    """Parses 'name: expression' lines from a request's Captures tab.
+
+    Expressions are `status`, `header.<Name>`, `body` or `body.<path>`,
+    where the path walks the JSON body by keys and list indexes, e.g.
+    `body.data.items.0.id`.
+    """
+    if isinstance(text, dict):
+        return dict(text)
+    return parse_headers(text)
+
+
+def format_captures(captures):
+    """Captures as Captures-tab text; request files may hold them as a dict."""
+    if isinstance(captures, dict):
+        return "\n".join(f"{name}: {expression}" for name, expression in captures.items())
+    return captures or ''
+
+
+def format_headers(headers):
+    """Headers as Headers-tab text; request files may hold a dict or a list of pairs."""
+    if isinstance(headers, dict):
+        headers = list(headers.items())
+    if isinstance(headers, list):
+        return "\n".join(
+            f"{item[0]}: {item[1]}" if isinstance(item, (list, tuple)) and len(item) == 2
+            else str(item) for item in headers)
+    return '' if headers is None else str(headers)
+
+
+def format_body(body):
+    """A request body as text; JSON objects and lists in the file are encoded."""
+    if body is None or isinstance(body, str):
+        return body or ''
+    return json.dumps(body, indent=2)
+
+
+def _walk(value, path):
+    for key in path:
+        if isinstance(value, list):
+            try:
+                value = value[int(key)]
+            except (ValueError, IndexError):
+                return None
+        elif isinstance(value, dict):
+            if key not in value:
+                return None
+            value = value[key]
+        else:
+            return None
+    return value
+
+
+def extract_values(captures, response):
+    """Evaluates capture expressions against a response dict.
+
+    Returns {name: value} for the expressions that matched; JSON objects
+    and lists are captured as JSON text.
+    """
+    values = {}
+    body = None
+    headers = {k.lower(): v for k, v in (response.get('headers') or {}).items()}
+    for name, expression in captures.items():
+        kind, _, path = expression.strip().partition('.')
+        value = None
+        if kind == 'status':
+            value = response.get('status_code')
+        elif kind == 'header':
+            value = headers.get(path.lower())
+        elif kind == 'body':
+            if not path:
+                value = response.get('text')
+            else:
+                if body is None:
+                    try:
+                        body = json.loads(response.get('text') or '')
+                    except ValueError:
+                        body = False
+                if body is not False:
+                    value = _walk(body, path.split('.'))
+        if value is None:
+            continue
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        values[name] = str(value)
+    return values
+
+
+class RequestTemplate:
+    """The URL, headers and body of a saved request, compiled once."""
+
+    def __init__(self, data):
+        self.method = data.get('method') or 'GET'
+        self.url = compile_template(str(data.get('url') or ''))
+        self.headers = compile_template(format_headers(data.get('headers')))
+        self.body = compile_template(format_body(data.get('body')))
+        self.captures = parse_captures(data.get('captures'))
+
+    def names(self):
+        """Variables referenced by the URL, headers and body."""
+        return self.url.names() | self.headers.names() | self.body.names()
+
+    def unresolved(self, variables):
+        """Referenced names that neither `variables` nor the dynamic values provide."""
+        return sorted(name for name in self.names()
+                      if name not in variables and name not in DYNAMIC_VALUES)
+
+    def render(self, variables):
+        """Returns (url, headers dict, body) with `variables` substituted."""
+        return (self.url.render(variables),
+                parse_headers(self.headers.render(variables)),
+                self.body.render(variables))
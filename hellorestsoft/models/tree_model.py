@@ -0,0 +1,200 @@
+import bisect
+
+from qtpy import QtCore
+
+from hellorestsoft.models.collection import entry_sort_key
+
+
+class TreeNode:
+    def __init__(self, entry, parent=None):
+        self.entry = entry
+        self.parent = parent
+        self.children = None  # None until the directory is fetched
+        self.row_hint = 0
+
+    @property
+    def is_dir(self):
+        return self.entry['type'] == 'dir'
+
+    def row(self):
+        if self.parent is None:
+            return 0
+        siblings = self.parent.children
+        # Rows only shift on insert/remove, so the cached row is usually right
+        if self.row_hint < len(siblings) and siblings[self.row_hint] is self:
+            return self.row_hint
+        self.row_hint = siblings.index(self)
+        return self.row_hint
+
+
+class CollectionTreeModel(QtCore.QAbstractItemModel):
+    """Item model over a CollectionManager, populated one directory at a time.
+
+    Children are fetched when a directory is expanded (canFetchMore /
+    fetchMore), and a change notification for one directory only inserts or
+    removes the rows that differ instead of resetting the whole tree.
+    """
+
+    def __init__(self, manager, dir_icon=None, file_icon=None, parent=None):
+        super().__init__(parent)
+        self.dir_icon = dir_icon
+        self.file_icon = file_icon
+        self.manager = None
+        self.root = None
+        self.nodes = {}
+        self.set_manager(manager)
+
+    def set_manager(self, manager):
+        self.beginResetModel()
+        if self.manager is not None:
+            self.manager.remove_listener(self.refresh_dir)
+        self.manager = manager
+        self.root = TreeNode({'type': 'dir', 'name': '', 'path': manager.root_path})
+        self.nodes = {manager.root_path: self.root}
+        self._load_children(self.root)
+        manager.add_listener(self.refresh_dir)
+        self.endResetModel()
+
+    def _load_children(self, node):
+        entries = self.manager.list_dir(node.entry['path'])
+        node.children = [self._make_node(entry, node, row) for row, entry in enumerate(entries)]
+
+    def _make_node(self, entry, parent, row=0):
+        node = TreeNode(entry, parent)
+        node.row_hint = row
+        self.nodes[entry['path']] = node
+        return node
+
+    def _forget(self, node):
+        self.nodes.pop(node.entry['path'], None)
+        for child in node.children or []:
+            self._forget(child)
+
+    def node_from_index(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index_for_path(self, path):
+        node = self.nodes.get(path)
+        if node is None or node is self.root:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row(), 0, node)
+
+    def entry(self, index):
+        if not index.isValid():
+            return None
+        return index.internalPointer().entry
+
+    # QAbstractItemModel interface
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        node = self.node_from_index(parent)
+        if node.children is None or not 0 <= row < len(node.children) or column != 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row(), 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.node_from_index(parent)
+        return len(node.children) if node.children is not None else 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        node = self.node_from_index(parent)
+        if not node.is_dir:
+            return False
+        if node.children is None:
+            return True  # Unknown until fetched; show the expander
+        return bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self.node_from_index(parent)
+        return node.is_dir and node.children is None
+
+    def fetchMore(self, parent):
+        node = self.node_from_index(parent)
+        if not node.is_dir or node.children is not None:
+            return
+        entries = self.manager.list_dir(node.entry['path'])
+        if not entries:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(entries) - 1)
+        node.children = [self._make_node(entry, node, row) for row, entry in enumerate(entries)]
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == QtCore.Qt.DisplayRole:
+            method = node.entry.get('method')
+            if method and not node.is_dir:
+                return f"{method}  {node.entry['name']}"
+            return node.entry['name']
+        if role == QtCore.Qt.ToolTipRole:
+            return node.entry.get('url') or None
+        if role == QtCore.Qt.DecorationRole:
+            return self.dir_icon if node.is_dir else self.file_icon
+        if role == QtCore.Qt.UserRole:
+            return node.entry
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    # Incremental updates
+
+    def refresh_dir(self, path):
+        """Patches a single directory node to match the manager's listing."""
+        node = self.nodes.get(path)
+        if node is None or node.children is None:
+            return
+        if node is self.root:
+            parent_index = QtCore.QModelIndex()
+        else:
+            parent_index = self.createIndex(node.row(), 0, node)
+        entries = self.manager.list_dir(path)
+        wanted = {entry['path']: entry for entry in entries}
+
+        # Remove rows that disappeared, back to front to keep rows stable
+        for row in range(len(node.children) - 1, -1, -1):
+            child = node.children[row]
+            entry = wanted.get(child.entry['path'])
+            if entry is None or entry['type'] != child.entry['type']:
+                self.beginRemoveRows(parent_index, row, row)
+                del node.children[row]
+                self._forget(child)
+                self.endRemoveRows()
+            elif entry != child.entry:
+                # Same item, new metadata (e.g. the method was edited)
+                child.entry = entry
+                index = self.createIndex(row, 0, child)
+                self.dataChanged.emit(index, index)
+
+        # Insert new rows at their sorted position
+        present = {child.entry['path'] for child in node.children}
+        keys = [entry_sort_key(child.entry) for child in node.children]
+        for entry in entries:
+            if entry['path'] in present:
+                continue
+            key = entry_sort_key(entry)
+            row = bisect.bisect_left(keys, key)
+            keys.insert(row, key)
+            self.beginInsertRows(parent_index, row, row)
+            node.children.insert(row, self._make_node(entry, node, row))
+            self.endInsertRows()
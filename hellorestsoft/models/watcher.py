@@ -0,0 +1,113 @@
+import os
+
+from qtpy import QtCore
+
+
+class CollectionWatcher(QtCore.QObject):
+    """Watches loaded collection directories and batches change events.
+
+    QFileSystemWatcher is used where the platform allows it; directories it
+    refuses (network shares, exhausted inotify watches) fall back to polling
+    their mtime. Events are debounced so a burst of changes, such as a large
+    `git checkout`, ends up as a single `apply_changes` call covering each
+    affected directory once.
+    """
+
+    def __init__(self, manager, debounce_ms=250, max_delay_ms=2000,
+                 poll_interval_ms=2000, use_native=True, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.max_delay_ms = max_delay_ms
+        self.pending = set()
+        self.polled = {}  # path -> last seen mtime
+        self.elapsed = QtCore.QElapsedTimer()
+
+        self.native = None
+        if use_native:
+            self.native = QtCore.QFileSystemWatcher(self)
+            self.native.directoryChanged.connect(self.queue)
+
+        self.debounce_timer = QtCore.QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.flush)
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.setInterval(poll_interval_ms)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def watched(self):
+        paths = set(self.polled)
+        if self.native is not None:
+            paths.update(self.native.directories())
+        return paths
+
+    def watch(self, path):
+        if path in self.polled:
+            return
+        if self.native is not None:
+            if path in self.native.directories():
+                return
+            if self.native.addPath(path):
+                return
+        self.polled[path] = self._mtime(path)
+        if not self.poll_timer.isActive():
+            self.poll_timer.start()
+
+    def unwatch(self, path):
+        if self.polled.pop(path, None) is None and self.native is not None:
+            self.native.removePath(path)
+        if not self.polled:
+            self.poll_timer.stop()
+
+    def sync(self, paths):
+        """Watches exactly `paths`."""
+        paths = set(paths)
+        current = self.watched()
+        for path in current - paths:
+            self.unwatch(path)
+        for path in paths - current:
+            self.watch(path)
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.poll_timer.stop()
+        self.pending = set()
+        self.polled = {}
+        if self.native is not None:
+            directories = self.native.directories()
+            if directories:
+                self.native.removePaths(directories)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        for path, mtime in list(self.polled.items()):
+            current = self._mtime(path)
+            if current != mtime:
+                self.polled[path] = current
+                self.queue(path)
+
+    def queue(self, path):
+        if not self.pending:
+            self.elapsed.start()
+        self.pending.add(path)
+        # Keep pushing the flush back while events keep coming, but never
+        # beyond max_delay_ms so a never-ending stream still gets applied.
+        if self.elapsed.elapsed() >= self.max_delay_ms:
+            self.flush()
+        else:
+            self.debounce_timer.start()
+
+    def flush(self):
+        self.debounce_timer.stop()
+        if not self.pending:
+            return
+        paths = self.pending
+        self.pending = set()
+        self.manager.apply_changes(paths)
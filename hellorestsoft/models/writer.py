@@ -0,0 +1,176 @@
+"""Crash-safe file writes and a background writer for request files"""
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from hellorestsoft import metrics
+
+
+def _fsync_dir(directory):
+    # Persists renames; not every platform can open directories
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def atomic_write(path, data):
+    """Writes bytes to `path` so readers see either the old or the new file.
+
+    The data goes to a temporary file in the same directory, is fsync'ed,
+    and then renamed over the target with os.replace().
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(
+        prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def atomic_write_json(path, data):
+    atomic_write(path, json.dumps(data, indent=2).encode('utf-8'))
+
+
+def _write_staged(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def atomic_write_many(files, staging_parent, threads=8):
+    """Writes a batch of (path, bytes) pairs, staging all of them first.
+
+    Every file is written and fsync'ed in a staging directory under
+    `staging_parent`, which must be on the same filesystem as the targets.
+    Only then are they renamed into place, so a failure while writing
+    leaves the targets untouched. The fsyncs run on a few threads, and
+    each target directory is synced once rather than once per file.
+    """
+    if not files:
+        return
+    if not os.path.exists(staging_parent):
+        os.makedirs(staging_parent)
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=staging_parent)
+    try:
+        staged = [os.path.join(staging, str(number)) for number in range(len(files))]
+        with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+            # list() re-raises the first failed write
+            list(pool.map(_write_staged, staged, [data for _, data in files]))
+        directories = set()
+        for source, (path, _) in zip(staged, files):
+            directory = os.path.dirname(path)
+            if directory not in directories:
+                os.makedirs(directory, exist_ok=True)
+                directories.add(directory)
+            os.replace(source, path)
+        for directory in directories:
+            _fsync_dir(directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+class BackgroundWriter:
+    """Serializes and writes JSON files on a dedicated thread.
+
+    `submit()` returns immediately. Writes to the same path that pile up
+    while the thread is busy are coalesced: only the newest data is
+    written, and every caller's callback gets that write's outcome.
+    Callbacks run on the writer thread as `callback(path, error)`.
+    """
+
+    def __init__(self, write=atomic_write_json, on_written=None):
+        self.write = write
+        # Called on the writer thread after each successful write
+        self.on_written = on_written
+        self.pending = OrderedDict()
+        self.busy = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def submit(self, path, data, callback=None):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Writer is closed")
+            if path in self.pending:
+                # Latency is measured from the oldest save the write covers
+                _, callbacks, queued = self.pending[path]
+            else:
+                callbacks, queued = [], time.perf_counter()
+            if callback is not None:
+                callbacks.append(callback)
+            self.pending[path] = (data, callbacks, queued)
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name='hellorestsoft-writer', daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def is_pending(self, path):
+        with self.condition:
+            return path in self.pending
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                path, (data, callbacks, queued) = self.pending.popitem(last=False)
+                self.busy = True
+            error = None
+            try:
+                with metrics.timer('save.write', mode='background'):
+                    self.write(path, data)
+                if self.on_written is not None:
+                    self.on_written(path)
+                metrics.record('save.latency', time.perf_counter() - queued)
+            except Exception as e:
+                error = e
+            for callback in callbacks:
+                try:
+                    callback(path, error)
+                except Exception:
+                    pass
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Waits until everything submitted so far is on disk."""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.busy, timeout)
+
+    def close(self, timeout=None):
+        """Finishes the queued writes and stops the thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
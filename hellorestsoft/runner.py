@@ -0,0 +1,181 @@
+"""Concurrent collection runner"""
+import os
+import time
+import asyncio
+from urllib.parse import urlsplit
+
+from hellorestsoft.models.template import RequestTemplate, extract_values
+
+
+class HostRateLimiter:
+    """Spaces out requests to each host to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = {}
+
+    async def acquire(self, host):
+        if not self.interval:
+            return
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot.get(host, now))
+        self.next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class CollectionRunner:
+    """Runs saved requests concurrently on the shared HTTP engine.
+
+    `concurrency` bounds the number of requests in flight, `rate_limit`
+    caps requests per second for each host (0 disables it), and
+    `fail_fast` cancels everything still pending after the first failure.
+    `{{variables}}` come from `environment` (an EnvironmentStore, or None)
+    plus `overrides`. Values captured from responses are kept for the run,
+    and stored back into the environment when there is one. A request
+    that uses a captured name waits for the earlier requests capturing it,
+    whatever the concurrency; one whose placeholders are still unresolved
+    when it is due is reported as failed instead of being sent.
+    Must be awaited on the engine loop, e.g. `engine.submit(runner.run(...))`.
+    """
+
+    def __init__(self, engine, concurrency=10, rate_limit=0, fail_fast=False,
+                 environment=None, overrides=None):
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.rate_limit = rate_limit
+        self.fail_fast = fail_fast
+        self.environment = environment
+        self.overrides = overrides or {}
+        self.captured = {}
+
+    def variables(self):
+        variables = {} if self.environment is None else self.environment.variables()
+        variables.update(self.captured)
+        variables.update(self.overrides)
+        return variables
+
+    async def run_one(self, path, name, data, limiter, semaphore, template=None, after=()):
+        result = {
+            'path': path,
+            'name': name,
+            'method': None,
+            'url': None,
+            'status_code': None,
+            'elapsed': 0.0,
+            'size': 0,
+            'ok': False,
+            'error': None,
+            'timings': None,
+        }
+        if not isinstance(data, dict) or not data.get('url'):
+            result['error'] = 'Invalid request file'
+            return result
+        if template is None:
+            template = RequestTemplate(data)
+        method = template.method
+        result['method'] = method
+        result['url'] = data['url']
+        if after:
+            await asyncio.wait(after)
+        async with semaphore:
+            # Rendered at send time so values captured meanwhile are used
+            variables = self.variables()
+            url, headers, body = template.render(variables)
+            result['url'] = url
+            unresolved = template.unresolved(variables)
+            if unresolved:
+                result['error'] = "Unresolved variables: " + ", ".join(unresolved)
+                return result
+            try:
+                host = urlsplit(url).netloc or url
+            except ValueError:
+                host = url
+            await limiter.acquire(host)
+            start = time.perf_counter()
+            try:
+                # Bodies are only read back for captures
+                response = await self.engine.request(
+                    method, url, headers=headers, body=body or None,
+                    keep_body=bool(template.captures),
+                    timeouts=data.get('timeouts'))
+            except Exception as e:
+                result['error'] = str(e) or e.__class__.__name__
+                result['elapsed'] = time.perf_counter() - start
+                return result
+        result['elapsed'] = time.perf_counter() - start
+        result['status_code'] = response['status_code']
+        result['size'] = response.get('size', 0)
+        result['timings'] = response.get('timings')
+        result['ok'] = response['status_code'] < 400
+        try:
+            if template.captures:
+                values = extract_values(template.captures, response)
+                self.captured.update(values)
+                if self.environment is not None:
+                    self.environment.capture(values)
+        finally:
+            self.engine.release(response)
+        if not result['ok']:
+            result['error'] = f"HTTP {response['status_code']}"
+        return result
+
+    async def run(self, requests, on_result=None):
+        """Runs (path, name, data) items; calls on_result(result) as each ends.
+
+        Returns the results in completion order.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = HostRateLimiter(self.rate_limit)
+        tasks = []
+        # Capturing requests so far, by captured name
+        capturers = {}
+        for path, name, data in requests:
+            # Templates are compiled once per request, not per send
+            template = RequestTemplate(data) if isinstance(data, dict) else None
+            after = set()
+            if template is not None:
+                for variable in template.names() - set(self.overrides):
+                    after.update(capturers.get(variable, ()))
+            task = asyncio.ensure_future(self.run_one(
+                path, name, data, limiter, semaphore, template, after))
+            tasks.append(task)
+            if template is not None:
+                for variable in template.captures:
+                    capturers.setdefault(variable, []).append(task)
+        results = []
+        try:
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                if self.fail_fast and not result['ok']:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return results
+
+    async def run_folder(self, manager, folder=None, on_result=None):
+        """Loads the requests below `folder` off-loop, then runs them."""
+        loop = asyncio.get_event_loop()
+        requests = await loop.run_in_executor(None, manager.collect_requests, folder)
+        return await self.run(requests, on_result)
+
+
+def summarize(results, wall_time):
+    passed = sum(1 for result in results if result['ok'])
+    return {
+        'total': len(results),
+        'passed': passed,
+        'failed': len(results) - passed,
+        'wall_time': wall_time,
+    }
+
+
+def relative_name(path, root):
+    name = os.path.relpath(path, root)
+    return name[:-5] if name.endswith('.json') else name
@@ -0,0 +1,97 @@
+"""Persistent application settings"""
+import os
+import json
+
+from hellorestsoft.models.writer import atomic_write_json
+
+DEFAULT_PATH = os.path.expanduser("~/.hellorestsoft/settings.json")
+
+DEFAULTS = {
+    # HTTP engine
+    'http.max_connections': 100,
+    'http.max_keepalive_connections': 20,
+    'http.keepalive_expiry': 30.0,
+    'http.http2': False,
+    # Response bodies larger than this are spooled to disk
+    'http.spool_threshold': 8 * 1024 * 1024,
+    'http.preview_size': 256 * 1024,
+    'http.spool_dir': None,
+    # Default timeouts in seconds; requests can override them, 0 = no limit
+    'http.connect_timeout': 10.0,
+    'http.read_timeout': 30.0,
+    'http.total_timeout': 0,
+    # Optional on-disk cache for conditional GETs (ETag / Last-Modified)
+    'http.cache': False,
+    'http.cache_dir': None,
+    'http.cache_max_size': 256 * 1024 * 1024,
+    # Response rendering
+    'render.max_format_size': 5 * 1024 * 1024,
+    'render.chunk_size': 64 * 1024,
+    # JSON tree: children listed per expansion, and query results shown
+    'json.page_size': 500,
+    'json.max_results': 10000,
+    # Collection file watching
+    'collections.watch': True,
+    'collections.watch_native': True,
+    'collections.watch_debounce_ms': 250,
+    'collections.watch_poll_interval_ms': 2000,
+    # Collection runner defaults
+    'runner.concurrency': 10,
+    'runner.rate_limit': 0,
+    'runner.fail_fast': False,
+    # Worker processes converting imported OpenAPI/HAR/Postman files, 0 = one per CPU
+    'import.processes': 0,
+    # Responses kept per request in the history store
+    'history.max_entries': 100,
+    # Write saved tabs back to disk shortly after each edit
+    'autosave.enabled': False,
+    'autosave.delay_ms': 1000,
+    # Timing samples kept for the metrics panel; export_path (.prom or
+    # .jsonl) is written on exit when set
+    'metrics.enabled': True,
+    'metrics.buffer_size': 10000,
+    'metrics.export_path': None,
+    # Profile every session: None, 'cprofile' (GUI thread) or 'sampling' (all threads)
+    'profile.mode': None,
+    'profile.dir': None,
+    'profile.interval_ms': 5,
+    # Tabs beyond the most recent max_views are hibernated, and response
+    # bodies held for all tabs are capped at response_budget bytes
+    'tabs.max_views': 8,
+    'tabs.response_budget': 256 * 1024 * 1024,
+}
+
+
+class Settings:
+    """Key/value settings backed by a JSON file.
+
+    Unknown keys fall back to DEFAULTS so older settings files keep working.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.values = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            values = {}
+        if isinstance(values, dict):
+            self.values = values
+
+    def save(self):
+        parent = os.path.dirname(self.path)
+        if parent and not os.path.exists(parent):
+            os.makedirs(parent)
+        atomic_write_json(self.path, self.values)
+
+    def get(self, key, default=None):
+        if key in self.values:
+            return self.values[key]
+        return DEFAULTS.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
@@ -0,0 +1,320 @@
+import collections
+
+from qtpy import QtWidgets, QtCore, QtGui
+from cola import qtutils
+from hellorestsoft.models.mapped_body import MappedBody
+from hellorestsoft.models.response import format_size
+
+
+def find_match(body, text, start, backwards):
+    """Runs a search on a worker and locates the hit as (start, end, line, column, length)."""
+    found = body.find(text, start, backwards=backwards)
+    if found is None:
+        return None
+    begin, end = found
+    length = len(body.mm[begin:end].decode(body.encoding, 'replace'))
+    return begin, end, body.line_at(begin), body.column_of(begin), length
+
+
+class MappedTextArea(QtWidgets.QAbstractScrollArea):
+    """Paints the visible lines of a MappedBody; one scrollbar step is one line."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.body = None
+        self.line_count = 0
+        # (line, column, length) of the current search hit
+        self.match = None
+        self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.viewport().setBackgroundRole(QtGui.QPalette.Base)
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+    def set_body(self, body):
+        self.body = body
+        self.match = None
+        self.set_line_count(0)
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.viewport().update()
+
+    def set_line_count(self, count):
+        """Enables scrolling once the line index is built."""
+        self.line_count = count
+        self._update_scrollbars()
+
+    def _line_height(self):
+        return self.fontMetrics().lineSpacing()
+
+    def _char_width(self):
+        return self.fontMetrics().horizontalAdvance('0')
+
+    def _gutter_width(self):
+        digits = len(str(max(1, self.line_count)))
+        return (digits + 2) * self._char_width()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self._line_height())
+
+    def _update_scrollbars(self):
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, max(0, self.line_count - self.visible_lines()))
+        vbar.setPageStep(self.visible_lines())
+        vbar.setSingleStep(1)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def first_line(self):
+        return self.verticalScrollBar().value()
+
+    def scroll_to_line(self, line):
+        """Scrolls so that `line` is in view, roughly centred if it was not."""
+        first = self.first_line()
+        visible = self.visible_lines()
+        if not first <= line < first + visible:
+            self.verticalScrollBar().setValue(max(0, line - visible // 3))
+
+    def set_match(self, line, column, length):
+        self.match = (line, column, length)
+        self.scroll_to_line(line)
+        # Bring the hit into view horizontally as well
+        char_width = self._char_width()
+        x = column * char_width
+        hbar = self.horizontalScrollBar()
+        room = self.viewport().width() - self._gutter_width()
+        if not hbar.value() <= x < hbar.value() + room - length * char_width:
+            hbar.setMaximum(max(hbar.maximum(), x))
+            hbar.setValue(max(0, x - room // 3))
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        if self.body is None:
+            return
+        painter = QtGui.QPainter(self.viewport())
+        line_height = self._line_height()
+        char_width = self._char_width()
+        ascent = self.fontMetrics().ascent()
+        gutter = self._gutter_width()
+        first = self.first_line()
+        lines = self.body.lines(first, self.visible_lines() + 1)
+        offset_x = self.horizontalScrollBar().value()
+        palette = self.palette()
+
+        painter.setClipRect(gutter, 0, self.viewport().width() - gutter, self.viewport().height())
+        widest = 0
+        for row, text in enumerate(lines):
+            y = row * line_height
+            x = gutter + char_width // 2 - offset_x
+            if self.match is not None and self.match[0] == first + row:
+                _, column, length = self.match
+                painter.fillRect(x + column * char_width, y, max(1, length) * char_width,
+                                 line_height, palette.highlight())
+            painter.drawText(x, y + ascent, text)
+            widest = max(widest, len(text))
+
+        painter.setClipping(False)
+        painter.fillRect(0, 0, gutter, self.viewport().height(), palette.window())
+        painter.setPen(palette.color(QtGui.QPalette.Disabled, QtGui.QPalette.Text))
+        for row in range(len(lines)):
+            number = str(first + row + 1)
+            painter.drawText(gutter - (len(number) + 1) * char_width,
+                             row * line_height + ascent, number)
+        painter.end()
+
+        hbar = self.horizontalScrollBar()
+        room = self.viewport().width() - gutter
+        hbar.setPageStep(room)
+        hbar.setSingleStep(char_width)
+        maximum = max(0, (widest + 1) * char_width - room)
+        if maximum > hbar.maximum() or hbar.value() == 0:
+            hbar.setMaximum(maximum)
+
+
+class LargeBodyView(QtWidgets.QWidget):
+    """Viewer for spooled response bodies of any size.
+
+    The body file is memory-mapped and its line index is built on a
+    worker; only the visible lines are ever decoded. Searches run on the
+    worker against the mapped bytes, so they cover the whole file rather
+    than the preview held in memory.
+    """
+
+    def __init__(self, context, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.body = None
+        # Worker tasks still using each body, and bodies waiting on them to close
+        self.users = collections.Counter()
+        self.retired = set()
+        self.search_serial = 0
+        # Byte range of the current search hit
+        self.hit = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QtWidgets.QHBoxLayout()
+        layout.addLayout(toolbar)
+
+        self.find_input = QtWidgets.QLineEdit()
+        self.find_input.setPlaceholderText("Find")
+        self.find_input.setClearButtonEnabled(True)
+        self.find_input.textChanged.connect(self.schedule_search)
+        self.find_input.returnPressed.connect(self.find_next)
+        toolbar.addWidget(self.find_input, 1)
+
+        prev_button = QtWidgets.QToolButton()
+        prev_button.setText("▲")
+        prev_button.setToolTip("Previous match")
+        prev_button.clicked.connect(self.find_previous)
+        toolbar.addWidget(prev_button)
+        next_button = QtWidgets.QToolButton()
+        next_button.setText("▼")
+        next_button.setToolTip("Next match")
+        next_button.clicked.connect(self.find_next)
+        toolbar.addWidget(next_button)
+
+        toolbar.addWidget(QtWidgets.QLabel("Line:"))
+        self.line_input = QtWidgets.QLineEdit()
+        self.line_input.setValidator(QtGui.QIntValidator(1, 2 ** 31 - 1, self))
+        self.line_input.setMaximumWidth(100)
+        self.line_input.returnPressed.connect(self.go_to_line)
+        toolbar.addWidget(self.line_input)
+
+        self.status_label = QtWidgets.QLabel("")
+        toolbar.addWidget(self.status_label)
+
+        self.area = MappedTextArea()
+        layout.addWidget(self.area)
+
+        # Coalesce keystrokes into one search
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.search_incremental)
+
+    def open(self, path, encoding=None):
+        """Maps `path` and starts indexing it; False if the file can't be mapped."""
+        self.close_body()
+        try:
+            body = MappedBody(path, encoding)
+        except (OSError, ValueError):
+            return False
+        self.body = body
+        self.hit = None
+        self.area.set_body(body)
+        self.status_label.setText(f"Indexing {format_size(body.size)}…")
+        self._run(self._indexed, body.build_index, lambda: body is not self.body)
+        return True
+
+    def close_body(self):
+        """Unmaps the current body once no worker is reading it."""
+        body = self.body
+        if body is None:
+            return
+        self.body = None
+        self.search_serial += 1
+        self.search_timer.stop()
+        self.area.set_body(None)
+        if self.users[body]:
+            self.retired.add(body)
+        else:
+            body.close()
+
+    def _run(self, result, func, *args):
+        body = self.body
+        self.users[body] += 1
+
+        def done(value):
+            self.users[body] -= 1
+            if not self.users[body]:
+                del self.users[body]
+                if body in self.retired:
+                    self.retired.discard(body)
+                    body.close()
+            if body is self.body:
+                result(value)
+
+        task = qtutils.SimpleTask(func, *args)
+        self.context.runtask.start(task, result=done)
+
+    def _indexed(self, ok):
+        if isinstance(ok, Exception):
+            self.status_label.setText(f"Error: {ok}")
+            return
+        if not ok:
+            return
+        self.area.set_line_count(self.body.line_count)
+        self.status_label.setText(
+            f"{self.body.line_count:,} lines, {format_size(self.body.size)}")
+        if self.find_input.text():
+            self.search_incremental()
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def search_incremental(self):
+        """Searches from the top of the view as the query is typed."""
+        if self.body is None or not self.body.indexed:
+            return
+        start = self.body.line_offset(self.area.first_line())
+        self._search(start, False)
+
+    def find_next(self):
+        if self.body is None or not self.body.indexed:
+            return
+        if self.hit is None:
+            start = self.body.line_offset(self.area.first_line())
+        else:
+            start = self.hit[0] + 1
+        self._search(start, False)
+
+    def find_previous(self):
+        if self.body is None or not self.body.indexed:
+            return
+        if self.hit is None:
+            start = self.body.line_offset(self.area.first_line())
+        else:
+            start = self.hit[0]
+        self._search(start, True)
+
+    def _search(self, start, backwards):
+        self.search_serial += 1
+        serial = self.search_serial
+        text = self.find_input.text()
+        if not text:
+            self.hit = None
+            self.area.match = None
+            self.area.viewport().update()
+            return
+        self.status_label.setText("Searching…")
+        self._run(lambda found: self._found(serial, found),
+                  find_match, self.body, text, start, backwards)
+
+    def _found(self, serial, found):
+        if serial != self.search_serial:
+            return  # The query changed while this search ran
+        if isinstance(found, Exception):
+            self.status_label.setText(f"Error: {found}")
+            return
+        if found is None:
+            self.hit = None
+            self.area.match = None
+            self.area.viewport().update()
+            self.status_label.setText("No matches")
+            return
+        begin, end, line, column, length = found
+        self.hit = (begin, end)
+        self.area.set_match(line, column, length)
+        self.status_label.setText(f"Line {line + 1:,} of {self.body.line_count:,}")
+
+    def go_to_line(self):
+        if self.body is None or not self.body.indexed:
+            return
+        try:
+            line = int(self.line_input.text()) - 1
+        except ValueError:
+            return
+        line = max(0, min(line, self.body.line_count - 1))
+        self.area.verticalScrollBar().setValue(line)
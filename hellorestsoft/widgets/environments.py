@@ -0,0 +1,98 @@
+from qtpy import QtWidgets, QtCore
+
+from hellorestsoft.engine import parse_headers
+
+
+class EnvironmentDialog(QtWidgets.QDialog):
+    """Edits the environments of a collection, one 'name: value' per line."""
+
+    def __init__(self, environments, parent=None):
+        super().__init__(parent)
+        self.environments = environments
+        self.values = {name: environments.get(name) for name in environments.names()}
+        self.current = None
+        self.setWindowTitle("Environments")
+        self.resize(600, 400)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
+        layout.addWidget(splitter)
+
+        left = QtWidgets.QWidget()
+        left_layout = QtWidgets.QVBoxLayout(left)
+        left_layout.setContentsMargins(0, 0, 0, 0)
+        self.list_widget = QtWidgets.QListWidget()
+        self.list_widget.addItems(sorted(self.values))
+        self.list_widget.currentTextChanged.connect(self.select)
+        left_layout.addWidget(self.list_widget)
+
+        buttons = QtWidgets.QHBoxLayout()
+        left_layout.addLayout(buttons)
+        add_button = QtWidgets.QPushButton("Add")
+        add_button.clicked.connect(self.add)
+        buttons.addWidget(add_button)
+        remove_button = QtWidgets.QPushButton("Remove")
+        remove_button.clicked.connect(self.remove)
+        buttons.addWidget(remove_button)
+        splitter.addWidget(left)
+
+        self.values_edit = QtWidgets.QPlainTextEdit()
+        self.values_edit.setPlaceholderText("base_url: https://staging.example.com\ntoken: secret")
+        self.values_edit.setEnabled(False)
+        splitter.addWidget(self.values_edit)
+        splitter.setSizes([180, 420])
+
+        button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        if self.list_widget.count():
+            self.list_widget.setCurrentRow(0)
+
+    def _store_current(self):
+        if self.current is not None and self.current in self.values:
+            self.values[self.current] = parse_headers(self.values_edit.toPlainText())
+
+    def select(self, name):
+        self._store_current()
+        self.current = name or None
+        values = self.values.get(self.current, {})
+        self.values_edit.setPlainText("\n".join(f"{k}: {v}" for k, v in values.items()))
+        self.values_edit.setEnabled(self.current is not None)
+
+    def add(self):
+        name, ok = QtWidgets.QInputDialog.getText(self, "New Environment", "Environment name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in self.values:
+            QtWidgets.QMessageBox.warning(self, "Environments", f"'{name}' already exists.")
+            return
+        self.values[name] = {}
+        self.list_widget.addItem(name)
+        self.list_widget.setCurrentRow(self.list_widget.count() - 1)
+
+    def remove(self):
+        item = self.list_widget.currentItem()
+        if item is None:
+            return
+        name = item.text()
+        self.current = None
+        self.values.pop(name, None)
+        self.list_widget.takeItem(self.list_widget.row(item))
+
+    def accept(self):
+        self._store_current()
+        for name in self.environments.names():
+            if name not in self.values:
+                self.environments.remove(name)
+        for name, values in self.values.items():
+            self.environments.set(name, values)
+        try:
+            self.environments.save()
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            return
+        super().accept()
@@ -0,0 +1,121 @@
+import os
+import threading
+
+from qtpy import QtWidgets, QtCore
+
+from hellorestsoft.importer import Importer
+
+
+class ImportDialog(QtWidgets.QDialog):
+    """Imports OpenAPI, HAR and Postman files into a collection folder.
+
+    The import runs on a thread with conversion in a process pool; the
+    sidebar is refreshed once, when every file is written.
+    """
+
+    # Emitted from the import thread; Qt queues them onto the GUI thread
+    progress_changed = QtCore.Signal(object, object, object)
+    file_done = QtCore.Signal(object, object, object)
+    import_finished = QtCore.Signal()
+
+    COLUMNS = ["File", "Format", "Requests", "Time", "Result"]
+
+    def __init__(self, context, manager, folder, paths, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.manager = manager
+        self.folder = folder
+        self.paths = paths
+        self.changed = set()
+        self.cancel = threading.Event()
+        self.thread = None
+        self.setWindowTitle(f"Import into {os.path.basename(folder) or folder}")
+        self.resize(700, 300)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.table = QtWidgets.QTableWidget(len(paths), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        for row, path in enumerate(paths):
+            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(os.path.basename(path)))
+            self.table.setItem(row, 4, QtWidgets.QTableWidgetItem("Waiting"))
+        layout.addWidget(self.table)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        buttons = QtWidgets.QHBoxLayout()
+        layout.addLayout(buttons)
+        buttons.addStretch()
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.stop)
+        buttons.addWidget(self.cancel_button)
+        self.close_button = QtWidgets.QPushButton("Close")
+        self.close_button.setEnabled(False)
+        self.close_button.clicked.connect(self.accept)
+        buttons.addWidget(self.close_button)
+
+        self.progress_changed.connect(self.show_progress)
+        self.file_done.connect(self.show_result)
+        self.import_finished.connect(self.finished_import)
+
+    def start(self):
+        importer = Importer(self.manager, processes=self.context.cfg.get('import.processes'))
+
+        def run():
+            for row, path in enumerate(self.paths):
+                if self.cancel.is_set():
+                    break
+                self.progress_changed.emit(row, 0, 0)
+                try:
+                    summary = importer.run(
+                        path, self.folder,
+                        progress=lambda done, total, row=row: self.progress_changed.emit(row, done, total),
+                        should_stop=self.cancel.is_set)
+                except Exception as e:
+                    summary = e
+                self.file_done.emit(row, path, summary)
+            self.import_finished.emit()
+
+        self.thread = threading.Thread(target=run, name='hellorestsoft-import', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.cancel.set()
+        self.cancel_button.setEnabled(False)
+
+    def show_progress(self, row, done, total):
+        self.table.item(row, 4).setText("Importing...")
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def show_result(self, row, path, summary):
+        if summary is None:
+            self.table.item(row, 4).setText("Cancelled")
+            return
+        if isinstance(summary, Exception):
+            self.table.item(row, 4).setText(f"Error: {summary}")
+            return
+        self.changed.update(summary['changed'])
+        values = [summary['format'], str(summary['requests']), f"{summary['elapsed']:.2f}s",
+                  os.path.relpath(summary['folder'], self.manager.root_path)]
+        for column, value in enumerate(values, 1):
+            self.table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+
+    def finished_import(self):
+        self.thread = None
+        # One sidebar refresh for everything that was imported
+        if self.changed:
+            self.manager.apply_changes(self.changed)
+        self.cancel_button.setEnabled(False)
+        self.close_button.setEnabled(True)
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+
+    def reject(self):
+        if self.thread is not None:
+            self.stop()
+            return  # Closes via the Close button once the current file stops
+        super().reject()
@@ -0,0 +1,225 @@
+import time
+
+from qtpy import QtWidgets, QtCore
+from cola import qtutils
+from hellorestsoft.models.json_tree import JsonDocument, run_query
+
+NODE_ROLE = QtCore.Qt.UserRole
+# Marks the "load more" placeholder under a partially listed container
+MORE_ROLE = QtCore.Qt.UserRole + 1
+
+
+def open_document(response, page_size):
+    """Indexes a response body and lists the root's first page; runs on a worker."""
+    path = response.get('body_path')
+    if response.get('truncated'):
+        if not path:
+            raise ValueError("Only a preview of this body was received")
+        document = JsonDocument.from_file(path, response.get('encoding'))
+    else:
+        document = JsonDocument(response.get('text') or '')
+    if document.root.is_container:
+        document.load_children(document.root, page_size)
+    return document
+
+
+class JsonTreeView(QtWidgets.QWidget):
+    """Collapsible view of a JSON response, with path queries.
+
+    The body is only indexed when the tab is first shown, and children
+    are listed on a worker one page at a time as nodes are expanded.
+    Queries run on the worker and their results show up as a second tree.
+    """
+
+    def __init__(self, context, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.response = None
+        self.document = None
+        self.loaded = False
+        # Bumped whenever the response changes; stale worker results are dropped
+        self.serial = 0
+        self.query_serial = 0
+        # ids of nodes with a page load in flight
+        self.loading = set()
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QtWidgets.QHBoxLayout()
+        layout.addLayout(toolbar)
+        self.query_input = QtWidgets.QLineEdit()
+        self.query_input.setPlaceholderText("Filter: $.items[*].id, .data[0], $..name, "
+                                            "$.items[?(@.status == \"active\")]")
+        self.query_input.setClearButtonEnabled(True)
+        self.query_input.returnPressed.connect(self.run_query)
+        self.query_input.textChanged.connect(self._query_edited)
+        toolbar.addWidget(self.query_input, 1)
+        self.status_label = QtWidgets.QLabel("")
+        toolbar.addWidget(self.status_label)
+
+        self.stack = QtWidgets.QStackedWidget()
+        layout.addWidget(self.stack)
+        self.tree = self._make_tree()
+        self.results = self._make_tree()
+        self.stack.addWidget(self.tree)
+        self.stack.addWidget(self.results)
+
+    def _make_tree(self):
+        tree = QtWidgets.QTreeWidget()
+        tree.setHeaderLabels(["Key", "Value"])
+        tree.setUniformRowHeights(True)
+        tree.header().setStretchLastSection(True)
+        tree.setColumnWidth(0, 250)
+        tree.itemExpanded.connect(self.expand)
+        tree.itemActivated.connect(self.activate)
+        return tree
+
+    def set_response(self, response):
+        """Shows a new response; the body is indexed the next time the tab is visible."""
+        self.clear()
+        self.response = response
+        if self.isVisible():
+            self.load()
+
+    def clear(self):
+        self.serial += 1
+        self.query_serial += 1
+        self.response = None
+        self.document = None
+        self.loaded = False
+        self.loading = set()
+        self.tree.clear()
+        self.results.clear()
+        self.stack.setCurrentWidget(self.tree)
+        self.status_label.setText("")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load()
+
+    def load(self):
+        if self.loaded or self.response is None:
+            return
+        self.loaded = True
+        serial = self.serial
+        self.status_label.setText("Indexing…")
+        started = time.perf_counter()
+        task = qtutils.SimpleTask(open_document, self.response,
+                                  self.context.cfg.get('json.page_size'))
+        self.context.runtask.start(
+            task, result=lambda document: self._opened(serial, document, started))
+
+    def _opened(self, serial, document, started):
+        if serial != self.serial:
+            return
+        if isinstance(document, Exception):
+            self.status_label.setText(f"Not shown as JSON: {document}")
+            return
+        self.document = document
+        self.status_label.setText("")
+        item = self._add_item(self.tree, document.root)
+        self._add_children(item, document.root, document.root.children)
+        item.setExpanded(True)
+        self.context.metrics.record('render.json_index', time.perf_counter() - started)
+        if self.query_input.text().strip():
+            self.run_query()
+
+    def _add_item(self, parent, node):
+        item = QtWidgets.QTreeWidgetItem([str(node.key), node.summary()])
+        item.setData(0, NODE_ROLE, node)
+        if node.is_container and node.size != 0:
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        if isinstance(parent, QtWidgets.QTreeWidget):
+            parent.addTopLevelItem(item)
+        else:
+            parent.addChild(item)
+        return item
+
+    def _add_children(self, item, node, children):
+        for child in children:
+            self._add_item(item, child)
+        if not node.complete:
+            more = QtWidgets.QTreeWidgetItem(["…", "Show more"])
+            more.setData(0, MORE_ROLE, True)
+            item.addChild(more)
+        else:
+            item.setText(1, node.summary())
+            if not node.children:
+                item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicator)
+
+    def expand(self, item):
+        node = item.data(0, NODE_ROLE)
+        if node is None or not node.is_container or item.childCount():
+            return
+        if node.children:
+            # Already listed for another item showing the same node
+            self._add_children(item, node, node.children)
+            return
+        self._load_page(item, node)
+
+    def activate(self, item, column=0):
+        if not item.data(0, MORE_ROLE):
+            return
+        parent = item.parent()
+        node = parent.data(0, NODE_ROLE)
+        if node.complete:
+            return
+        item.setText(1, "Loading…")
+        self._load_page(parent, node, item)
+
+    def _load_page(self, item, node, more=None):
+        if self.document is None or id(node) in self.loading:
+            return
+        self.loading.add(id(node))
+        serial = self.serial
+        task = qtutils.SimpleTask(self.document.load_children, node,
+                                  self.context.cfg.get('json.page_size'))
+        self.context.runtask.start(
+            task, result=lambda page: self._page_loaded(serial, item, node, more, page))
+
+    def _page_loaded(self, serial, item, node, more, page):
+        if serial != self.serial:
+            return
+        self.loading.discard(id(node))
+        if isinstance(page, Exception):
+            self.status_label.setText(f"Error: {page}")
+            return
+        if more is not None:
+            item.removeChild(more)
+        self._add_children(item, node, page)
+
+    def _query_edited(self, text):
+        if not text.strip():
+            self.query_serial += 1
+            self.results.clear()
+            self.stack.setCurrentWidget(self.tree)
+            self.status_label.setText("")
+
+    def run_query(self):
+        expression = self.query_input.text().strip()
+        if self.document is None or not expression:
+            return
+        self.query_serial += 1
+        serial = self.query_serial
+        document = self.document
+        self.status_label.setText("Filtering…")
+        task = qtutils.SimpleTask(run_query, document, expression,
+                                  self.context.cfg.get('json.max_results'),
+                                  lambda: serial != self.query_serial)
+        self.context.runtask.start(task, result=lambda found: self._query_done(serial, found))
+
+    def _query_done(self, serial, found):
+        if serial != self.query_serial:
+            return
+        if isinstance(found, Exception):
+            self.status_label.setText(f"Error: {found}")
+            return
+        nodes, truncated = found
+        self.results.clear()
+        for node in nodes:
+            self._add_item(self.results, node)
+        self.stack.setCurrentWidget(self.results)
+        text = f"{len(nodes):,} matches"
+        if truncated:
+            text = f"First {len(nodes):,} matches"
+        self.status_label.setText(text)
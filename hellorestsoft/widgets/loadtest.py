@@ -0,0 +1,160 @@
+from qtpy import QtWidgets, QtCore
+
+from hellorestsoft.loadtest import LoadTest, PERCENTILES, export_path
+from hellorestsoft.models.response import format_size
+
+
+class LoadTestDialog(QtWidgets.QDialog):
+    """Runs a load test against one saved request with live statistics."""
+
+    run_finished = QtCore.Signal(object)
+
+    def __init__(self, context, path, data, variables=None, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.path = path
+        self.data = data
+        self.variables = variables
+        self.test = None
+        self.future = None
+        self.setWindowTitle(f"Load Test - {data.get('method', 'GET')} {data.get('url', '')}")
+        self.resize(600, 480)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        # Options
+        form = QtWidgets.QFormLayout()
+        layout.addLayout(form)
+
+        self.total_spin = QtWidgets.QSpinBox()
+        self.total_spin.setRange(0, 10000000)
+        self.total_spin.setValue(1000)
+        self.total_spin.setSpecialValueText("Unlimited")
+        form.addRow("Requests:", self.total_spin)
+
+        self.duration_spin = QtWidgets.QDoubleSpinBox()
+        self.duration_spin.setRange(0, 86400)
+        self.duration_spin.setSuffix(" s")
+        self.duration_spin.setSpecialValueText("Unlimited")
+        form.addRow("Duration:", self.duration_spin)
+
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItems(["Fixed concurrency", "Target RPS"])
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        form.addRow("Mode:", self.mode_combo)
+
+        self.concurrency_spin = QtWidgets.QSpinBox()
+        self.concurrency_spin.setRange(1, 10000)
+        self.concurrency_spin.setValue(10)
+        form.addRow("Concurrency:", self.concurrency_spin)
+
+        self.rps_spin = QtWidgets.QDoubleSpinBox()
+        self.rps_spin.setRange(0.1, 100000)
+        self.rps_spin.setValue(50)
+        form.addRow("Requests/second:", self.rps_spin)
+
+        buttons = QtWidgets.QHBoxLayout()
+        layout.addLayout(buttons)
+        self.start_button = QtWidgets.QPushButton("Start")
+        self.start_button.clicked.connect(self.start)
+        buttons.addWidget(self.start_button)
+        self.stop_button = QtWidgets.QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop)
+        buttons.addWidget(self.stop_button)
+        self.export_button = QtWidgets.QPushButton("Export")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export)
+        buttons.addWidget(self.export_button)
+        buttons.addStretch()
+
+        # Live statistics
+        self.stats_label = QtWidgets.QLabel("")
+        self.stats_label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        layout.addWidget(self.stats_label)
+
+        self.errors_table = QtWidgets.QTableWidget(0, 2)
+        self.errors_table.setHorizontalHeaderLabels(["Error", "Count"])
+        self.errors_table.horizontalHeader().setStretchLastSection(True)
+        self.errors_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.errors_table.verticalHeader().hide()
+        layout.addWidget(self.errors_table)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(250)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.run_finished.connect(self.finished_run)
+        self.update_mode()
+
+    def update_mode(self):
+        self.rps_spin.setEnabled(self.mode_combo.currentIndex() == 1)
+
+    def start(self):
+        rps = self.rps_spin.value() if self.mode_combo.currentIndex() == 1 else None
+        self.test = LoadTest(
+            self.context.engine, self.data,
+            total=self.total_spin.value(),
+            duration=self.duration_spin.value() or None,
+            concurrency=self.concurrency_spin.value(),
+            rps=rps,
+            variables=self.variables)
+        if not self.test.total and not self.test.duration:
+            QtWidgets.QMessageBox.warning(self, "Load Test", "Set a request count or a duration.")
+            return
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.export_button.setEnabled(False)
+        self.future = self.context.engine.submit(self.test.run())
+        self.future.add_done_callback(self.run_finished.emit)
+        self.refresh_timer.start()
+
+    def stop(self):
+        if self.future is not None:
+            self.future.cancel()
+
+    def refresh(self):
+        if self.test is None or self.test.start_time is None:
+            return
+        snap = self.test.snapshot()
+        lines = [
+            f"Completed: {snap['completed']} / {snap['started']} started"
+            f" in {snap['elapsed']:.1f}s",
+            f"Throughput: {snap['throughput']:.1f} req/s"
+            f" | Received: {format_size(snap['bytes'])}",
+            "Latency: " + " | ".join(
+                f"p{p:g} {snap['percentiles'][str(p)] * 1000:.1f}ms" for p in PERCENTILES),
+            f"Min {snap['min'] * 1000:.1f}ms | Mean {snap['mean'] * 1000:.1f}ms"
+            f" | Max {snap['max'] * 1000:.1f}ms",
+            "Status codes: " + (", ".join(
+                f"{code}: {count}" for code, count in sorted(snap['statuses'].items())) or "-"),
+        ]
+        self.stats_label.setText("\n".join(lines))
+
+        errors = sorted(snap['errors'].items(), key=lambda item: -item[1])
+        self.errors_table.setRowCount(len(errors))
+        for row, (error, count) in enumerate(errors):
+            self.errors_table.setItem(row, 0, QtWidgets.QTableWidgetItem(error))
+            self.errors_table.setItem(row, 1, QtWidgets.QTableWidgetItem(str(count)))
+
+    def finished_run(self, future):
+        self.future = None
+        self.refresh_timer.stop()
+        self.refresh()
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.export_button.setEnabled(self.test is not None and self.path is not None)
+        if not future.cancelled() and future.exception() is not None:
+            QtWidgets.QMessageBox.critical(self, "Load Test", str(future.exception()))
+
+    def export(self):
+        try:
+            path = self.test.export(export_path(self.path))
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            return
+        QtWidgets.QMessageBox.information(self, "Load Test", f"Results written to:\n{path}")
+
+    def reject(self):
+        self.stop()
+        super().reject()
@@ -1,8 +1,12 @@
 import os
 from qtpy import QtWidgets, QtCore, QtGui
-from cola import qtutils
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Emitted from the reconcile thread with (manager, changed directories)
+    collections_reconciled = QtCore.Signal(object, object)
+    # Emitted from the writer thread with (manager, path, error)
+    request_written = QtCore.Signal(object, object, object)
+
     def __init__(self, context, parent=None):
         super().__init__(parent)
         self.context = context
@@ -41,6 +45,12 @@ class MainWindow(QtWidgets.QMainWindow):
         
         self.sidebar_header_layout.addStretch()
 
+        self.search_btn = QtWidgets.QToolButton()
+        self.search_btn.setText("🔍")
+        self.search_btn.setToolTip("Search Requests (Ctrl+P)")
+        self.search_btn.clicked.connect(self.show_search)
+        self.sidebar_header_layout.addWidget(self.search_btn)
+
         self.settings_btn = QtWidgets.QToolButton()
         self.settings_btn.setText("⚙")
         self.settings_btn.setToolTip("Collection Settings")
@@ -53,23 +63,52 @@ class MainWindow(QtWidgets.QMainWindow):
         self.new_collection_btn.clicked.connect(self.create_collection)
         self.sidebar_header_layout.addWidget(self.new_collection_btn)
 
-        self.sidebar = QtWidgets.QTreeWidget()
+        self.sidebar = QtWidgets.QTreeView()
         self.sidebar.setHeaderHidden(True)
+        self.sidebar.setUniformRowHeights(True)
         # self.sidebar.setFixedWidth(250) # Removed fixed width
-        self.sidebar.itemDoubleClicked.connect(self.load_request_from_item)
+        self.sidebar.doubleClicked.connect(self.load_request_from_index)
         self.sidebar.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.sidebar.customContextMenuRequested.connect(self.show_sidebar_context_menu)
         self.sidebar_layout.addWidget(self.sidebar)
+
+        # Environment selector for {{variables}}
+        self.env_layout = QtWidgets.QHBoxLayout()
+        self.env_layout.setContentsMargins(5, 0, 5, 5)
+        self.sidebar_layout.addLayout(self.env_layout)
+        self.env_combo = QtWidgets.QComboBox()
+        self.env_combo.setToolTip("Active Environment")
+        self.env_combo.addItem("No Environment", None)
+        self.env_combo.activated.connect(self.environment_selected)
+        self.env_layout.addWidget(self.env_combo, 1)
+        self.env_btn = QtWidgets.QToolButton()
+        self.env_btn.setText("✎")
+        self.env_btn.setToolTip("Edit Environments")
+        self.env_btn.clicked.connect(self.edit_environments)
+        self.env_layout.addWidget(self.env_btn)
         
         # Collection Manager
         from hellorestsoft.models.collection import CollectionManager
+        from hellorestsoft.models.tree_model import CollectionTreeModel
         self.collection_manager = CollectionManager(os.path.expanduser("~/.hellorestsoft/collections"))
-        self.refresh_sidebar()
+        self.watch_collections()
+        with context.metrics.timer('tree.load'):
+            self.sidebar_model = CollectionTreeModel(
+                self.collection_manager,
+                dir_icon=self.style().standardIcon(QtWidgets.QStyle.SP_DirIcon),
+                file_icon=self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon),
+                parent=self)
+        self.sidebar.setModel(self.sidebar_model)
+        self.collections_reconciled.connect(self.apply_reconciled)
+        self.request_written.connect(self.apply_written)
 
         # Main Content Area (Tabs)
         self.tabs = QtWidgets.QTabWidget()
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(self.tab_activated)
+        # Materialized request views, most recently used first
+        self.recent_views = []
         
         # New Request Button in Tab Bar
         self.new_tab_btn = QtWidgets.QToolButton()
@@ -83,64 +122,106 @@ class MainWindow(QtWidgets.QMainWindow):
         # Set initial splitter sizes (e.g., 250px for sidebar, rest for tabs)
         self.splitter.setSizes([250, 750])
         
-        # Add a default new request tab
-        self.add_new_request_tab()
+        # The default request tab is added in finish_startup(), after the
+        # window has painted, so the request view and its imports stay off
+        # the startup path.
         
         # Status Bar
         self.status_bar = QtWidgets.QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready")
+        self.metrics_btn = QtWidgets.QToolButton()
+        self.metrics_btn.setText("Metrics")
+        self.metrics_btn.setToolTip("Timings and profiling (Ctrl+Shift+M)")
+        self.metrics_btn.setAutoRaise(True)
+        self.metrics_btn.clicked.connect(self.show_metrics)
+        self.status_bar.addPermanentWidget(self.metrics_btn)
+        self.metrics_dialog = None
 
         # Shortcuts
         QtWidgets.QShortcut(QtGui.QKeySequence.New, self, self.add_new_request_tab)
         QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+T"), self, self.add_new_request_tab)
+        QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+P"), self, self.show_search)
+        QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+M"), self, self.show_metrics)
+
+    def finish_startup(self):
+        """Deferred startup work; runs once the first frame is on screen."""
+        if self.tabs.count() == 0:
+            self.add_new_request_tab()
+        self.refresh_environments()
+        self.reconcile_collections()
 
     def refresh_sidebar(self):
-        self.sidebar.clear()
-        tree = self.collection_manager.get_tree()
-        self._populate_tree(self.sidebar, tree, self.collection_manager.root_path)
-        self.sidebar.expandAll()
-
-    def _populate_tree(self, parent_widget, tree_data, current_path):
-        # Add directories
-        for name, subtree in tree_data.get('dirs', {}).items():
-            item = QtWidgets.QTreeWidgetItem([name])
-            item.setIcon(0, self.style().standardIcon(QtWidgets.QStyle.SP_DirIcon))
-            full_path = os.path.join(current_path, name)
-            item.setData(0, QtCore.Qt.UserRole, {'type': 'dir', 'path': full_path})
-            
-            if isinstance(parent_widget, QtWidgets.QTreeWidget):
-                parent_widget.addTopLevelItem(item)
-            else:
-                parent_widget.addChild(item)
-                
-            self._populate_tree(item, subtree, full_path)
-            
-        # Add files
-        for file_info in tree_data.get('files', []):
-            item = QtWidgets.QTreeWidgetItem([file_info['name']])
-            item.setIcon(0, self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon))
-            item.setData(0, QtCore.Qt.UserRole, {'type': 'file', 'path': file_info['path']})
-            
-            if isinstance(parent_widget, QtWidgets.QTreeWidget):
-                parent_widget.addTopLevelItem(item)
-            else:
-                parent_widget.addChild(item)
+        """Rebuilds the sidebar model, e.g. after the collection root changed.
+
+        Regular creates/saves/deletes don't need this: the model patches the
+        affected directory from CollectionManager change notifications.
+        """
+        with self.context.metrics.timer('tree.load'):
+            self.sidebar_model.set_manager(self.collection_manager)
+
+    def watch_collections(self):
+        cfg = self.context.cfg
+        if not cfg.get('collections.watch'):
+            return
+        self.collection_manager.start_watching(
+            debounce_ms=cfg.get('collections.watch_debounce_ms'),
+            poll_interval_ms=cfg.get('collections.watch_poll_interval_ms'),
+            use_native=cfg.get('collections.watch_native'),
+            parent=self)
+
+    def reconcile_collections(self):
+        """Validates the on-disk index in the background after the first paint."""
+        manager = self.collection_manager
+        manager.reconcile_in_background(
+            lambda changed: self.collections_reconciled.emit(manager, changed))
+
+    def apply_reconciled(self, manager, changed):
+        if manager is self.collection_manager and changed:
+            manager.apply_changes(changed)
+
+    def _selected_entry(self):
+        indexes = self.sidebar.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.sidebar_model.entry(indexes[0])
+
+    def _target_dir(self):
+        """Directory for new items, based on the sidebar selection."""
+        parent_path = self.collection_manager.root_path
+        item_data = self._selected_entry()
+        if item_data:
+            if item_data['type'] == 'dir':
+                parent_path = item_data['path']
+            elif item_data['type'] == 'file':
+                parent_path = os.path.dirname(item_data['path'])
+        return parent_path
 
     def show_sidebar_context_menu(self, position):
         menu = QtWidgets.QMenu()
         
         # Determine context
-        item = self.sidebar.itemAt(position)
-        item_data = item.data(0, QtCore.Qt.UserRole) if item else None
+        index = self.sidebar.indexAt(position)
+        item_data = self.sidebar_model.entry(index)
         
         create_collection_action = menu.addAction("New Collection")
         create_collection_action.triggered.connect(self.create_collection)
         
+        if item_data is None or item_data['type'] == 'dir':
+            folder = item_data['path'] if item_data else self.collection_manager.root_path
+            run_action = menu.addAction("Run Folder...")
+            run_action.triggered.connect(lambda: self.run_folder(folder))
+            import_action = menu.addAction("Import...")
+            import_action.triggered.connect(lambda: self.import_requests(folder))
+
+        if item_data is not None and item_data['type'] == 'file':
+            load_test_action = menu.addAction("Load Test...")
+            load_test_action.triggered.connect(lambda: self.load_test(item_data['path']))
+
         # Only allow deleting if an item is selected
-        if item:
-             # TODO: Add delete functionality
-             pass
+        if item_data:
+            delete_action = menu.addAction("Delete")
+            delete_action.triggered.connect(lambda: self.delete_item(item_data))
 
         menu.exec_(self.sidebar.viewport().mapToGlobal(position))
 
@@ -180,8 +261,14 @@ class MainWindow(QtWidgets.QMainWindow):
         
         if new_path:
             from hellorestsoft.models.collection import CollectionManager
+            self.collection_manager.close()
             self.collection_manager = CollectionManager(new_path)
+            self.watch_collections()
             self.refresh_sidebar()
+            self.refresh_environments()
+            for index in range(self.tabs.count()):
+                self.tabs.widget(index).set_environments(self.collection_manager.environments)
+            self.reconcile_collections()
             QtWidgets.QMessageBox.information(
                 self,
                 "Success",
@@ -192,62 +279,245 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def create_collection(self):
         # Get selected item for parent
-        selected_items = self.sidebar.selectedItems()
-        parent_path = self.collection_manager.root_path
-        if selected_items:
-            item = selected_items[0]
-            item_data = item.data(0, QtCore.Qt.UserRole)
-            if item_data['type'] == 'dir':
-                parent_path = item_data['path']
-            elif item_data['type'] == 'file':
-                parent_path = os.path.dirname(item_data['path'])
+        parent_path = self._target_dir()
 
+        from cola import qtutils
         name, ok = qtutils.prompt("Enter collection name:", "New Collection")
         if ok and name:
             try:
                 self.collection_manager.create_collection(name, parent_path)
-                self.refresh_sidebar()
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
-    def load_request_from_item(self, item, column):
-        data = item.data(0, QtCore.Qt.UserRole)
+    def delete_item(self, item_data):
+        kind = "collection" if item_data['type'] == 'dir' else "request"
+        answer = QtWidgets.QMessageBox.question(
+            self, "Delete", f"Delete {kind} '{item_data['name']}'?")
+        if answer != QtWidgets.QMessageBox.Yes:
+            return
+        try:
+            self.collection_manager.delete(item_data['path'])
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+
+    def load_request_from_index(self, index):
+        data = self.sidebar_model.entry(index)
         if data and data['type'] == 'file':
-            req_data = self.collection_manager.load_request(data['path'])
-            self.add_new_request_tab(req_data, name=item.text(0))
+            self.open_request(data['path'], data['name'])
+
+    def open_request(self, path, name):
+        manager = self.collection_manager
+        try:
+            req_data = manager.load_request(path)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            return
+        inline = None
+        if manager.history is not None:
+            # Older request files carry their last response inline. It is
+            # moved into the history store off the GUI thread, and out of
+            # the file the next time the request is saved.
+            inline = req_data.pop('response', None)
+        view = self.add_new_request_tab(req_data, name=name, path=path)
+        view.load_latest_response(inline)
+
+    def run_folder(self, folder):
+        from hellorestsoft.widgets.runner import RunnerDialog
+        dialog = RunnerDialog(self.context, self.collection_manager, folder, self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def import_requests(self, folder):
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            self, "Import OpenAPI, HAR or Postman Files", "",
+            "API files (*.json *.yaml *.yml *.har);;All Files (*)")
+        if not paths:
+            return
+        from hellorestsoft.widgets.importer import ImportDialog
+        dialog = ImportDialog(self.context, self.collection_manager, folder, paths, self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+        dialog.start()
+
+    def load_test(self, path):
+        from hellorestsoft.widgets.loadtest import LoadTestDialog
+        try:
+            data = self.collection_manager.load_request(path)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            return
+        dialog = LoadTestDialog(
+            self.context, path, data, self.collection_manager.environments.variables(), self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
 
-    def add_new_request_tab(self, data=None, name="New Request"):
+    def refresh_environments(self):
+        environments = self.collection_manager.environments
+        self.env_combo.clear()
+        self.env_combo.addItem("No Environment", None)
+        for name in environments.names():
+            self.env_combo.addItem(name, name)
+        index = self.env_combo.findData(environments.active)
+        self.env_combo.setCurrentIndex(max(0, index))
+
+    def environment_selected(self, index):
+        environments = self.collection_manager.environments
+        environments.set_active(self.env_combo.itemData(index))
+        try:
+            environments.save()
+        except OSError as e:
+            self.status_bar.showMessage(f"Could not save environments: {e}")
+
+    def edit_environments(self):
+        from hellorestsoft.widgets.environments import EnvironmentDialog
+        dialog = EnvironmentDialog(self.collection_manager.environments, self)
+        if dialog.exec_():
+            self.refresh_environments()
+
+    def show_search(self):
+        from hellorestsoft.widgets.search import SearchDialog
+        dialog = SearchDialog(self.collection_manager, self)
+        dialog.request_selected.connect(self.open_request)
+        dialog.exec_()
+
+    def show_metrics(self):
+        from hellorestsoft.widgets.metrics import MetricsDialog
+        if self.metrics_dialog is None:
+            self.metrics_dialog = MetricsDialog(self.context, self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
+        self.metrics_dialog.activateWindow()
+
+    def add_new_request_tab(self, data=None, name="New Request", path=None):
         from hellorestsoft.widgets.request_view import RequestView
         view = RequestView(self.context)
-        view.save_requested.connect(self.save_request)
+        view.title = name
+        view.save_requested.connect(lambda data: self.save_request(view, data))
+        view.response_received.connect(
+            lambda method, url, result: self.record_response(view, method, url, result))
         if data:
             view.set_data(data)
+        view.set_environments(self.collection_manager.environments)
+        if path is not None:
+            view.set_history(self.collection_manager.history, path)
+
+        # Autosave waits for a pause in typing; the write itself is async
+        view.autosave_timer = QtCore.QTimer(view)
+        view.autosave_timer.setSingleShot(True)
+        view.autosave_timer.timeout.connect(lambda: self.autosave(view))
+        view.changed.connect(lambda: self.request_changed(view))
+
         index = self.tabs.addTab(view, name)
         self.tabs.setCurrentIndex(index)
+        return view
+
+    def _update_tab_title(self, view):
+        index = self.tabs.indexOf(view)
+        if index >= 0:
+            self.tabs.setTabText(index, view.title + (" *" if view.modified else ""))
+
+    def request_changed(self, view):
+        if not view.modified:
+            view.modified = True
+            self._update_tab_title(view)
+        cfg = self.context.cfg
+        if view.path is not None and cfg.get('autosave.enabled'):
+            view.autosave_timer.start(cfg.get('autosave.delay_ms'))
+
+    def autosave(self, view):
+        if view.modified and view.path is not None:
+            self.write_request(view)
+
+    def write_request(self, view):
+        """Queues the tab's request for writing to its saved path."""
+        view.autosave_timer.stop()
+        view.modified = False
+        self._update_tab_title(view)
+        manager = self.collection_manager
+        try:
+            manager.save_request_async(
+                view.path, view.get_data(),
+                callback=lambda path, error: self.request_written.emit(manager, path, error))
+        except RuntimeError as e:
+            self.status_bar.showMessage(f"Save failed: {e}")
+
+    def apply_written(self, manager, path, error):
+        if error is not None:
+            self.status_bar.showMessage(f"Save failed: {path}: {error}")
+            # Let the next edit or save try again
+            for index in range(self.tabs.count()):
+                view = self.tabs.widget(index)
+                if getattr(view, 'path', None) == path:
+                    view.modified = True
+                    self._update_tab_title(view)
+            return
+        if manager is self.collection_manager:
+            manager.apply_changes([os.path.dirname(path)])
+
+    def record_response(self, view, method, url, result):
+        """Appends a response to the history of a saved request, off the GUI thread.
+
+        Responses of unsaved tabs are recorded once the tab is saved.
+        """
+        history = view.history
+        if history is None or view.path is None:
+            return
+        from cola import qtutils
+        task = qtutils.SimpleTask(
+            history.record, view.path, result, method, url,
+            self.context.cfg.get('history.max_entries'))
+        self.context.runtask.start(task, result=lambda entry_id: view.refresh_history())
+
+    def save_request(self, view, data):
+        if view.path is not None:
+            self.write_request(view)
+            return
 
-    def save_request(self, data):
         # Get selected item in sidebar to determine save location
-        selected_items = self.sidebar.selectedItems()
-        parent_path = self.collection_manager.root_path
-        
-        if selected_items:
-            item = selected_items[0]
-            item_data = item.data(0, QtCore.Qt.UserRole)
-            if item_data['type'] == 'dir':
-                parent_path = item_data['path']
-            elif item_data['type'] == 'file':
-                parent_path = os.path.dirname(item_data['path'])
+        parent_path = self._target_dir()
         
+        from cola import qtutils
         name, ok = qtutils.prompt("Enter request name:", "Save Request")
         if ok and name:
-            try:
-                self.collection_manager.save_request(name, data, parent_path)
-                self.refresh_sidebar()
-                # Update tab title
-                self.tabs.setTabText(self.tabs.currentIndex(), name)
-            except Exception as e:
-                QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            path = self.collection_manager.request_path(name, parent_path)
+            view.title = os.path.basename(path)[:-5]
+            view.set_history(self.collection_manager.history, path)
+            self.write_request(view)
+            response = view.last_response()
+            if response is not None:
+                method, url = view.sent
+                self.record_response(view, method, url, response)
+
+    def tab_activated(self, index):
+        """Materializes the current tab and hibernates the least recently used."""
+        view = self.tabs.widget(index)
+        if view is None:
+            return
+        view.materialize()
+        if view in self.recent_views:
+            self.recent_views.remove(view)
+        self.recent_views.insert(0, view)
+        limit = max(1, self.context.cfg.get('tabs.max_views'))
+        for old in self.recent_views[limit:]:
+            old.hibernate()
+        del self.recent_views[limit:]
 
     def close_tab(self, index):
         if self.tabs.count() > 1:
+            view = self.tabs.widget(index)
+            if view.modified and view.path is not None and self.context.cfg.get('autosave.enabled'):
+                self.write_request(view)
             self.tabs.removeTab(index)
+            if view in self.recent_views:
+                self.recent_views.remove(view)
+            view.release()
+            view.deleteLater()
+
+    def closeEvent(self, event):
+        for index in range(self.tabs.count()):
+            view = self.tabs.widget(index)
+            if view.modified and view.path is not None and self.context.cfg.get('autosave.enabled'):
+                self.write_request(view)
+        # Waits for queued writes before the process goes away
+        self.collection_manager.close()
+        super().closeEvent(event)
@@ -0,0 +1,134 @@
+import os
+
+from qtpy import QtWidgets, QtCore
+
+
+class MetricsDialog(QtWidgets.QDialog):
+    """Live summary of the timings in the metrics registry.
+
+    Shows count, mean, p50, p95, max and the latest sample per metric over
+    the ring buffer, refreshed while the dialog is open. Samples can be
+    exported to a Prometheus text or JSON-lines file, and session
+    profiling can be switched on and off from here.
+    """
+
+    COLUMNS = ["Metric", "Count", "Mean", "p50", "p95", "Max", "Last"]
+    REFRESH_MS = 1000
+
+    def __init__(self, context, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.setWindowTitle("Metrics")
+        self.resize(720, 360)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.setColumnWidth(0, 160)
+        layout.addWidget(self.table)
+
+        self.by_labels = QtWidgets.QCheckBox("Split by labels (host, method, status...)")
+        self.by_labels.toggled.connect(self.refresh)
+        layout.addWidget(self.by_labels)
+
+        self.status_label = QtWidgets.QLabel("")
+        self.status_label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        layout.addWidget(self.status_label)
+
+        buttons = QtWidgets.QHBoxLayout()
+        layout.addLayout(buttons)
+        self.profile_button = QtWidgets.QPushButton()
+        self.profile_button.setCheckable(True)
+        self.profile_button.toggled.connect(self.toggle_profiling)
+        buttons.addWidget(self.profile_button)
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItem("cProfile (GUI thread)", 'cprofile')
+        self.mode_combo.addItem("Sampling (all threads)", 'sampling')
+        buttons.addWidget(self.mode_combo)
+        buttons.addStretch()
+        clear_button = QtWidgets.QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+        buttons.addWidget(clear_button)
+        export_button = QtWidgets.QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        buttons.addWidget(export_button)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(close_button)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self._sync_profile_button()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._sync_profile_button()
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        by_labels = self.by_labels.isChecked()
+        summary = self.context.metrics.summary(by_labels=by_labels)
+        self.table.setRowCount(len(summary))
+        for row, (key, stats) in enumerate(summary.items()):
+            if by_labels:
+                name, labels = key
+                if labels:
+                    name += " " + ", ".join(f"{k}={v}" for k, v in labels)
+            else:
+                name = key
+            values = [name, str(stats['count'])] + [
+                f"{stats[stat] * 1000:.1f} ms" for stat in ('mean', 'p50', 'p95', 'max', 'last')]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    self.table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+                else:
+                    item.setText(value)
+
+    def clear(self):
+        self.context.metrics.clear()
+        self.refresh()
+
+    def export(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Metrics", os.path.expanduser("~/hellorestsoft-metrics.prom"),
+            "Prometheus text (*.prom *.txt);;JSON lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            self.context.metrics.export(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Export Failed", str(e))
+            return
+        self.status_label.setText(f"Exported to {path}")
+
+    def toggle_profiling(self, enabled):
+        if enabled == self.context.profiling:
+            return
+        try:
+            if enabled:
+                self.context.start_profiling(self.mode_combo.currentData())
+                self.status_label.setText("Profiling; stop to write the profile")
+            else:
+                path = self.context.stop_profiling()
+                self.status_label.setText(f"Profile written to {path}")
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, "Profiling Failed", str(e))
+        self._sync_profile_button()
+
+    def _sync_profile_button(self):
+        profiling = self.context.profiling
+        self.profile_button.blockSignals(True)
+        self.profile_button.setChecked(profiling)
+        self.profile_button.blockSignals(False)
+        self.profile_button.setText("Stop Profiling" if profiling else "Profile Session")
+        self.mode_combo.setEnabled(not profiling)
@@ -1,21 +1,73 @@
+import time
+import itertools
+
 from qtpy import QtWidgets, QtCore
 from cola import qtutils
-import httpx
-import asyncio
-import json
+from hellorestsoft.engine import parse_timeouts
+from hellorestsoft.models import render
+from hellorestsoft.models.response import BodyPager, format_size
+from hellorestsoft.models.template import (
+    RequestTemplate, extract_values, format_body, format_captures, format_headers)
+from hellorestsoft.widgets.body_viewer import LargeBodyView
+from hellorestsoft.widgets.json_tree import JsonTreeView
+from hellorestsoft.widgets.text_feeder import ChunkedTextFeeder
+
+# Size of each page read back from a spooled response body
+PAGE_SIZE = 1024 * 1024
+
+# Keys for the shared ResponseCache; unlike id(), never reused
+_cache_keys = itertools.count()
 
 class RequestView(QtWidgets.QWidget):
     save_requested = QtCore.Signal(dict)
+    # Emitted whenever the request definition is edited
+    changed = QtCore.Signal()
+    # Emitted with (method, url, response) for every response received
+    response_received = QtCore.Signal(object, object, object)
+    # Emitted from the engine thread; Qt queues them onto the GUI thread
+    progress_changed = QtCore.Signal(object, object, object)
+    request_done = QtCore.Signal(object, object)
 
     def __init__(self, context, parent=None):
         super().__init__(parent)
         self.context = context
+        # Saved location of this request and the store its responses go to
+        self.path = None
+        self.history = None
+        # EnvironmentStore supplying {{variables}}; set by the main window
+        self.environments = None
+        self.sent = (None, None)
+        self.modified = False
+        # Requests still on the engine, serial -> (future, method, url, captures)
+        self.in_flight = {}
+        self.send_serial = 0
+        self.shown_serial = 0
+        self.render_serial = 0
+        # (serial, start time) of the body being fed into the editor
+        self.render_started = None
+        # The latest response lives in the shared, budgeted ResponseCache
+        self.cache_key = next(_cache_keys)
+        # Request fields and status while hibernated; see hibernate()
+        self.state = {'data': {}, 'status': "Ready", 'error': None}
+        self.content = None
         self.layout = QtWidgets.QVBoxLayout(self)
-        self.layout.setContentsMargins(10, 10, 10, 10)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_changed.connect(self.show_progress)
+        self.request_done.connect(self._request_done)
+        self.materialize()
+
+    def materialize(self):
+        """Builds the editor widgets and restores the hibernated state."""
+        if self.content is not None:
+            return
+        self.content = QtWidgets.QWidget()
+        self.layout.addWidget(self.content)
+        layout = QtWidgets.QVBoxLayout(self.content)
+        layout.setContentsMargins(10, 10, 10, 10)
         
         # Top Bar: Method, URL, Send
         self.top_layout = QtWidgets.QHBoxLayout()
-        self.layout.addLayout(self.top_layout)
+        layout.addLayout(self.top_layout)
         
         self.method_combo = QtWidgets.QComboBox()
         self.method_combo.addItems(["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"])
@@ -29,13 +81,18 @@ class RequestView(QtWidgets.QWidget):
         self.send_button.clicked.connect(self.send_request)
         self.top_layout.addWidget(self.send_button)
 
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_requests)
+        self.top_layout.addWidget(self.cancel_button)
+
         self.save_button = QtWidgets.QPushButton("Save")
         self.save_button.clicked.connect(self.request_save)
         self.top_layout.addWidget(self.save_button)
         
         # Main Content Splitter
         self.splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
-        self.layout.addWidget(self.splitter)
+        layout.addWidget(self.splitter)
         
         # Request Area
         self.request_tabs = QtWidgets.QTabWidget()
@@ -47,132 +104,442 @@ class RequestView(QtWidgets.QWidget):
         self.req_headers_edit = QtWidgets.QPlainTextEdit()
         self.req_headers_edit.setPlaceholderText("Key: Value")
         self.request_tabs.addTab(self.req_headers_edit, "Headers")
+
+        # Per-request timeouts; 0 falls back to the engine defaults
+        self.timeouts_widget = QtWidgets.QWidget()
+        timeouts_layout = QtWidgets.QFormLayout(self.timeouts_widget)
+        self.timeout_spins = {}
+        for key, label in (('connect', "Connect:"), ('read', "Read:"), ('total', "Total:")):
+            spin = QtWidgets.QDoubleSpinBox()
+            spin.setRange(0, 86400)
+            spin.setDecimals(1)
+            spin.setSuffix(" s")
+            spin.setSpecialValueText("Default")
+            timeouts_layout.addRow(label, spin)
+            self.timeout_spins[key] = spin
+        self.request_tabs.addTab(self.timeouts_widget, "Timeouts")
+
+        # Values to pull out of the response into {{variables}}
+        self.captures_edit = QtWidgets.QPlainTextEdit()
+        self.captures_edit.setPlaceholderText(
+            "name: body.path.to.field\nname: header.Header-Name\nname: status")
+        self.request_tabs.addTab(self.captures_edit, "Captures")
         
         # Response Area
         self.response_tabs = QtWidgets.QTabWidget()
         self.splitter.addWidget(self.response_tabs)
         
+        self.resp_body_widget = QtWidgets.QWidget()
+        self.resp_body_layout = QtWidgets.QVBoxLayout(self.resp_body_widget)
+        self.resp_body_layout.setContentsMargins(0, 0, 0, 0)
+        self.response_tabs.addTab(self.resp_body_widget, "Response Body")
+
         self.resp_body_edit = QtWidgets.QPlainTextEdit()
         self.resp_body_edit.setReadOnly(True)
-        self.response_tabs.addTab(self.resp_body_edit, "Response Body")
+        self.resp_body_layout.addWidget(self.resp_body_edit)
+        self.body_feeder = ChunkedTextFeeder(self.resp_body_edit, self.content)
+        self.body_feeder.finished.connect(self._render_finished)
+
+        # Large bodies only show a preview; the rest is paged in on demand
+        self.load_more_button = QtWidgets.QPushButton("Load More")
+        self.load_more_button.clicked.connect(self.load_more)
+        self.load_more_button.hide()
+        self.resp_body_layout.addWidget(self.load_more_button)
+        self.pager = None
+
+        # Spooled bodies are viewed straight from the mapped file instead
+        self.large_body_view = LargeBodyView(self.context)
+        self.large_body_view.hide()
+        self.resp_body_layout.addWidget(self.large_body_view)
         
+        # Indexed only once the tab is shown
+        self.json_view = JsonTreeView(self.context)
+        self.response_tabs.addTab(self.json_view, "JSON")
+
         self.resp_headers_edit = QtWidgets.QPlainTextEdit()
         self.resp_headers_edit.setReadOnly(True)
         self.response_tabs.addTab(self.resp_headers_edit, "Response Headers")
+
+        self.history_table = QtWidgets.QTableWidget(0, 4)
+        self.history_table.setHorizontalHeaderLabels(["Time", "Status", "Latency", "Size"])
+        self.history_table.horizontalHeader().setStretchLastSection(True)
+        self.history_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.history_table.verticalHeader().hide()
+        self.history_table.cellDoubleClicked.connect(self.show_history_entry)
+        self.response_tabs.addTab(self.history_table, "History")
         
         # Status Bar for this view
         self.status_label = QtWidgets.QLabel("Ready")
-        self.layout.addWidget(self.status_label)
+        layout.addWidget(self.status_label)
+
+        self._apply_state()
+        self.method_combo.currentTextChanged.connect(self.changed)
+        self.url_input.textChanged.connect(self.changed)
+        self.req_body_edit.textChanged.connect(self.changed)
+        self.req_headers_edit.textChanged.connect(self.changed)
+        self.captures_edit.textChanged.connect(self.changed)
+        for spin in self.timeout_spins.values():
+            spin.valueChanged.connect(self.changed)
+
+    def hibernate(self):
+        """Drops the widgets, keeping only the request fields and status.
+
+        The response body is spilled out of memory; materialize() brings
+        everything back.
+        """
+        if self.content is None:
+            return
+        self.state['data'] = self.get_data()
+        self.state['status'] = self.status_label.text()
+        self.render_serial += 1  # Drop renders still in flight
+        self.body_feeder.stop()
+        self.pager = None
+        self.large_body_view.close_body()
+        self.json_view.clear()
+        self.context.response_cache.spill(self.cache_key)
+        self.layout.removeWidget(self.content)
+        self.content.deleteLater()
+        self.content = None
+
+    def is_materialized(self):
+        return self.content is not None
+
+    def release(self):
+        """Cancels pending sends and frees the cached response; called when the tab is closed."""
+        self.cancel_requests()
+        if self.content is not None:
+            self.large_body_view.close_body()
+        self.context.response_cache.discard(self.cache_key)
+
+    def last_response(self):
+        return self.context.response_cache.get(self.cache_key)
+
+    def _apply_state(self):
+        self._set_fields(self.state['data'])
+        self.cancel_button.setEnabled(bool(self.in_flight))
+        if self.state['error'] is not None:
+            self.resp_body_edit.setPlainText(f"Error: {self.state['error']}")
+        else:
+            response = self.last_response()
+            if response is not None:
+                self.show_response(response)
+        self.status_label.setText(self.state['status'])
+        self.refresh_history()
 
     def send_request(self):
-        method = self.method_combo.currentText()
-        url = self.url_input.text()
-        if not url:
+        data = self.get_data()
+        if not data['url']:
             return
-            
-        body = self.req_body_edit.toPlainText()
-        headers_text = self.req_headers_edit.toPlainText()
-        headers = {}
-        for line in headers_text.splitlines():
-            if ':' in line:
-                k, v = line.split(':', 1)
-                headers[k.strip()] = v.strip()
-        
-        self.status_label.setText("Sending...")
-        self.send_button.setEnabled(False)
-        
-        # Use git-cola's RunTask to run in background
-        # We wrap the async call in a sync function for SimpleTask
-        task = qtutils.SimpleTask(self._run_async_request, method, url, headers, body)
-        self.context.runtask.start(task, result=self.handle_response, finish=self.request_finished)
-
-    def _run_async_request(self, method, url, headers, body):
-        return asyncio.run(self._make_request(method, url, headers, body))
-
-    async def _make_request(self, method, url, headers, body):
-        async with httpx.AsyncClient() as client:
-            response = await client.request(method, url, headers=headers, content=body)
-            return {
-                'status_code': response.status_code,
-                'text': response.text,
-                'headers': dict(response.headers),
-                'elapsed': response.elapsed.total_seconds()
-            }
 
-    def set_data(self, data):
+        template = RequestTemplate(data)
+        variables = self.environments.variables() if self.environments is not None else {}
+        method = template.method
+        url, headers, body = template.render(variables)
+        timeouts = parse_timeouts(data.get('timeouts'))
+
+        # Requests are coroutines on the shared engine loop, so any number
+        # can be in flight without holding a thread each
+        self.send_serial += 1
+        serial = self.send_serial
+        future = self.context.engine.submit(
+            self._make_request(method, url, headers, body, timeouts))
+        self.in_flight[serial] = (future, method, url, template.captures)
+        future.add_done_callback(lambda future: self.request_done.emit(serial, future))
+        count = len(self.in_flight)
+        self._set_status("Sending..." if count == 1 else f"Sending... ({count} in flight)")
+        self.cancel_button.setEnabled(True)
+
+    async def _make_request(self, method, url, headers, body, timeouts=None):
+        return await self.context.engine.request(
+            method, url, headers=headers, body=body, progress=self.progress_changed.emit,
+            timeouts=timeouts)
+
+    def cancel_requests(self):
+        for future, _, _, _ in list(self.in_flight.values()):
+            future.cancel()
+
+    def _request_done(self, serial, future):
+        _, method, url, captures = self.in_flight.pop(serial, (None, None, None, None))
+        if self.content is not None:
+            self.cancel_button.setEnabled(bool(self.in_flight))
+        if serial < self.shown_serial:
+            return  # A newer response is already on screen
+        if future.cancelled():
+            if not self.in_flight:
+                self._set_status("Cancelled")
+            return
+        self.shown_serial = serial
+        self.sent = (method, url)
+        error = future.exception()
+        if error is None and captures and self.environments is not None:
+            self.environments.capture(extract_values(captures, future.result()))
+        self.handle_response(error if error is not None else future.result())
+
+    def set_environments(self, environments):
+        self.environments = environments
+
+    def _set_status(self, text):
+        self.state['status'] = text
+        if self.content is not None:
+            self.status_label.setText(text)
+
+    def show_progress(self, received, total, rate):
+        if self.content is None:
+            return
+        text = f"Receiving... {format_size(received)}"
+        if total:
+            text += f" / {format_size(total)}"
+        text += f" ({format_size(rate)}/s)"
+        self.status_label.setText(text)
+
+    def _status_text(self, resp):
+        text = f"Status: {resp.get('status_code')} | Time: {resp.get('elapsed', 0):.3f}s"
+        timings = resp.get('timings')
+        if timings:
+            text += (f" | Connect: {timings['connect'] * 1000:.1f}ms"
+                     f" | TLS: {timings['tls'] * 1000:.1f}ms"
+                     f" | TTFB: {timings['ttfb'] * 1000:.1f}ms")
+            if timings.get('reused'):
+                text += " | Reused connection"
+        if 'size' in resp:
+            text += f" | Size: {format_size(resp['size'])}"
+        cache = resp.get('cache')
+        if cache and cache.get('hit'):
+            text += f" | Cache hit (304), saved {format_size(cache.get('bytes_saved', 0))}"
+        return text
+
+    def _set_pager(self, resp):
+        """Prepares on-demand paging when only a preview of the body is shown."""
+        self.pager = None
+        path = resp.get('body_path')
+        if resp.get('truncated') and path:
+            try:
+                self.pager = BodyPager(path, resp.get('encoding'), resp.get('preview_bytes', 0))
+            except OSError:
+                self.pager = None
+        self.load_more_button.setEnabled(True)
+        self.load_more_button.setVisible(self.pager is not None and not self.pager.at_end)
+
+    def _show_large_body(self, resp):
+        """Switches to the mapped viewer for spooled bodies; False if it doesn't apply."""
+        path = resp.get('body_path')
+        mapped = bool(resp.get('truncated') and path
+                      and self.large_body_view.open(path, resp.get('encoding')))
+        if not mapped:
+            self.large_body_view.close_body()
+        self.large_body_view.setVisible(mapped)
+        self.resp_body_edit.setVisible(not mapped)
+        return mapped
+
+    def render_body(self, text, truncated=False):
+        """Formats the body on a worker and streams it into the editor."""
+        self.render_serial += 1
+        serial = self.render_serial
+        self.body_feeder.stop()
+        self.resp_body_edit.clear()
+        cfg = self.context.cfg
+        started = time.perf_counter()
+        task = qtutils.SimpleTask(
+            render.render_body, text,
+            cfg.get('render.max_format_size'), cfg.get('render.chunk_size'), truncated)
+        self.context.runtask.start(
+            task, result=lambda chunks: self._body_rendered(serial, chunks, text, started))
+
+    def _body_rendered(self, serial, chunks, text, started):
+        if serial != self.render_serial:
+            return  # A newer response replaced this one, or the view hibernated
+        if isinstance(chunks, Exception):
+            chunks = render.chunk_text(text, self.context.cfg.get('render.chunk_size'))
+        self.context.metrics.record('render.format', time.perf_counter() - started)
+        self.render_started = (serial, started)
+        self.body_feeder.set_chunks(chunks)
+
+    def _render_finished(self):
+        # Also emitted after "Load More" pages, which are not timed
+        started, self.render_started = self.render_started, None
+        if started is not None and started[0] == self.render_serial:
+            self.context.metrics.record('render.body', time.perf_counter() - started[1])
+
+    def load_more(self):
+        if self.pager is None:
+            return
+        self.load_more_button.setEnabled(False)
+        serial = self.render_serial
+        pager = self.pager
+        task = qtutils.SimpleTask(self._read_page, pager)
+        self.context.runtask.start(
+            task, result=lambda chunks: self.append_page(serial, pager, chunks))
+
+    def _read_page(self, pager):
+        return render.chunk_text(pager.next_page(PAGE_SIZE), self.context.cfg.get('render.chunk_size'))
+
+    def append_page(self, serial, pager, chunks):
+        if self.content is None or serial != self.render_serial or pager is not self.pager:
+            return  # Another response is shown now; the page belongs to the old body
+        self.load_more_button.setEnabled(True)
+        if isinstance(chunks, Exception):
+            self.status_label.setText(f"Error: {chunks}")
+            return
+        self.body_feeder.append_chunks(chunks)
+        if self.pager is None or self.pager.at_end:
+            self.load_more_button.hide()
+
+    def _timeouts(self):
+        return {key: spin.value() for key, spin in self.timeout_spins.items() if spin.value()}
+
+    def _set_fields(self, data):
         if 'method' in data:
             self.method_combo.setCurrentText(data['method'])
         if 'url' in data:
             self.url_input.setText(data['url'])
         if 'headers' in data:
-            self.req_headers_edit.setPlainText(data['headers'])
+            self.req_headers_edit.setPlainText(format_headers(data['headers']))
         if 'body' in data:
-            self.req_body_edit.setPlainText(data['body'])
-            
+            self.req_body_edit.setPlainText(format_body(data['body']))
+        if 'captures' in data:
+            self.captures_edit.setPlainText(format_captures(data['captures']))
+        timeouts = parse_timeouts(data.get('timeouts'))
+        for key, spin in self.timeout_spins.items():
+            spin.setValue(timeouts.get(key, 0))
+
+    def set_data(self, data):
+        fields = {key: data[key] for key in ('method', 'url', 'headers', 'body', 'captures', 'timeouts')
+                  if key in data}
+        self.state['data'].update(fields)
+
         # Restore response if available
-        if 'response' in data:
-            resp = data['response']
-            if 'status_code' in resp:
-                self.status_label.setText(f"Status: {resp.get('status_code')} | Time: {resp.get('elapsed', 0):.3f}s")
-            if 'text' in resp:
-                # Try to format JSON
-                try:
-                    json_obj = json.loads(resp['text'])
-                    formatted = json.dumps(json_obj, indent=2)
-                    self.resp_body_edit.setPlainText(formatted)
-                except:
-                    self.resp_body_edit.setPlainText(resp['text'])
-            if 'headers' in resp:
-                headers_text = "\n".join([f"{k}: {v}" for k, v in resp['headers'].items()])
-                self.resp_headers_edit.setPlainText(headers_text)
+        resp = data.get('response')
+        if isinstance(resp, dict) and 'status_code' in resp:
+            self.context.response_cache.put(self.cache_key, resp)
+            self.state['status'] = self._status_text(resp)
+            self.state['error'] = None
+        else:
+            resp = None
+
+        if self.content is not None:
+            self._set_fields(fields)
+            if resp is not None:
+                self.show_response(resp)
 
     def get_data(self):
+        if self.content is None:
+            return dict(self.state['data'])
+        # Responses are kept in the collection's history store, not in
+        # the request file, so saves stay small
         data = {
             'method': self.method_combo.currentText(),
             'url': self.url_input.text(),
             'headers': self.req_headers_edit.toPlainText(),
             'body': self.req_body_edit.toPlainText()
         }
-        
-        # Include response data if available and not empty
-        if self.resp_body_edit.toPlainText():
-            # We reconstruct the response object from the UI state as best as we can
-            # Note: We don't store the raw response object, so we save what's visible
-            # For a more robust solution, we might want to store the last 'result' object
-            pass
-            
-        # Actually, let's store the last result if we have it.
-        # But since we don't have it stored in self, let's just save what we see?
-        # The user asked to "save requests along with their outputs".
-        # It's better to store the last result dictionary.
-        
-        if hasattr(self, 'last_result') and self.last_result:
-             data['response'] = self.last_result
-             
+        captures = self.captures_edit.toPlainText()
+        if captures:
+            data['captures'] = captures
+        timeouts = self._timeouts()
+        if timeouts:
+            data['timeouts'] = timeouts
         return data
 
     def handle_response(self, result):
         if isinstance(result, Exception):
-            self.resp_body_edit.setPlainText(f"Error: {str(result)}")
-            self.status_label.setText("Error")
+            self.context.response_cache.discard(self.cache_key)
+            self.state['error'] = str(result)
+            self.state['status'] = "Error"
+            if self.content is not None:
+                self.render_serial += 1
+                self.body_feeder.stop()
+                self.resp_body_edit.setPlainText(f"Error: {str(result)}")
+                self.status_label.setText("Error")
+                self._set_pager({})
+                self._show_large_body({})
+                self.json_view.clear()
             return
 
-        self.last_result = result # Store for saving
-        self.status_label.setText(f"Status: {result['status_code']} | Time: {result['elapsed']:.3f}s")
-        
-        # Try to format JSON
-        try:
-            json_obj = json.loads(result['text'])
-            formatted = json.dumps(json_obj, indent=2)
-            self.resp_body_edit.setPlainText(formatted)
-        except:
-            self.resp_body_edit.setPlainText(result['text'])
-            
-        headers_text = "\n".join([f"{k}: {v}" for k, v in result['headers'].items()])
+        self.context.response_cache.put(self.cache_key, result)
+        self.state['error'] = None
+        self.state['status'] = self._status_text(result)
+        if self.content is not None:
+            self.show_response(result)
+        method, url = self.sent
+        self.response_received.emit(method, url, result)
+
+    def show_response(self, result):
+        self.status_label.setText(self._status_text(result))
+        if self._show_large_body(result):
+            self.render_serial += 1
+            self.body_feeder.stop()
+            self.resp_body_edit.clear()
+            self._set_pager({})
+        else:
+            self.render_body(result.get('text') or '', result.get('truncated', False))
+            self._set_pager(result)
+        self.json_view.set_response(result)
+        headers = result.get('headers') or {}
+        headers_text = "\n".join([f"{k}: {v}" for k, v in headers.items()])
         self.resp_headers_edit.setPlainText(headers_text)
 
-    def request_finished(self, task):
-        self.send_button.setEnabled(True)
+    def set_history(self, history, path):
+        """Attaches the store holding this request's past responses."""
+        self.history = history
+        self.path = path
+        self.refresh_history()
+
+    def refresh_history(self):
+        if self.history is None or self.path is None or self.content is None:
+            return
+        task = qtutils.SimpleTask(self.history.entries, self.path)
+        self.context.runtask.start(task, result=self._history_loaded)
+
+    def load_latest_response(self, inline=None):
+        """Shows the newest recorded response, first adopting an `inline` one from an older file."""
+        if self.history is None or self.path is None:
+            return
+        data = self.state['data']
+        task = qtutils.SimpleTask(
+            self.history.adopt, self.path, inline, data.get('method'), data.get('url'))
+        self.context.runtask.start(task, result=self._latest_loaded)
+
+    def _latest_loaded(self, result):
+        if isinstance(result, Exception) or result is None:
+            return
+        # A send made meanwhile already shows a newer response
+        if self.last_response() is None:
+            self.set_data({'response': result})
+        self.refresh_history()
+
+    def _history_loaded(self, entries):
+        if isinstance(entries, Exception) or self.content is None:
+            return
+        self.history_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            status = str(entry['status_code']) if entry['status_code'] is not None else "-"
+            values = [
+                time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['timestamp'])),
+                status,
+                f"{(entry['elapsed'] or 0) * 1000:.0f} ms",
+                format_size(entry['size'] or 0),
+            ]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                item.setData(QtCore.Qt.UserRole, entry['id'])
+                self.history_table.setItem(row, column, item)
+
+    def show_history_entry(self, row, column=0):
+        item = self.history_table.item(row, 0)
+        if item is None or self.history is None:
+            return
+        task = qtutils.SimpleTask(self.history.load, item.data(QtCore.Qt.UserRole))
+        self.context.runtask.start(task, result=self._history_entry_loaded)
+
+    def _history_entry_loaded(self, result):
+        if self.content is None:
+            return
+        if isinstance(result, Exception):
+            self.status_label.setText(f"Error: {result}")
+            return
+        if result is not None:
+            self.show_response(result)
 
     def request_save(self):
         self.save_requested.emit(self.get_data())
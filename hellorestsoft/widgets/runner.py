@@ -0,0 +1,141 @@
+import time
+
+from qtpy import QtWidgets, QtCore
+
+from hellorestsoft.models.response import format_size
+from hellorestsoft.runner import CollectionRunner, relative_name, summarize
+
+
+class RunnerDialog(QtWidgets.QDialog):
+    """Runs every request in a collection folder and tabulates the results."""
+
+    # Emitted from the engine thread; Qt queues them onto the GUI thread
+    result_ready = QtCore.Signal(object)
+    run_finished = QtCore.Signal(object)
+
+    COLUMNS = ["Request", "Method", "Status", "Latency", "Size", "Error"]
+
+    def __init__(self, context, manager, folder, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.manager = manager
+        self.folder = folder
+        self.future = None
+        self.started = 0.0
+        self.results = []
+        self.setWindowTitle(f"Run Collection - {folder}")
+        self.resize(800, 500)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        # Options
+        options = QtWidgets.QHBoxLayout()
+        layout.addLayout(options)
+
+        options.addWidget(QtWidgets.QLabel("Concurrency:"))
+        self.concurrency_spin = QtWidgets.QSpinBox()
+        self.concurrency_spin.setRange(1, 500)
+        self.concurrency_spin.setValue(context.cfg.get('runner.concurrency'))
+        options.addWidget(self.concurrency_spin)
+
+        options.addWidget(QtWidgets.QLabel("Per-host limit (req/s, 0 = off):"))
+        self.rate_spin = QtWidgets.QDoubleSpinBox()
+        self.rate_spin.setRange(0, 10000)
+        self.rate_spin.setValue(context.cfg.get('runner.rate_limit'))
+        options.addWidget(self.rate_spin)
+
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItems(["Continue on failure", "Stop on first failure"])
+        if context.cfg.get('runner.fail_fast'):
+            self.mode_combo.setCurrentIndex(1)
+        options.addWidget(self.mode_combo)
+
+        options.addStretch()
+
+        self.run_button = QtWidgets.QPushButton("Run")
+        self.run_button.clicked.connect(self.start)
+        options.addWidget(self.run_button)
+
+        self.stop_button = QtWidgets.QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop)
+        options.addWidget(self.stop_button)
+
+        # Results
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table)
+
+        self.summary_label = QtWidgets.QLabel("Ready")
+        layout.addWidget(self.summary_label)
+
+        self.result_ready.connect(self.add_result)
+        self.run_finished.connect(self.finished_run)
+
+    def start(self):
+        self.table.setRowCount(0)
+        self.results = []
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.summary_label.setText("Running...")
+        self.started = time.perf_counter()
+
+        runner = CollectionRunner(
+            self.context.engine,
+            concurrency=self.concurrency_spin.value(),
+            rate_limit=self.rate_spin.value(),
+            fail_fast=self.mode_combo.currentIndex() == 1,
+            environment=self.manager.environments)
+        self.future = self.context.engine.submit(
+            runner.run_folder(self.manager, self.folder, on_result=self.result_ready.emit))
+        self.future.add_done_callback(self.run_finished.emit)
+
+    def stop(self):
+        if self.future is not None:
+            self.future.cancel()
+
+    def add_result(self, result):
+        self.results.append(result)
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        status = str(result['status_code']) if result['status_code'] is not None else "-"
+        values = [
+            relative_name(result['path'], self.folder),
+            result['method'] or "",
+            status,
+            f"{result['elapsed'] * 1000:.0f} ms",
+            format_size(result['size']),
+            result['error'] or "",
+        ]
+        for column, value in enumerate(values):
+            item = QtWidgets.QTableWidgetItem(value)
+            if column == 2 and not result['ok']:
+                item.setForeground(QtCore.Qt.red)
+            self.table.setItem(row, column, item)
+        self.update_summary()
+
+    def update_summary(self, suffix=""):
+        summary = summarize(self.results, time.perf_counter() - self.started)
+        self.summary_label.setText(
+            f"{summary['passed']} passed | {summary['failed']} failed | "
+            f"{summary['total']} run in {summary['wall_time']:.2f}s{suffix}")
+
+    def finished_run(self, future):
+        self.future = None
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        if future.cancelled():
+            self.update_summary(" (stopped)")
+            return
+        error = future.exception()
+        if error is not None:
+            self.summary_label.setText(f"Error: {error}")
+            return
+        self.update_summary(" (done)")
+
+    def reject(self):
+        self.stop()
+        super().reject()
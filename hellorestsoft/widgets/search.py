@@ -0,0 +1,82 @@
+from qtpy import QtWidgets, QtCore
+
+
+class SearchDialog(QtWidgets.QDialog):
+    """Quick-open palette over all saved requests."""
+
+    request_selected = QtCore.Signal(str, str)  # path, name
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.setWindowTitle("Search Requests")
+        self.setMinimumSize(600, 400)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.query_input = QtWidgets.QLineEdit()
+        self.query_input.setPlaceholderText("Name, URL, header, body or response text")
+        self.query_input.textChanged.connect(self.schedule_search)
+        self.query_input.returnPressed.connect(self.open_current)
+        layout.addWidget(self.query_input)
+
+        self.results_list = QtWidgets.QListWidget()
+        self.results_list.itemActivated.connect(self.open_item)
+        layout.addWidget(self.results_list)
+
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Coalesce keystrokes into one query
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(50)
+        self.search_timer.timeout.connect(self.run_search)
+
+        self.query_input.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        # Let Up/Down move through results while typing
+        if obj is self.query_input and event.type() == QtCore.QEvent.KeyPress:
+            if event.key() in (QtCore.Qt.Key_Up, QtCore.Qt.Key_Down):
+                QtWidgets.QApplication.sendEvent(self.results_list, event)
+                return True
+        return super().eventFilter(obj, event)
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        query = self.query_input.text().strip()
+        self.results_list.clear()
+        if not query:
+            self.status_label.setText("")
+            return
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        results = self.manager.search(query)
+        elapsed = timer.elapsed()
+        for result in results:
+            label = result['relpath']
+            if result['method']:
+                label = f"{result['method']}  {label}"
+            if result['snippet']:
+                label += "\n    " + " ".join(result['snippet'].split())
+            item = QtWidgets.QListWidgetItem(label)
+            item.setData(QtCore.Qt.UserRole, result)
+            if result['url']:
+                item.setToolTip(result['url'])
+            self.results_list.addItem(item)
+        if results:
+            self.results_list.setCurrentRow(0)
+        self.status_label.setText(f"{len(results)} results in {elapsed} ms")
+
+    def open_current(self):
+        item = self.results_list.currentItem()
+        if item is not None:
+            self.open_item(item)
+
+    def open_item(self, item):
+        result = item.data(QtCore.Qt.UserRole)
+        self.request_selected.emit(result['path'], result['name'])
+        self.accept()
@@ -0,0 +1,54 @@
+from qtpy import QtCore, QtGui
+
+
+class ChunkedTextFeeder(QtCore.QObject):
+    """Feeds pre-chunked text into a QPlainTextEdit one piece per event loop tick.
+
+    Inserting a large document in one call blocks the GUI thread for as long
+    as the layout takes. Appending small chunks from a zero-interval timer
+    keeps every individual slice short, so the window stays responsive.
+    """
+
+    finished = QtCore.Signal()
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.chunks = []
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.feed_next)
+
+    def set_chunks(self, chunks):
+        """Replaces the editor contents with `chunks`."""
+        self.stop()
+        self.editor.clear()
+        self.append_chunks(chunks)
+
+    def append_chunks(self, chunks):
+        # self.chunks is a stack: the next chunk to insert is at the end
+        self.chunks = list(reversed(chunks)) + self.chunks
+        if self.chunks:
+            self.timer.start()
+        else:
+            self.finished.emit()
+
+    def stop(self):
+        self.timer.stop()
+        self.chunks = []
+
+    def is_active(self):
+        return self.timer.isActive()
+
+    def feed_next(self):
+        if not self.chunks:
+            self.timer.stop()
+            self.finished.emit()
+            return
+        chunk = self.chunks.pop()
+        cursor = QtGui.QTextCursor(self.editor.document())
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.insertText(chunk)
+        if not self.chunks:
+            self.timer.stop()
+            self.finished.emit()